@@ -0,0 +1,422 @@
+"""Typeset the default cover letter straight to PDF, without TeX.
+
+The default letter is one column of flush-left Helvetica: date, contact
+lines, recipient, salutation, body paragraphs and a signature. This
+backend lays it out in Python with the base-14 Helvetica metrics and the
+same dimensions as ``templates/default.tex`` (12pt type on 14.5pt
+leading, 12pt between paragraphs, 0.75in margins), and writes the PDF
+with ``generators/pdf.py``. Base-14 fonts need no embedding, and
+WinAnsi-encoded text stays selectable and ATS-extractable. A letter
+takes a few milliseconds and needs no pdflatex.
+
+Words are kerned with Helvetica's AFM pairs and spaced by TeX's space
+factor (a wider space after a sentence). Paragraphs are broken the way
+LaTeX breaks ``\\raggedright`` text: the right margin stretches freely,
+a line may shrink its spaces to fit, and the breaks minimize TeX's
+demerits. Line breaks and line ends match the LaTeX renders of
+``examples/``. The signature uses Times-Italic in place of the Calligra
+script font.
+
+It renders the default layout only; custom ``--letter-template`` files
+still need the LaTeX backend.
+
+    python main.py --company "Example Corp" --role "Engineer" --letter-backend fast
+    python -m coverletter.fastpdf --company "Example Corp" --against latex.pdf
+    python -m coverletter.fastpdf examples/globex-data/coverletter.yml --company Globex --date 2026-06-20 \\
+        --against examples/globex-data/Jane_Doe_Coverletter_DataEngineer.pdf
+"""
+import unicodedata
+import zlib
+
+from generators.pdf import PdfName, PdfStream, PdfWriter, pdf_text_string
+
+# TeX points (1/72.27 in) to PDF units (1/72 in)
+PT = 72 / 72.27
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # letterpaper
+MARGIN = 54  # 0.75in
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+FONT_SIZE = 12 * PT
+BASELINE_SKIP = 14.5 * PT  # article, 12pt, \singlespacing
+PARSKIP = 12 * PT
+VSPACE = 12 * PT  # the \vspace{12pt} between letter blocks
+TOP_SKIP = 12 * PT
+LINE_PENALTY = 10
+SIGNATURE_SIZE = 20 * PT
+# "Sincerely," baseline to the 20pt signature baseline: parskip, the
+# \vspace{6pt}, and depth + \lineskip + height, since the tall script line
+# overflows the 14.5pt baselineskip (2.57pt + 1pt + 18.69pt for Calligra's
+# capitals, as measured in the LaTeX render)
+SIGNATURE_DROP = PARSKIP + 6 * PT + 22.26 * PT
+ASCENT, DESCENT = 0.718, 0.207  # Helvetica cap height and descender, per em
+
+# Helvetica advance widths (AFM, 1/1000 em) for WinAnsi codes 32..255
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584, 0,
+    556, 0, 222, 556, 333, 1000, 556, 556, 333, 1000, 667, 333, 1000, 0, 611, 0,
+    0, 222, 222, 333, 333, 350, 556, 1000, 333, 1000, 500, 333, 944, 0, 500, 667,
+    278, 333, 556, 556, 556, 556, 260, 556, 333, 737, 370, 556, 584, 333, 737, 333,
+    400, 584, 333, 333, 333, 556, 537, 278, 333, 333, 365, 556, 834, 834, 834, 611,
+    667, 667, 667, 667, 667, 667, 1000, 722, 667, 667, 667, 667, 278, 278, 278, 278,
+    722, 722, 778, 778, 778, 778, 778, 584, 778, 722, 722, 722, 722, 667, 667, 611,
+    556, 556, 556, 556, 556, 556, 889, 500, 556, 556, 556, 556, 278, 278, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 584, 611, 556, 556, 556, 556, 500, 556, 500,
+]
+FIRST_CHAR = 32
+# Helvetica kerning pairs (AFM, 1/1000 em) by amount. Accented letters take
+# the pairs of their base letter; the AFM's own pairs for them differ
+# from those only in a handful of cases
+HELVETICA_KERNS = {
+    -180: "P, P.",
+    -160: "L’",
+    -150: "F, F.",
+    -140: "LY L” T- Y, Y- Y. Ya Ye Yo Yø",
+    -125: "V, V.",
+    -120: "AT PA T, T. TA Ta Te To Tr Tu Tw Ty Tø",
+    -110: "LT LV YA Yu",
+    -100: ",’ ,” .’ .” AY y, y.",
+    -95: "ø, ø.",
+    -90: "DY",
+    -85: "YO YØ øx",
+    -80: "FA V- VA Ve Vo Vø W, W. v, v.",
+    -70: "AV D, D. DV LW OY Va Vu ØY øv øw øy",
+    -60: "OX Y: Y; w, w. ØX",
+    -57: "‘‘ ’’",
+    -55: "øa øb øc ød øe øf øg øh øi øj øk øl øm øn øo øp øq ør øs øt øu øz øø",
+    -50: "AU AW Fa KO Ky KØ OV Pe Po Pø RV RY WA r, r. ØV ’d ’r ’s",
+    -45: "Fr",
+    -40: "Av Aw Ay DA DW Ke Ko Kø O, O. OT Pa RU TO TØ U, U. UA V: V; VG VO VØ W- Wa b, b. o, o. Ø, Ø. ØT",
+    -35: "p, p.",
+    -30: "AC AG AO AQ Au AØ C, C. Fe Fo Fø J, J. Ku Ly OW RT RW We Wo Wu Wø ay ev ex f, f. fa fe fo fø hy ox oy py sw xe ØW",
+    -25: "va ve vo vø",
+    -20: "B, B. JA Ja Ju OA RO RØ S, S. T: T; WO Wy WØ Yi av aw bl bu bv by ck ew ey ke ko kø nv ya ye yo yø ØA",
+    -15: "c, e, e. my ny ov ow s, s. wa ze zo zø",
+    -10: "BU QU bb gr mu nu ra we wo wø",
+    15: "ri rk rl ru",
+    25: "rm rn",
+    30: "r: r; rp rv ry",
+    40: "rt",
+    50: "f’",
+    60: "f”",
+}
+# Interword glue of T1 Helvetica (1/1000 em): the space, its shrink, and the
+# extra space after a sentence. \raggedright puts 0pt plus 1fil in the right
+# margin, so lines never stretch their spaces; a line that runs over the
+# width shrinks them
+SPACE, SPACE_SHRINK, EXTRA_SPACE = 278, 66.72, 66.72
+# LaTeX's \nonfrenchspacing space factors; 0 leaves the factor unchanged
+SFCODES = {**dict.fromkeys(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", 999),
+           **dict.fromkeys(b".?!", 3000), ord(":"): 2000, ord(";"): 1500, ord(","): 1250,
+           **dict.fromkeys(b")]\x92\x94", 0)}
+# TeX input ligatures, applied so the text matches what pdflatex prints
+TEX_LIGATURES = (("---", "—"), ("--", "–"), ("``", "“"), ("''", "”"),
+                 ("`", "‘"), ("'", "’"))
+
+
+def _kern_table():
+    """{(left, right): kern} over WinAnsi codes, accented letters included."""
+    variants = {}
+    for code in range(FIRST_CHAR, 256):
+        char = bytes([code]).decode("cp1252", errors="ignore")
+        if char:
+            variants.setdefault(unicodedata.normalize("NFD", char)[0], []).append(code)
+    table = {}
+    for kern, pairs in HELVETICA_KERNS.items():
+        for left, right in pairs.split():
+            for a in variants[left]:
+                for b in variants[right]:
+                    table[a, b] = kern
+    return table
+
+
+KERNS = _kern_table()
+
+
+def encode(text):
+    """WinAnsi bytes for ``text`` with TeX's quote and dash ligatures."""
+    for source, glyph in TEX_LIGATURES:
+        text = text.replace(source, glyph)
+    return text.encode("cp1252", errors="replace")
+
+
+def kerned(encoded):
+    """(TJ items, width) of one word: runs of bytes and the kerns between them, 1/1000 em."""
+    widths = HELVETICA_WIDTHS
+    items = []
+    width = 0
+    run = 0
+    for index, code in enumerate(encoded):
+        width += widths[code - FIRST_CHAR] if code >= FIRST_CHAR else 0
+        kern = KERNS.get((code, encoded[index + 1])) if index + 1 < len(encoded) else None
+        if kern:
+            items += [encoded[run:index + 1], kern]
+            width += kern
+            run = index + 1
+    items.append(encoded[run:])
+    return items, width
+
+
+def space_after(encoded):
+    """(width, shrink) of the interword space after a word, by TeX's space factor."""
+    factor = 1000
+    for code in encoded:
+        sfcode = SFCODES.get(code, 1000)
+        if sfcode:
+            factor = 1000 if sfcode > 1000 and factor < 1000 else sfcode
+    return SPACE + (EXTRA_SPACE if factor >= 2000 else 0), SPACE_SHRINK * 1000 / factor
+
+
+def break_lines(words, width=TEXT_WIDTH, size=FONT_SIZE):
+    """Split encoded words into lines the way LaTeX sets ``\\raggedright`` text.
+
+    The right margin stretches without limit, so a line that fits has
+    badness 0; a line over the width shrinks its spaces, with badness
+    100 * (excess / shrink) ** 3, and cannot shrink past their total
+    shrink. Breaks minimize the sum of (linepenalty + badness) ** 2, and
+    ties go to the latest break, as in TeX. A word wider than the line is
+    left overfull on a line of its own.
+    """
+    if not words:
+        return []
+    limit = width * 1000 / size
+    word_widths = [kerned(word)[1] for word in words]
+    spaces = [space_after(word) for word in words]
+    n = len(words)
+    best = [0.0] + [float("inf")] * n
+    previous = [0] * (n + 1)
+    for end in range(1, n + 1):
+        line = word_widths[end - 1]
+        shrink = 0.0
+        for start in range(end - 1, -1, -1):
+            if start < end - 1:
+                line += word_widths[start] + spaces[start][0]
+                shrink += spaces[start][1]
+            excess = line - limit
+            if excess > shrink and start < end - 1:
+                break
+            if excess <= 0:
+                badness = 0
+            else:
+                badness = min(round(100 * (excess / shrink) ** 3), 10000) if shrink else 10000
+            demerits = (LINE_PENALTY + badness) ** 2
+            if best[start] + demerits < best[end]:
+                best[end] = best[start] + demerits
+                previous[end] = start
+    lines = []
+    end = n
+    while end > 0:
+        start = previous[end]
+        lines.append(words[start:end])
+        end = start
+    return lines[::-1]
+
+
+def set_line(words, width=TEXT_WIDTH, size=FONT_SIZE):
+    """(TJ array, width in PDF units) for a line of words, its spaces shrunk to fit ``width``."""
+    pieces = [kerned(word) for word in words]
+    spaces = [space_after(word) for word in words[:-1]]
+    natural = sum(em for _, em in pieces) + sum(space for space, _ in spaces)
+    shrink = sum(amount for _, amount in spaces)
+    excess = natural - width * 1000 / size
+    ratio = min(excess / shrink, 1) if excess > 0 and shrink else 0
+    items = []
+    for index, (runs, _) in enumerate(pieces):
+        if index:
+            space, amount = spaces[index - 1]
+            items.append(space - ratio * amount)
+        items += runs
+    array = b"".join(_string(item) if isinstance(item, bytes) else b"%g" % round(-item, 2) for item in items)
+    return b"[" + array + b"]", (natural - ratio * shrink) * size / 1000
+
+
+def _string(encoded):
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class _Pages:
+    """Content and link annotations per page, filled top to bottom."""
+
+    def __init__(self):
+        self.pages = []
+        self.y = None
+        self.new_page()
+
+    def new_page(self):
+        self.pages.append(([], []))
+        self.y = None
+
+    def line(self, words, skip, font="F1", size=FONT_SIZE, link=None):
+        """Set one line ``skip`` below the previous baseline (top of page if first)."""
+        if self.y is not None and self.y - skip - DESCENT * size < MARGIN:
+            self.new_page()
+        # Glue at the top of a page is discarded, as in TeX
+        self.y = PAGE_HEIGHT - MARGIN - TOP_SKIP if self.y is None else self.y - skip
+        content, annots = self.pages[-1]
+        if font == "F1":
+            array, width = set_line(words, size=size)
+            shown = array + b" TJ"
+        else:
+            shown = _string(b" ".join(words)) + b" Tj"
+        content.append(b"BT /%s %.3f Tf 1 0 0 1 %.3f %.3f Tm %s ET"
+                       % (font.encode("ascii"), size, MARGIN, self.y, shown))
+        if link:
+            annots.append({
+                "Type": PdfName("Annot"),
+                "Subtype": PdfName("Link"),
+                "Rect": [MARGIN, round(self.y - DESCENT * size, 3),
+                         round(MARGIN + width, 3), round(self.y + ASCENT * size, 3)],
+                "Border": [0, 0, 0],
+                "A": {"S": PdfName("URI"), "URI": link.encode("latin-1", errors="replace")},
+            })
+
+    def block(self, lines, skip, links=None):
+        """A paragraph of lines of words: the first ``skip`` down, the rest one baselineskip apart."""
+        links = links or [None] * len(lines)
+        for index, (words, link) in enumerate(zip(lines, links)):
+            self.line(words, skip if index == 0 else BASELINE_SKIP, link=link)
+
+
+def layout(context):
+    """Lay out a letter context (CoverLetterGenerator.build_context()) into pages."""
+    pages = _Pages()
+    paragraph = BASELINE_SKIP + PARSKIP
+    pages.block(break_lines(encode(context["date"]).split()), 0)
+    contact = context["contact"]
+    pages.block([encode(text).split() for text, _ in contact], paragraph + VSPACE, [url for _, url in contact])
+    pages.block([encode(line).split() for line in context["recipient_lines"]], paragraph + VSPACE)
+    pages.block(break_lines(encode(context["opening"]).split()), paragraph + VSPACE)
+    for text in context["paragraphs"]:
+        pages.block(break_lines(encode(text).split()), paragraph)
+    pages.block([encode("Sincerely,").split()], paragraph + VSPACE)
+    pages.line(encode(context["name"]).split(), SIGNATURE_DROP, font="F2", size=SIGNATURE_SIZE)
+    return pages.pages
+
+
+def write_letter(context, info, pdf_file):
+    """Write the laid-out letter to ``pdf_file`` with ``info`` as document information."""
+    writer = PdfWriter()
+    catalog_ref = writer.reserve()
+    pages_ref = writer.reserve()
+    fonts = {
+        "F1": writer.add({
+            "Type": PdfName("Font"), "Subtype": PdfName("Type1"), "BaseFont": PdfName("Helvetica"),
+            "Encoding": PdfName("WinAnsiEncoding"), "FirstChar": FIRST_CHAR, "LastChar": 255,
+            "Widths": HELVETICA_WIDTHS,
+        }),
+        "F2": writer.add({
+            "Type": PdfName("Font"), "Subtype": PdfName("Type1"), "BaseFont": PdfName("Times-Italic"),
+            "Encoding": PdfName("WinAnsiEncoding"),
+        }),
+    }
+    resources = writer.add({"Font": fonts, "ProcSet": [PdfName("PDF"), PdfName("Text")]})
+    kids = []
+    for content, annots in layout(context):
+        stream = writer.add(PdfStream({"Filter": PdfName("FlateDecode")}, zlib.compress(b"\n".join(content), 9)))
+        page = {
+            "Type": PdfName("Page"),
+            "Parent": pages_ref,
+            "MediaBox": [0, 0, PAGE_WIDTH, PAGE_HEIGHT],
+            "Resources": resources,
+            "Contents": stream,
+        }
+        if annots:
+            page["Annots"] = [writer.add(annot) for annot in annots]
+        kids.append(writer.add(page))
+    writer.set(pages_ref, {"Type": PdfName("Pages"), "Kids": kids, "Count": len(kids)})
+    writer.set(catalog_ref, {"Type": PdfName("Catalog"), "Pages": pages_ref})
+    info_ref = writer.add({key: pdf_text_string(value) for key, value in info.items()})
+    return writer.write(pdf_file, catalog_ref, info_ref)
+
+
+def compare(fast_pdf, latex_pdf, tolerance=2.0):
+    """Line-by-line layout differences between two renders of the same letter.
+
+    Returns (report_lines, ok). Each text line is matched in reading order;
+    a difference is reported when the text differs (a different line
+    break) or the baseline or line end moved by more than ``tolerance``
+    PDF units. The signature, the last line, is set in a stand-in for
+    Calligra, so only its baseline is compared.
+    """
+    from generators.pdf import PdfReader
+    from generators.pdftext import text_lines
+
+    readers = PdfReader(fast_pdf), PdfReader(latex_pdf)
+    counts = [reader.page_count() for reader in readers]
+    report = []
+    ok = counts[0] == counts[1]
+    if not ok:
+        report.append(f"page count: fast {counts[0]}, latex {counts[1]}")
+    worst_y = worst_x = 0.0
+    for number in range(min(counts)):
+        fast, latex = (text_lines(reader, reader.pages[number][1]) for reader in readers)
+        for index in range(max(len(fast), len(latex))):
+            a = fast[index] if index < len(fast) else None
+            b = latex[index] if index < len(latex) else None
+            where = f"page {number + 1} line {index + 1}"
+            if a is None or b is None or a[3] != b[3]:
+                ok = False
+                report.append(f"{where}: text differs\n  fast:  {a[3] if a else '(none)'}\n"
+                              f"  latex: {b[3] if b else '(none)'}")
+                continue
+            signature = number == counts[0] - 1 and index == len(latex) - 1
+            dy, dx = a[0] - b[0], 0.0 if signature else a[2] - b[2]
+            worst_y, worst_x = max(worst_y, abs(dy)), max(worst_x, abs(dx))
+            if abs(dy) > tolerance or abs(dx) > tolerance:
+                ok = False
+                report.append(f"{where}: moved dy={dy:+.1f} dx_end={dx:+.1f}  {a[3][:60]}")
+    report.append(f"largest baseline shift {worst_y:.1f}, largest line-end shift {worst_x:.1f} "
+                  f"(tolerance {tolerance})")
+    return report, ok
+
+
+def main():
+    import argparse
+    import os
+    import tempfile
+    import time
+    from datetime import datetime
+    from coverletter.generator import CoverLetterGenerator
+
+    parser = argparse.ArgumentParser(description="Render the cover letter without TeX and compare it to the LaTeX render")
+    parser.add_argument("letter", nargs="?", default=os.path.join("coverletter", "coverletter.yml"))
+    parser.add_argument("--company", required=True, help="Company name for the placeholders")
+    parser.add_argument("-o", "--out", default=os.path.join(tempfile.gettempdir(), "coverletter-fast.pdf"))
+    parser.add_argument("--date", help="Letter date as YYYY-MM-DD, to match a render from another day")
+    parser.add_argument("--against", help="Compare with this LaTeX-rendered PDF of the same letter")
+    parser.add_argument("--latex", action="store_true", help="Render the LaTeX version too and compare")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Allowed baseline / line-end shift in PDF units (default: 2)")
+    args = parser.parse_args()
+    date = None
+    if args.date:
+        try:
+            date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        except ValueError:
+            parser.error(f"--date must look like 2025-10-15, got '{args.date}'")
+
+    generator = CoverLetterGenerator(args.letter)
+    generator.source_date = date
+    start = time.perf_counter()
+    generator.replace_placeholders(args.company)
+    write_letter(generator.build_context(), generator.pdf_info(), args.out)
+    print(f"{args.out} written in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    against = args.against
+    if args.latex:
+        latex = CoverLetterGenerator(args.letter)
+        latex.source_date = date
+        work_dir = tempfile.mkdtemp(prefix="coverletter-latex-")
+        against = latex.generate_pdf(os.path.join(work_dir, "letter.tex"), work_dir, args.company)
+    if against:
+        report, ok = compare(args.out, against, args.tolerance)
+        print("\n".join(report))
+        if not ok:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
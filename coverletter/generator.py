@@ -1,7 +1,11 @@
-from datetime import datetime
+import copy
 import os
-import subprocess
-from generators.base import DocumentGenerator
+import shutil
+import tempfile
+from coverletter.fastpdf import write_letter
+from generators.base import CompileTimeout, DocumentGenerator, find_pdflatex
+from generators.lint import LintError, yaml_fields
+from generators.packet import PAGE_LOG_PREAMBLE, compile_and_split, part_marker
 
 
 def latex_escape(text: str) -> str:
@@ -27,20 +31,28 @@ def latex_escape(text: str) -> str:
 
 
 class CoverLetterGenerator(DocumentGenerator):
-    def __init__(self, yaml_file):
+    template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+    # "latex", or "fast" to typeset the default layout in Python (fastpdf.py)
+    backend = "latex"
+
+    def __init__(self, yaml_file, template="default"):
         super().__init__(yaml_file)
+        self.template_name = template
+
+    def split_paragraphs(self, body_text: str):
+        """Split the body into paragraphs, joining wrapped lines within each."""
+        return [p.strip().replace("\n", " ") for p in (body_text or "").strip().split("\n\n") if p.strip()]
 
     def format_body_paragraphs(self, body_text: str) -> str:
         """Ensure paragraphs are separated by a blank line and flush-left (full block)."""
-        paragraphs = [p.strip().replace("\n", " ") for p in body_text.strip().split("\n\n") if p.strip()]
-        return "\n\n".join(latex_escape(p) for p in paragraphs)
+        return "\n\n".join(latex_escape(p) for p in self.split_paragraphs(body_text))
 
     def replace_placeholders(self, company_name: str):
         """Fill placeholders and normalize fields from YAML data, including date format."""
         data = self.data.copy()
 
-        # Date: use long US format (e.g., October 15, 2025)
-        data["letter"]["date"] = datetime.now().strftime("%B %d, %Y")
+        # Date: use long US format (e.g., October 15, 2025), pinned if set
+        data["letter"]["date"] = self.document_date().strftime("%B %d, %Y")
 
         # Replace company placeholders in opening/body
         for key in ("opening", "body"):
@@ -52,10 +64,43 @@ class CoverLetterGenerator(DocumentGenerator):
         self.data = data
         return data
 
+    def lint_fields(self):
+        """(YAML path, escaped text) for every letter field; links are left out."""
+        skip = {"email", "homepage", "linkedin", "website", "url"}
+        return [(path, latex_escape(text)) for path, _, text in yaml_fields(self.data or {}, skip=skip)]
+
     def generate_tex(self, company_name: str):
         self.replace_placeholders(company_name)
+        return self.get_template().render_string(self.build_context())
+
+    def get_latex_preamble(self) -> str:
+        """Packages, PDF metadata and the full-block page layout."""
+        return self.get_template().render_string(self.build_context(), block="preamble")
+
+    def get_letter_layout(self) -> str:
+        """Paragraph settings for the letter; also applied inside a packet."""
+        return self.get_template().render_string(self.build_context(), block="layout")
+
+    def generate_body(self) -> str:
+        """Letter content from the date line to the signature.
+
+        Expects replace_placeholders() to have run for the target company.
+        """
+        return self.get_template().render_string(self.build_context(), block="body")
+
+    def pdf_info(self):
+        """Document information matching the hypersetup in the preamble."""
+        personal = self.data["personal_information"]
+        recipient = self.data["recipient"]
+        return {
+            "Author": personal.get("name", ""),
+            "Title": f"Cover Letter - {personal.get('name', '')} - {recipient.get('title', '')}",
+            "Subject": f"Cover Letter for {recipient.get('company', '')}",
+        }
+
+    def build_context(self):
+        """Plain (unescaped) letter fields for the layout templates."""
         personal = self.data["personal_information"]
-        sign_name = personal.get("name", "")
         recipient = self.data["recipient"]
         letter = self.data["letter"]
 
@@ -74,117 +119,110 @@ class CoverLetterGenerator(DocumentGenerator):
         def display_url(url: str) -> str:
             return url.replace('https://www.', 'www.').replace('http://www.', 'www.').replace('https://', '').replace('http://', '')
 
-        sender_plain_lines = []
+        # (text, link) pairs, one per line
+        contact = []
         if address_first_line:
-            sender_plain_lines.append(f"{latex_escape(address_first_line)}")
+            contact.append((address_first_line, None))
         if phone:
-            sender_plain_lines.append(f"{latex_escape(phone)}")
+            contact.append((phone, None))
         if email:
-            sender_plain_lines.append(f"\\href{{mailto:{email}}}{{{latex_escape(email)}}}")
+            contact.append((email, f"mailto:{email}"))
         # Prefer LinkedIn if provided; also include homepage if present
         if linkedin:
-            sender_plain_lines.append(f"\\href{{{linkedin}}}{{{latex_escape(display_url(linkedin))}}}")
+            contact.append((display_url(linkedin), linkedin))
         if homepage:
-            sender_plain_lines.append(f"\\href{{{homepage}}}{{{latex_escape(display_url(homepage))}}}")
-
-        if sender_plain_lines:
-            # Add \noindent to first line, then break lines with \\
-            first = "\\noindent " + sender_plain_lines[0]
-            rest = sender_plain_lines[1:]
-            if rest:
-                sender_block = first + "\\\\\n" + "\\\\\n".join(rest)
-            else:
-                sender_block = first
-        else:
-            sender_block = ""
-
-        # Recipient block with explicit line breaks (\\) between lines
+            contact.append((display_url(homepage), homepage))
+
         recipient_lines = [
             recipient.get('name', ''),
             recipient.get('title', ''),
             recipient.get('company', ''),
             recipient.get('address', ''),
         ]
-        recipient_items = [latex_escape(line) for line in recipient_lines if line]
-        if recipient_items:
-            recipient_block = "\\\\\n".join(recipient_items)
-        else:
-            recipient_block = ""
 
         opening = letter.get('opening', 'Dear Hiring Manager')
         # Ensure colon after salutation
         if not opening.endswith(":"):
-            opening_with_colon = opening.rstrip(' ,:') + ":"
-        else:
-            opening_with_colon = opening
-
-        body_formatted = self.format_body_paragraphs(letter.get('body', ''))
-
-        typed_name = latex_escape(personal["name"])
-
-        latex_content = f"""\\documentclass[12pt, letterpaper]{{article}}
-\\usepackage[utf8]{{inputenc}}
-\\usepackage[T1]{{fontenc}}
-\\usepackage[margin=0.75in]{{geometry}}
-\\usepackage{{helvet}}
-\\usepackage{{calligra}}
-\\renewcommand{{\\familydefault}}{{\\sfdefault}}
-\\usepackage[hidelinks]{{hyperref}}
-\\usepackage{{setspace}}
-
-% ATS-friendly: ensure proper Unicode mapping for text extraction
-\\input{{glyphtounicode}}
-\\pdfgentounicode=1
-
-% PDF metadata for ATS systems
-\\hypersetup{{
-  pdfauthor={{{latex_escape(personal['name'])}}},
-  pdftitle={{Cover Letter - {latex_escape(personal['name'])} - {latex_escape(recipient.get('title', ''))}}},
-  pdfsubject={{Cover Letter for {latex_escape(recipient.get('company', ''))}}},
-}}
-
-% Black-and-white, full-block format
-\\pagenumbering{{gobble}}
-\\setlength{{\\parindent}}{{0pt}}
-\\setlength{{\\parskip}}{{12pt}}
-\\singlespacing
-\\raggedright
-
-\\begin{{document}}
-
-% Date
-\\noindent {latex_escape(letter['date'])}
-
-\\vspace{{12pt}}
-
-% Sender address and contact (no name)
-{sender_block}
-
-\\vspace{{12pt}}
-
-% Recipient block
-\\noindent {recipient_block}
-
-\\vspace{{12pt}}
-
-% Salutation with colon
-\\noindent {latex_escape(opening_with_colon)}
-
-% Body paragraphs (single spaced, blank line between)
-{body_formatted}
-
-\\vspace{{12pt}}
-
-% Complimentary close with comma
-Sincerely,
-
-% Digital signature line
-\\vspace{{6pt}}
-{{\\fontsize{{20}}{{24}}\\selectfont\\calligra {sign_name}}}
-
-\\end{{document}}
-"""
-        return latex_content
+            opening = opening.rstrip(' ,:') + ":"
+
+        return {
+            "personal": personal,
+            "recipient": recipient,
+            "date": letter['date'],
+            "contact": contact,
+            "recipient_lines": [line for line in recipient_lines if line],
+            "opening": opening,
+            "paragraphs": self.split_paragraphs(letter.get('body', '')),
+            "name": personal.get("name", ""),
+            "esc": latex_escape,
+        }
+
+    def fill_recipient(self, entry):
+        """Point the letter at one mail-merge entry and fill placeholders.
+
+        ``entry`` holds ``company`` plus optional ``role`` and ``recipient``
+        (name, title, address). Unset recipient fields keep the YAML values.
+        """
+        recipient = dict(self.data.get("recipient") or {})
+        if entry.get("role"):
+            recipient["title"] = entry["role"]
+        recipient.update(entry.get("recipient") or {})
+        recipient["company"] = entry["company"]
+        self.data["recipient"] = recipient
+        return self.replace_placeholders(entry["company"])
+
+    def generate_bulk_tex(self, entries):
+        """One LaTeX document holding a letter per entry, each on fresh pages."""
+        template = copy.deepcopy(self.data)
+        bodies = []
+        for index, entry in enumerate(entries):
+            self.data = copy.deepcopy(template)
+            self.fill_recipient(entry)
+            bodies.append(part_marker(f"letter{index}") + "\n\n" + self.generate_body())
+        self.data = template
+
+        return (
+            self.get_latex_preamble()
+            + PAGE_LOG_PREAMBLE
+            + "\n\\begin{document}\n\n"
+            + "\n".join(bodies)
+            + "\n\\end{document}\n"
+        )
+
+    def generate_bulk_pdf(self, entries):
+        """Render every entry in one pdflatex run and split per company.
+
+        Each entry needs ``output``, the target PDF path. Returns the list of
+        written PDFs in entry order.
+        """
+        template = copy.deepcopy(self.data)
+        outputs = {}
+        for index, entry in enumerate(entries):
+            self.data = copy.deepcopy(template)
+            self.fill_recipient(entry)
+            outputs[f"letter{index}"] = (entry["output"], self.pdf_info())
+            os.makedirs(os.path.dirname(entry["output"]), exist_ok=True)
+            if self.backend == "fast":
+                write_letter(self.build_context(), self.pdf_info(), entry["output"])
+        self.data = template
+        if self.backend == "fast":
+            return [entry["output"] for entry in entries]
+
+        work_dir = tempfile.mkdtemp(prefix="coverletters-")
+        try:
+            tex_file = os.path.join(work_dir, "coverletters.tex")
+            tex_source = self.generate_bulk_tex(entries)
+            self.preflight(tex_source)
+            with open(tex_file, "w", encoding="utf-8") as tex:
+                tex.write(tex_source)
+            _, written = compile_and_split(self, tex_file, outputs)
+            return [written[f"letter{index}"] for index in range(len(entries))]
+        except (CompileTimeout, LintError):
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate PDF: {str(e)}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
     def save_cover_letter(self, output_file_path, company_name: str):
         output_dir = os.path.dirname(output_file_path)
@@ -200,10 +238,23 @@ Sincerely,
 
     def generate_pdf(self, output_file_path, output_dir, company_name: str):
         try:
+            if self.backend == "fast":
+                pdf_file = os.path.splitext(output_file_path)[0] + ".pdf"
+                os.makedirs(os.path.dirname(os.path.abspath(pdf_file)), exist_ok=True)
+                self.replace_placeholders(company_name)
+                return write_letter(self.build_context(), self.pdf_info(), pdf_file)
+            tex_source = self.generate_tex(company_name)
+            self.preflight(tex_source)
+            if self.uses_warm_pool():
+                pdf_file = self.render_warm(tex_source, os.path.splitext(output_file_path)[0] + ".pdf")
+                if pdf_file:
+                    return pdf_file
             tex_file = self.save_cover_letter(output_file_path, company_name)
             pdf_file = self.compile_pdf(tex_file, output_dir)
             os.remove(tex_file)
             return pdf_file
+        except LintError:
+            raise
         except Exception as e:
             print(f"Failed to generate PDF: {str(e)}")
             raise
@@ -211,46 +262,10 @@ Sincerely,
     def compile_pdf(self, tex_file, output_dir):
         try:
             output_dir = os.path.dirname(tex_file)
-            # Try to find pdflatex in common locations
-            pdflatex_paths = [
-                "pdflatex",  # If it's in PATH
-                "/usr/local/texlive/2024/bin/universal-darwin/pdflatex",
-                "/usr/local/texlive/2024/bin/x86_64-darwin/pdflatex",
-                "/Library/TeX/texbin/pdflatex",
-            ]
-
-            pdflatex_cmd = None
-            for path in pdflatex_paths:
-                if os.path.exists(path) or path == "pdflatex":
-                    try:
-                        subprocess.run(
-                            [path, "--version"], check=True, capture_output=True
-                        )
-                        pdflatex_cmd = path
-                        break
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        continue
-
-            if not pdflatex_cmd:
-                raise Exception(
-                    "pdflatex not found. Please install LaTeX (MacTeX) or add it to PATH"
-                )
+            pdflatex_cmd = find_pdflatex()
 
             for _ in range(2):
-                result = subprocess.run(
-                    [
-                        pdflatex_cmd,
-                        "-interaction=nonstopmode",
-                        "-output-directory=" + output_dir,
-                        tex_file,
-                    ],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode != 0:
-                    print(result.stdout)
-                    print(result.stderr)
+                self.run_pdflatex(pdflatex_cmd, tex_file, output_dir)
             base_name = os.path.splitext(tex_file)[0]
             for ext in [".aux", ".log", ".out"]:
                 aux_file = base_name + ext
@@ -260,5 +275,7 @@ Sincerely,
             if os.path.exists(pdf_file):
                 return pdf_file
             raise Exception("PDF file was not generated")
+        except CompileTimeout:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate PDF: {str(e)}")
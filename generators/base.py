@@ -1,18 +1,338 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 import os
+import signal
 import subprocess
+import tempfile
+import time
 import yaml
 
+from generators.lint import LintError, lint
+from generators.template import find_template, load_template
+
+try:
+    import resource
+except ImportError:  # Windows has no setrlimit; only the wall-clock limit applies
+    resource = None
+
+# Per-pass limits for pdflatex. A one-page resume compiles in well under a
+# second, so these only trip when the engine is looping or waiting on input.
+COMPILE_TIMEOUT = 60  # wall-clock seconds
+COMPILE_CPU_LIMIT = 30  # CPU seconds
+COMPILE_MEMORY_LIMIT = 2 * 1024 ** 3  # bytes of address space
+# Lines of the LaTeX log shown when a pass fails or runs over
+LOG_TAIL_LINES = 20
+# How often a cancellable pass checks its cancel event, in seconds
+CANCEL_POLL = 0.05
+
+# Try to find pdflatex in common locations
+PDFLATEX_PATHS = [
+    "pdflatex",  # If it's in PATH
+    "/usr/local/texlive/2024/bin/universal-darwin/pdflatex",
+    "/usr/local/texlive/2024/bin/x86_64-darwin/pdflatex",
+    "/Library/TeX/texbin/pdflatex",
+]
+
+# pdfTeX settings for byte-identical output, given ahead of the document on
+# the command line: drop the random trailer /ID and the PTEX.* keys that
+# record absolute paths and the engine banner. The dates come from
+# SOURCE_DATE_EPOCH (see reproducible_env).
+REPRODUCIBLE_PRIMITIVES = r"\pdftrailerid{}\pdfsuppressptexinfo=-1"
+
+
+class CompileTimeout(Exception):
+    """Raised when pdflatex exceeds its wall-clock or CPU budget.
+
+    ``log`` holds whatever the engine wrote before it was killed, which is
+    usually enough to spot the runaway bullet.
+    """
+
+    def __init__(self, tex_file, limit, log=""):
+        self.tex_file = tex_file
+        self.limit = limit
+        self.log = log
+        super().__init__(
+            f"pdflatex exceeded its {limit}s limit on {os.path.basename(tex_file)}"
+        )
+
+    def log_tail(self, lines=LOG_TAIL_LINES):
+        """Return the last few lines of the partial log."""
+        return "\n".join(self.log.splitlines()[-lines:])
+
+
+class CompileCancelled(Exception):
+    """Raised when a pdflatex pass is stopped through its cancel event."""
+
+    def __init__(self, tex_file):
+        self.tex_file = tex_file
+        super().__init__(f"pdflatex cancelled on {os.path.basename(tex_file)}")
+
+
+def find_pdflatex():
+    """Return the first working pdflatex command, or raise if none is found."""
+    for path in PDFLATEX_PATHS:
+        if os.path.exists(path) or path == "pdflatex":
+            try:
+                subprocess.run(
+                    [path, "--version"], check=True, capture_output=True,
+                    timeout=COMPILE_TIMEOUT,
+                )
+                return path
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired,
+                    FileNotFoundError):
+                continue
+    raise Exception(
+        "pdflatex not found. Please install LaTeX (MacTeX) or add it to PATH"
+    )
+
+
+def source_date_epoch(date=None):
+    """Seconds since the epoch to pin a deterministic build to.
+
+    An explicit ``date`` wins (midnight UTC), then an exported
+    SOURCE_DATE_EPOCH, then midnight UTC today.
+    """
+    if date is None and os.environ.get("SOURCE_DATE_EPOCH", "").isdigit():
+        return int(os.environ["SOURCE_DATE_EPOCH"])
+    if date is None:
+        date = datetime.now(timezone.utc).date()
+    return int(datetime(date.year, date.month, date.day, tzinfo=timezone.utc).timestamp())
+
+
+def reproducible_env(epoch):
+    """Environment that makes pdfTeX take every timestamp from ``epoch``."""
+    env = dict(os.environ)
+    env["SOURCE_DATE_EPOCH"] = str(epoch)
+    # Also pin \today, \year and \time, not just the PDF info dates
+    env["FORCE_SOURCE_DATE"] = "1"
+    return env
+
+
+def _spawn_limited(args, cpu_limit, memory_limit, **popen_args):
+    """Popen ``args`` in a new session with its CPU time and memory capped.
+
+    No preexec_fn: the child can deadlock before exec when the parent has
+    threads, and engines are started from worker threads (speculative
+    renders, the warm pool). On Linux the caps are set on the running child
+    with prlimit; elsewhere on POSIX a /bin/sh wrapper sets them with
+    ulimit and execs the engine, so the pid and process group are the same.
+    """
+    prlimit = getattr(resource, "prlimit", None)
+    if resource is not None and prlimit is None:
+        limits = []
+        if cpu_limit:
+            # Hard limit first, one second above the soft one, as with prlimit
+            limits.append(f"ulimit -Ht {int(cpu_limit) + 1}; ulimit -St {int(cpu_limit)}")
+        if memory_limit:
+            limits.append(f"ulimit -v {int(memory_limit) // 1024} 2>/dev/null")  # not enforced on macOS
+        if limits:
+            args = ["/bin/sh", "-c", "; ".join(limits) + '; exec "$@"', "sh", *args]
+    proc = subprocess.Popen(args, start_new_session=True, **popen_args)
+    if prlimit is not None:
+        try:
+            if cpu_limit:
+                # SIGXCPU at the soft limit, SIGKILL one second later
+                prlimit(proc.pid, resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+            if memory_limit:
+                prlimit(proc.pid, resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ProcessLookupError, PermissionError, ValueError):
+            pass  # the engine already exited, or the limit cannot be lowered here
+    return proc
+
+
+def _kill_process_group(proc):
+    """Kill pdflatex together with any helpers it spawned (mktextfm etc.)."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _read_partial_log(tex_file, output_dir, fallback=b""):
+    """Read the .log pdflatex was writing, falling back to captured stdout."""
+    log_file = os.path.join(
+        output_dir, os.path.splitext(os.path.basename(tex_file))[0] + ".log"
+    )
+    try:
+        with open(log_file, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return (fallback or b"").decode("utf-8", errors="replace")
+
+
+def run_pdflatex(pdflatex_cmd, tex_file, output_dir, timeout=COMPILE_TIMEOUT,
+                 cpu_limit=COMPILE_CPU_LIMIT, memory_limit=COMPILE_MEMORY_LIMIT,
+                 env=None, epoch=None, cancel=None):
+    """Run a single pdflatex pass under hard limits and return its output.
+
+    The engine runs in its own process group so a timeout can take down the
+    whole tree. Raises CompileTimeout on a wall-clock or CPU overrun and
+    subprocess.CalledProcessError on any other non-zero exit.
+
+    With ``epoch`` set the pass is reproducible: every timestamp comes from
+    it and the trailer ID and path-bearing keys are left out, so the same
+    source always yields the same bytes.
+
+    ``cancel`` is an optional threading.Event; once it is set the engine is
+    killed within CANCEL_POLL seconds and CompileCancelled is raised.
+    """
+    if cancel is not None and cancel.is_set():
+        raise CompileCancelled(tex_file)
+    args = [
+        pdflatex_cmd,
+        "-interaction=nonstopmode",
+        "-output-directory=" + output_dir,
+    ]
+    if epoch is None:
+        args.append(tex_file)
+    else:
+        env = reproducible_env(epoch) if env is None else {**env, **reproducible_env(epoch)}
+        jobname = os.path.splitext(os.path.basename(tex_file))[0]
+        args += [
+            "-jobname=" + jobname,
+            REPRODUCIBLE_PRIMITIVES + "\\input{" + tex_file.replace(os.sep, "/") + "}",
+        ]
+    # Capture into a file rather than a pipe: a helper left behind by a
+    # killed engine would otherwise hold the pipe open and block us
+    with tempfile.TemporaryFile() as capture:
+        proc = _spawn_limited(
+            args,
+            cpu_limit,
+            memory_limit,
+            stdin=subprocess.DEVNULL,
+            stdout=capture,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+        cancelled = False
+        try:
+            if cancel is None:
+                proc.wait(timeout=timeout)
+            else:
+                deadline = time.monotonic() + timeout
+                while proc.poll() is None and not cancelled:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(args, timeout)
+                    try:
+                        proc.wait(timeout=min(remaining, CANCEL_POLL))
+                    except subprocess.TimeoutExpired:
+                        cancelled = cancel.is_set()
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            timed_out = True
+        # Reap the whole group, including anything the engine spawned
+        _kill_process_group(proc)
+        proc.wait()
+        capture.seek(0)
+        output = capture.read()
+
+    if cancelled:
+        raise CompileCancelled(tex_file)
+    if timed_out:
+        raise CompileTimeout(tex_file, timeout, _read_partial_log(tex_file, output_dir, output))
+    # The soft CPU limit sends SIGXCPU, which pdflatex does not catch. A
+    # SIGKILL reaching here was not ours (the timeout path raised above):
+    # the OOM killer, a kill -9, or the hard limit after SIGXCPU was ignored
+    # are reported as a failed pass, with the log, not as a slow document
+    if cpu_limit and hasattr(signal, "SIGXCPU") and proc.returncode == -signal.SIGXCPU:
+        raise CompileTimeout(tex_file, cpu_limit, _read_partial_log(tex_file, output_dir, output))
+    if proc.returncode < 0:
+        log = _read_partial_log(tex_file, output_dir, output)
+        output = "\n".join(log.splitlines()[-LOG_TAIL_LINES:]).encode("utf-8")
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args, output=output)
+    return output
+
+
 class DocumentGenerator(ABC):
+    # Per-pass pdflatex limits; override per instance for slow machines
+    compile_timeout = COMPILE_TIMEOUT
+    compile_cpu_limit = COMPILE_CPU_LIMIT
+    # Layout templates: subclasses point template_dir at their templates/
+    template_dir = None
+    template_name = "default"
+    template_extension = ".tex"
+    # Deterministic builds: same input, same PDF bytes (see run_pdflatex)
+    deterministic = False
+    source_date = None  # datetime.date pinned with --date
+    # generators.warm.WarmPool; when set, PDFs are typeset on pre-started engines
+    warm_pool = None
+    # threading.Event that stops this generator's pdflatex passes when set
+    cancel_event = None
+
     def __init__(self, yaml_file):
+        self.data = self.load_data(yaml_file)
+
+    def load_data(self, yaml_file):
+        """Parse the document's YAML; subclasses may merge in other files."""
         with open(yaml_file, 'r') as file:
-            self.data = yaml.safe_load(file)
-    
+            return yaml.safe_load(file)
+
     @abstractmethod
     def generate_tex(self, tex_file):
         """Generate a LaTeX file from the YAML data."""
         pass
 
+    def get_template(self):
+        """Compiled layout template (cached, recompiled when the file changes)."""
+        return load_template(find_template(self.template_dir, self.template_name, self.template_extension))
+
+    def lint_fields(self):
+        """(YAML path, field text as the template writes it) for preflight()."""
+        return []
+
+    def preflight(self, tex_source):
+        """Raise LintError if ``tex_source`` would not compile (generators/lint.py).
+
+        Runs in under a millisecond, so every render pays it before
+        spending time in pdflatex.
+        """
+        problems = lint(tex_source, self.lint_fields())
+        if problems:
+            raise LintError(problems)
+
+    def document_date(self):
+        """Date printed in the document: the pinned date, else today."""
+        if self.source_date is not None:
+            return self.source_date
+        if self.deterministic:
+            return datetime.fromtimestamp(source_date_epoch(), timezone.utc).date()
+        return datetime.now()
+
+    def run_pdflatex(self, pdflatex_cmd, tex_file, output_dir):
+        """Run one pdflatex pass with this generator's limits."""
+        return run_pdflatex(
+            pdflatex_cmd, tex_file, output_dir,
+            timeout=self.compile_timeout,
+            cpu_limit=self.compile_cpu_limit,
+            epoch=source_date_epoch(self.source_date) if self.deterministic else None,
+            cancel=self.cancel_event,
+        )
+
+    def uses_warm_pool(self):
+        return self.warm_pool is not None and self.warm_pool.available
+
+    def render_warm(self, tex_source, pdf_file):
+        """Typeset ``tex_source`` into ``pdf_file`` on the warm pool.
+
+        Returns None when the warm engine times out or dies; the caller
+        then compiles cold with compile_pdf, which also reports a genuine
+        LaTeX error with its log.
+        """
+        try:
+            return self.warm_pool.render(
+                tex_source, pdf_file,
+                timeout=self.compile_timeout,
+                epoch=source_date_epoch(self.source_date) if self.deterministic else None,
+            )
+        except (CompileTimeout, subprocess.CalledProcessError, OSError) as e:
+            print(f"Warm engine failed ({e}); compiling without the pool")
+            return None
+
     def generate_pdf(self, tex_file, output_dir):
         """Compile LaTeX file to PDF using pdflatex"""
         try:
@@ -21,12 +341,7 @@ class DocumentGenerator(ABC):
             
             # Run pdflatex twice to ensure proper generation of references
             for _ in range(2):
-                subprocess.run([
-                    'pdflatex',
-                    '-interaction=nonstopmode',
-                    '-output-directory=' + output_dir,
-                    tex_file
-                ], check=True, capture_output=True)
+                self.run_pdflatex('pdflatex', tex_file, output_dir)
             
             # Clean up auxiliary files
             base_name = os.path.splitext(tex_file)[0]
@@ -40,5 +355,7 @@ class DocumentGenerator(ABC):
                 return pdf_file
             else:
                 raise Exception("PDF file was not generated")
+        except CompileTimeout:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to generate PDF: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to generate PDF: {str(e)}") 
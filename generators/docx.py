@@ -0,0 +1,345 @@
+"""DOCX output for the resume and cover letter, written without Word.
+
+Some ATS portals parse Word files better than PDFs. ``DocxWriter`` writes
+the WordprocessingML parts of a .docx straight into a ``zipfile`` stream:
+paragraphs go into ``word/document.xml`` as they are produced, and the
+relationships for any hyperlinks are written once the body is done. The
+resume and cover letter follow the same ``build_context()`` sections as
+the PDF layouts, ``\\textbf{...}`` spans become bold runs, and the page
+margins match the LaTeX templates. A document takes a few milliseconds.
+
+Zip entries carry a fixed timestamp and the core properties no dates, so
+the same YAML always produces the same bytes.
+
+    python main.py --company "Example Corp" --role "Engineer" --format pdf,docx
+"""
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from coverletter.generator import CoverLetterGenerator
+from generators.preview import latex_to_text
+from resume.generator import ResumeGenerator
+
+# Twentieths of a point (twips) per inch; letter paper
+TWIPS = 1440
+PAGE_SIZE = (int(8.5 * TWIPS), 11 * TWIPS)
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+FONT = "Arial"  # Word's stand-in for Helvetica
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+PACKAGE_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
+</Types>"""
+
+ROOT_RELS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="{PACKAGE_RELS}">
+<Relationship Id="rId1" Type="{REL_TYPE}officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
+</Relationships>"""
+
+NUMBERING = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:numbering xmlns:w="{W_NS}">
+<w:abstractNum w:abstractNumId="0"><w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="bullet"/>
+<w:lvlText w:val="\u2022"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="360" w:hanging="200"/></w:pPr></w:lvl></w:abstractNum>
+<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>
+</w:numbering>"""
+
+# \textbf{..}, \textit{..}, {\bfseries ..} and \href{url}{..}, one brace level deep
+MARKUP_RE = re.compile(
+    r"\\(textbf|textit|emph|underline)\{((?:[^{}]|\{[^{}]*\})*)\}"
+    r"|\{\\bfseries\s*((?:[^{}]|\{[^{}]*\})*)\}"
+    r"|\\href\{([^{}]*)\}\{((?:[^{}]|\{[^{}]*\})*)\}"
+)
+
+
+def runs(text, bold=False, italic=False, link=None):
+    """[(text, bold, italic, link)] for a YAML string holding LaTeX markup."""
+    text = "" if text is None else str(text)
+    found = []
+    pos = 0
+    for m in MARKUP_RE.finditer(text):
+        if m.start() > pos:
+            found.append((latex_to_text(text[pos:m.start()]), bold, italic, link))
+        if m.group(1):
+            command = m.group(1)
+            found += runs(m.group(2), bold or command == "textbf", italic or command in ("textit", "emph"), link)
+        elif m.group(3) is not None:
+            found += runs(m.group(3), True, italic, link)
+        else:
+            found += runs(m.group(5), bold, italic, m.group(4))
+        pos = m.end()
+    if pos < len(text):
+        found.append((latex_to_text(text[pos:]), bold, italic, link))
+    return [run for run in found if run[0]]
+
+
+def plain(text, bold=False, italic=False, link=None):
+    """A single run of literal text (no LaTeX markup to convert)."""
+    return [(str(text), bold, italic, link)] if text else []
+
+
+class DocxWriter:
+    """Write one .docx, paragraph by paragraph, into a zip stream.
+
+    ``margins`` is (top, right, bottom, left) in inches; ``size`` is the
+    body font size in points. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path, info=None, margins=(1, 1, 1, 1), size=11):
+        self.path = path
+        self.info = info or {}
+        self.margins = margins
+        self.size = size
+        self.links = {}
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        self._part("[Content_Types].xml", CONTENT_TYPES)
+        self._part("_rels/.rels", ROOT_RELS)
+        self._part("word/styles.xml", self.styles())
+        self._part("word/numbering.xml", NUMBERING)
+        self.body = self.zip.open(self._entry("word/document.xml"), "w")
+        self._write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _entry(name):
+        entry = zipfile.ZipInfo(name, ZIP_DATE)
+        entry.compress_type = zipfile.ZIP_DEFLATED
+        return entry
+
+    def _part(self, name, xml):
+        self.zip.writestr(self._entry(name), xml)
+
+    def _write(self, xml):
+        self.body.write(xml.encode("utf-8"))
+
+    @property
+    def text_width(self):
+        """Twips between the side margins (the position of a right tab)."""
+        return PAGE_SIZE[0] - round((self.margins[1] + self.margins[3]) * TWIPS)
+
+    def styles(self):
+        half_points = round(self.size * 2)
+        return f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{W_NS}">
+<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="{FONT}" w:hAnsi="{FONT}" w:cs="{FONT}"/>
+<w:sz w:val="{half_points}"/><w:szCs w:val="{half_points}"/><w:lang w:val="en-US"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/><w:qFormat/>
+<w:pPr><w:jc w:val="center"/></w:pPr><w:rPr><w:b/><w:sz w:val="40"/><w:szCs w:val="40"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/>
+<w:pPr><w:keepNext/><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="000000"/></w:pBdr>
+<w:spacing w:before="160" w:after="60"/><w:outlineLvl w:val="0"/></w:pPr>
+<w:rPr><w:b/><w:smallCaps/><w:sz w:val="{half_points + 4}"/><w:szCs w:val="{half_points + 4}"/></w:rPr></w:style>
+</w:styles>"""
+
+    def paragraph(self, content, style=None, bullet=False, right=None, align=None,
+                  before=0, after=0, size=None):
+        """One paragraph of (text, bold, italic, link) runs.
+
+        ``right`` is a second run list set flush right on the same line (a
+        date or a location); tabs and newlines inside run text become Word
+        tabs and line breaks. ``before``/``after`` are points of spacing.
+        """
+        props = []
+        if style:
+            props.append(f'<w:pStyle w:val="{style}"/>')
+        if bullet:
+            props.append('<w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>')
+        if right:
+            props.append(f'<w:tabs><w:tab w:val="right" w:pos="{self.text_width}"/></w:tabs>')
+        if before or after:
+            props.append(f'<w:spacing w:before="{round(before * 20)}" w:after="{round(after * 20)}"/>')
+        if align:
+            props.append(f'<w:jc w:val="{align}"/>')
+        xml = ["<w:p>"]
+        if props:
+            xml.append("<w:pPr>" + "".join(props) + "</w:pPr>")
+        content = list(content)
+        if right:
+            content += [("\t", False, False, None)] + list(right)
+        for text, bold, italic, link in content:
+            run = self._run(text, bold, italic, size)
+            if link:
+                run = f'<w:hyperlink r:id="{self._link(link)}">{run}</w:hyperlink>'
+            xml.append(run)
+        xml.append("</w:p>")
+        self._write("".join(xml))
+
+    def _run(self, text, bold, italic, size):
+        props = ("<w:b/>" if bold else "") + ("<w:i/>" if italic else "")
+        if size:
+            props += f'<w:sz w:val="{round(size * 2)}"/><w:szCs w:val="{round(size * 2)}"/>'
+        parts = []
+        for index, line in enumerate(text.split("\n")):
+            if index:
+                parts.append("<w:br/>")
+            for column, piece in enumerate(line.split("\t")):
+                if column:
+                    parts.append("<w:tab/>")
+                if piece:
+                    parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        return "<w:r>" + (f"<w:rPr>{props}</w:rPr>" if props else "") + "".join(parts) + "</w:r>"
+
+    def _link(self, url):
+        if url not in self.links:
+            self.links[url] = f"rId{len(self.links) + 3}"
+        return self.links[url]
+
+    def close(self):
+        if self.zip is None:
+            return
+        top, right, bottom, left = (round(inches * TWIPS) for inches in self.margins)
+        self._write(f'<w:sectPr><w:pgSz w:w="{PAGE_SIZE[0]}" w:h="{PAGE_SIZE[1]}"/>'
+                    f'<w:pgMar w:top="{top}" w:right="{right}" w:bottom="{bottom}" w:left="{left}" '
+                    f'w:header="0" w:footer="0" w:gutter="0"/></w:sectPr></w:body></w:document>')
+        self.body.close()
+        rels = [f'<Relationship Id="rId1" Type="{REL_TYPE}styles" Target="styles.xml"/>',
+                f'<Relationship Id="rId2" Type="{REL_TYPE}numbering" Target="numbering.xml"/>']
+        for url, rel_id in self.links.items():
+            rels.append(f'<Relationship Id="{rel_id}" Type="{REL_TYPE}hyperlink" '
+                        f'Target={quoteattr(url)} TargetMode="External"/>')
+        self._part("word/_rels/document.xml.rels",
+                   f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                   f'<Relationships xmlns="{PACKAGE_RELS}">' + "".join(rels) + "</Relationships>")
+        self._part("docProps/core.xml", self.core_properties())
+        self.zip.close()
+        self.zip = None
+
+    def core_properties(self):
+        fields = {"dc:title": "Title", "dc:subject": "Subject", "dc:creator": "Author", "cp:keywords": "Keywords"}
+        values = "".join(f"<{tag}>{escape(self.info[key])}</{tag}>"
+                         for tag, key in fields.items() if self.info.get(key))
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/">' + values + "</cp:coreProperties>")
+
+
+def _docx_path(output_file_path):
+    path = os.path.splitext(output_file_path)[0] + ".docx"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return path
+
+
+class ResumeDocxGenerator(ResumeGenerator):
+    """The resume sections of default.tex as a Word document."""
+
+    def write_docx(self, doc):
+        ctx = self.build_context()
+        personal = ctx["personal"]
+        doc.paragraph(runs(personal.get("name", "")), style="Title")
+        contact = []
+        for key, link in (("phone", None), ("email", "mailto:"), ("website", ""), ("linkedin", ""), ("location", None)):
+            value = personal.get(key)
+            if not value:
+                continue
+            if contact:
+                contact += plain(" | ")
+            shown = str(value).replace("https://www.", "").replace("https://", "")
+            contact += plain(shown, link=None if link is None else link + str(value))
+        doc.paragraph(contact, align="center")
+
+        def section(title):
+            doc.paragraph(plain(title), style="Heading1")
+
+        if ctx["summary"]:
+            section("Summary")
+            doc.paragraph(runs(ctx["summary"]))
+        section("Experience")
+        for job in ctx["experience"]:
+            doc.paragraph(runs(job.get("title", ""), bold=True), right=runs(job.get("date", "")), before=3)
+            doc.paragraph(runs(job.get("company", ""), italic=True), right=runs(job.get("location", ""), italic=True))
+            for achievement in job["achievements"]:
+                doc.paragraph(runs(achievement), bullet=True)
+        section("Projects")
+        for project in ctx["projects"]:
+            doc.paragraph(runs(project.get("name", ""), bold=True, link=project.get("link"))
+                          + plain(" | ") + runs(project.get("description", "")), bullet=True)
+        section("Skills")
+        for category in ctx["skills"]:
+            doc.paragraph(runs(category.get("name", ""), bold=True) + plain(": ") + runs(category.get("items", "")))
+        section("Education")
+        for school in ctx["education"]:
+            degree = runs(school.get("degree", ""), italic=True)
+            if school.get("GPA"):
+                degree += plain(f", GPA: {school['GPA']}", italic=True)
+            doc.paragraph(runs(school.get("name", ""), bold=True), right=runs(school.get("location", "")), before=3)
+            doc.paragraph(degree, right=runs(school.get("date", ""), italic=True))
+            if school.get("courses"):
+                doc.paragraph(runs(school["courses"]), bullet=True)
+        if ctx["certifications"]:
+            section("Certifications")
+            for cert in ctx["certifications"]:
+                issuer = plain(", ") + runs(cert["issuer"]) if cert.get("issuer") else []
+                doc.paragraph(runs(cert.get("title") or cert.get("name", ""), bold=True) + issuer,
+                              bullet=True, right=runs(cert.get("date", "")))
+        if ctx["leadership"] or ctx["awards"]:
+            section("Leadership & Awards")
+            for item in ctx["leadership"]:
+                description = plain("\n") + runs(item["description"]) if item.get("description") else []
+                doc.paragraph(runs(item.get("name", ""), bold=True),
+                              right=runs(item.get("date", "")) + description, bullet=True)
+            if ctx["awards"]:
+                doc.paragraph(plain("Awards", bold=True) + plain(": ")
+                              + runs(", ".join(ctx["awards"])), bullet=True)
+        if ctx["activities"]:
+            section("Activities & Club Involvement")
+            for activity in ctx["activities"]:
+                description = plain("\n") + runs(activity["description"]) if activity.get("description") else []
+                doc.paragraph(runs(activity.get("name", ""), bold=True),
+                              right=runs(activity.get("date", "")) + description, bullet=True)
+
+    def generate_docx(self, output_file_path):
+        """Write the resume as .docx next to ``output_file_path``; returns its path."""
+        path = _docx_path(output_file_path)
+        # Margins of default.tex: 0.3in top and bottom, 0.5in at the sides
+        with DocxWriter(path, self.pdf_info(), margins=(0.3, 0.5, 0.3, 0.5), size=10) as doc:
+            self.write_docx(doc)
+        return path
+
+
+class CoverLetterDocxGenerator(CoverLetterGenerator):
+    """The full-block letter of default.tex as a Word document."""
+
+    def write_docx(self, doc):
+        ctx = self.build_context()
+        gap = 12  # \parskip plus the \vspace{12pt} between letter blocks
+        doc.paragraph(plain(ctx["date"]), after=2 * gap)
+        contact = []
+        for text, url in ctx["contact"]:
+            if contact:
+                contact += plain("\n")
+            contact += plain(text, link=url)
+        doc.paragraph(contact, after=2 * gap)
+        doc.paragraph(plain("\n".join(ctx["recipient_lines"])), after=2 * gap)
+        doc.paragraph(plain(ctx["opening"]), after=gap)
+        for text in ctx["paragraphs"]:
+            doc.paragraph(plain(text), after=gap)
+        doc.paragraph(plain("Sincerely,"), before=gap, after=6)
+        doc.paragraph(plain(ctx["name"], italic=True), size=20)
+
+    def generate_docx(self, output_file_path, company_name):
+        """Write the letter as .docx next to ``output_file_path``; returns its path."""
+        self.replace_placeholders(company_name)
+        path = _docx_path(output_file_path)
+        with DocxWriter(path, self.pdf_info(), margins=(0.75, 0.75, 0.75, 0.75), size=12) as doc:
+            self.write_docx(doc)
+        return path
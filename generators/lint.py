@@ -0,0 +1,273 @@
+"""Preflight checks on LaTeX before pdflatex is spawned.
+
+A stray ``$``, an unbalanced brace or an unescaped ``^`` in a YAML bullet
+only shows up after two pdflatex passes, as a bare CalledProcessError
+(``escape_latex`` deliberately leaves ``$``, ``{`` and ``}`` alone so
+bullets can carry math and grouping). These checks catch them in under a
+millisecond per document, before any compile time is spent:
+
+- each YAML field, as it reaches LaTeX (after ``esc``): balanced braces,
+  balanced ``$``, no ``&``, ``#``, ``%``, ``^`` or ``_`` outside math, only
+  known commands, and only characters pdflatex can set from UTF-8
+- the assembled document: balanced braces, ``$`` and ``\\[ \\]``/``\\( \\)``
+  per paragraph, and ``\\begin``/``\\end`` pairs in the body
+
+Every problem is reported with the YAML path of the field it comes from
+(``experience[0].achievements[2]``); a problem in the assembled document
+is traced back to the field whose text sits on that line, or else given
+as a line number.
+
+    python -m generators.lint resume/resume.yml
+"""
+import re
+
+# Commands a YAML field may use in text, and the ones only valid inside $...$
+TEXT_COMMANDS = {
+    "textbf", "textit", "emph", "underline", "texttt", "textsc", "textsuperscript",
+    "textsubscript", "bfseries", "itshape", "href", "url", "textasciitilde",
+    "textasciicircum", "textless", "textgreater", "textbar", "textbackslash",
+    "textunderscore", "textbullet", "textendash", "textemdash", "ldots", "LaTeX",
+    "TeX", "newline", "hfill", "quad", "small", "footnotesize",
+}
+MATH_COMMANDS = {
+    "sim", "times", "approx", "le", "leq", "ge", "geq", "pm", "cdot", "to",
+    "rightarrow", "leftarrow", "uparrow", "downarrow", "infty", "mu", "alpha",
+    "beta", "lambda", "sigma", "Delta", "mathrm", "mathbf", "sqrt", "frac", "log",
+}
+# Characters with a meaning of their own in text mode, and what to write instead
+TEXT_SPECIALS = {
+    "&": r"\&",
+    "#": r"\#",
+    "%": r"\%",
+    "^": r"\textasciicircum{} or $^{...}$",
+    "_": r"\_",
+}
+FIELD_TOKEN_RE = re.compile(r"\\([A-Za-z]+|.)|([{}$&#%^_])", re.S)
+# A field matching this has nothing for lint_field to look at but its characters
+PLAIN_FIELD_RE = re.compile(r"[^\\{}$&#%^_]*")
+# Beyond Latin-1 and Latin Extended-A, only punctuation LaTeX maps from UTF-8
+UNSUPPORTED_RE = re.compile("[^\t\n\r\x20-\x7e\xa0-\u017f\u2018\u2019\u201a\u201c\u201d\u201e"
+                            "\u2013\u2014\u2026\u2022\u2020\u2021\u2030\u20ac\u2122\u2192\u2190]")
+# Control words other than \begin/\end are never matched: only their
+# arguments' braces matter, and skipping them keeps the scan cheap. The
+# lookahead lets the regex engine jump straight to candidate characters.
+DOC_TOKEN_RE = re.compile(r"(?=[\\{}$\n])(?:\\(begin|end)\{([^{}]*)\}|\\([^A-Za-z@])|([{}$])|(\n[ \t]*\n))")
+BEGIN_DOCUMENT = "\\begin{document}"
+# Preambles already scanned clean. A template's preamble is the same on
+# every render, so only the body is scanned again; at most this many kept
+PREAMBLE_MEMO = 16
+_clean_preambles = set()
+
+
+class LintError(Exception):
+    """Raised when the LaTeX for a document would not compile.
+
+    ``problems`` is a list of (yaml path or ``line N``, message).
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} LaTeX problem(s) found before compiling:\n" + format_problems(problems))
+
+
+def format_problems(problems):
+    return "\n".join(f"  {where}: {message}" for where, message in problems)
+
+
+def lint_field(text):
+    """Messages for one field as it appears in the LaTeX source."""
+    if PLAIN_FIELD_RE.fullmatch(text) and not UNSUPPORTED_RE.search(text):
+        return []
+    problems = []
+    depth = 0
+    math = False
+    for m in FIELD_TOKEN_RE.finditer(text):
+        command, char = m.group(1), m.group(2)
+        if command is not None:
+            if not command.isalpha():
+                continue  # \& \% \{ \\ \, and other control symbols
+            if command in MATH_COMMANDS:
+                if not math:
+                    problems.append(f"\\{command} is only valid in math mode (wrap it in $...$)")
+            elif command not in TEXT_COMMANDS:
+                problems.append(f"unknown command \\{command}")
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            if depth == 0:
+                problems.append("'}' closes a brace that was never opened")
+            else:
+                depth -= 1
+        elif char == "$":
+            math = not math
+        elif not math or char in "&#%":
+            problems.append(f"unescaped '{char}'; write {TEXT_SPECIALS[char]}")
+    if depth:
+        problems.append(f"{depth} '{{' never closed")
+    if math:
+        problems.append(r"unbalanced '$' (write \$ for a dollar sign)")
+    for char in sorted(set(UNSUPPORTED_RE.findall(text))):
+        problems.append(f"character '{char}' (U+{ord(char):04X}) has no pdflatex glyph")
+    return problems
+
+
+def lint_document(source):
+    """[(line, message)] for structural problems in an assembled document."""
+    source = _strip_comments(source)
+    problems = []  # (offset, message), turned into line numbers at the end
+    braces = []  # offset of each open brace
+    environments = []  # (name, offset)
+    math = None  # offset where inline math opened
+    in_body = False
+    skip_until = None  # comment environment being skipped
+    body = source.find(BEGIN_DOCUMENT)
+    preamble = source[:body] if body > 0 else None
+    start = body if preamble in _clean_preambles else 0
+    for m in DOC_TOKEN_RE.finditer(source, start):
+        kind, name, symbol, char, blank = m.groups()
+        at = m.start()
+        if skip_until:
+            if kind == "end" and name == skip_until:
+                skip_until = None
+        elif kind:
+            if name == "document":
+                if at == body and not start and not (problems or braces or math is not None):
+                    if len(_clean_preambles) >= PREAMBLE_MEMO:
+                        _clean_preambles.clear()
+                    _clean_preambles.add(preamble)
+                in_body = kind == "begin"
+            elif not in_body:
+                continue  # \begin inside \newcommand definitions in the preamble
+            elif kind == "begin":
+                if name == "comment":
+                    skip_until = name
+                else:
+                    environments.append((name, at))
+            elif not environments:
+                problems.append((at, f"\\end{{{name}}} without a \\begin"))
+            else:
+                opened, opened_at = environments.pop()
+                if opened != name:
+                    problems.append((at, f"\\end{{{name}}} closes \\begin{{{opened}}} "
+                                         f"from line {_line(source, opened_at)}"))
+        elif symbol:
+            if symbol in "[(":
+                if math is not None:
+                    problems.append((at, f"\\{symbol} inside math mode"))
+                math = at
+            elif symbol in "])":
+                if math is None:
+                    problems.append((at, f"\\{symbol} outside math mode"))
+                math = None
+        elif char == "{":
+            braces.append(at)
+        elif char == "}":
+            if braces:
+                braces.pop()
+            else:
+                problems.append((at, "'}' closes a brace that was never opened"))
+        elif char == "$":
+            math = None if math is not None else at
+        elif blank and math is not None:
+            problems.append((math, "math mode runs into a paragraph break (unbalanced '$'?)"))
+            math = None
+    if math is not None:
+        problems.append((math, "math mode never closed"))
+    for opened_at in braces[:3]:
+        problems.append((opened_at, "'{' never closed"))
+    for name, opened_at in environments:
+        problems.append((opened_at, f"\\begin{{{name}}} never ended"))
+    if "\\end{document}" not in source:
+        problems.append((len(source), "no \\end{document}"))
+    return [(_line(source, at), message) for at, message in sorted(problems)]
+
+
+def _strip_comments(source):
+    """``source`` with every unescaped % comment removed (line breaks kept)."""
+    parts = []
+    last = 0
+    for m in re.finditer("%", source):
+        start = m.start()
+        if start < last:
+            continue  # inside a comment already removed
+        slashes = 0
+        while start - slashes > 0 and source[start - slashes - 1] == "\\":
+            slashes += 1
+        if slashes % 2:
+            continue  # \% is a percent sign
+        parts.append(source[last:start])
+        end = source.find("\n", start)
+        last = len(source) if end < 0 else end
+    parts.append(source[last:])
+    return "".join(parts)
+
+
+def _line(source, offset):
+    return source.count("\n", 0, offset) + 1
+
+
+def yaml_fields(node, path="", skip=()):
+    """(path, key, text) for every string under a YAML node, skipping ``skip`` keys."""
+    stack = [(path, None, node)]
+    while stack:
+        path, key, node = stack.pop()
+        if isinstance(node, dict):
+            for child_key, value in reversed(list(node.items())):
+                if child_key not in skip:
+                    stack.append((f"{path}.{child_key}" if path else str(child_key), child_key, value))
+        elif isinstance(node, list):
+            for i in range(len(node) - 1, -1, -1):
+                stack.append((f"{path}[{i}]", key, node[i]))
+        elif node is not None and not isinstance(node, bool):
+            yield path, key, str(node)
+
+
+def lint(source, fields=()):
+    """[(where, message)] for a document and its fields.
+
+    ``fields`` are (yaml path, text as it appears in the LaTeX) pairs. When a
+    field has problems those are reported alone, since they also unbalance
+    the assembled document; otherwise document problems are traced back to
+    the field on the offending line.
+    """
+    problems = [(path, message) for path, text in fields for message in lint_field(text)]
+    if problems:
+        return problems
+    lines = source.splitlines()
+    for line, message in lint_document(source):
+        text = lines[line - 1] if 0 < line <= len(lines) else ""
+        where = next((path for path, field in fields if len(field) > 3 and field in text), f"line {line}")
+        problems.append((where, message))
+    return problems
+
+
+def main():
+    import argparse
+    import yaml
+    from coverletter.generator import CoverLetterGenerator
+    from resume.generator import ResumeGenerator
+    parser = argparse.ArgumentParser(description="Check a resume or cover letter YAML for LaTeX that will not compile")
+    parser.add_argument("yaml", help="Resume or cover letter YAML")
+    parser.add_argument("--template", default="default", help="Layout template (default: default)")
+    parser.add_argument("--company", default="Example Corp", help="Company for cover letter placeholders")
+    args = parser.parse_args()
+
+    with open(args.yaml, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if "letter" in data:
+        generator = CoverLetterGenerator(args.yaml, args.template)
+        source = generator.generate_tex(args.company)
+    else:
+        generator = ResumeGenerator(args.yaml, args.template)
+        source = generator.generate_resume(args.yaml)
+    problems = lint(source, generator.lint_fields())
+    if not problems:
+        print(f"{args.yaml}: no LaTeX problems")
+        return
+    print(f"{args.yaml}: {len(problems)} LaTeX problem(s)")
+    print(format_problems(problems))
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Render several documents in a single pdflatex job and split the result.
+
+Every pdflatex start pays for loading the format, fonts and packages. A
+packet puts the resume and the cover letter behind one shared preamble,
+compiles once, and cuts the merged PDF back into the individual files by
+page range.
+"""
+import os
+
+from generators.base import CompileTimeout, find_pdflatex
+from generators.lint import LintError, lint
+from generators.pdf import PdfReader, pdf_text_string, write_pages
+
+# Each shipped page is logged as "<part> <page>" to <jobname>.pages so the
+# merged PDF can be split without guessing how long each document ran.
+# Uses the shipout hooks of the LaTeX kernel (2020-10 or newer).
+PAGE_LOG_PREAMBLE = r"""
+% Page log for splitting the merged PDF afterwards
+\newwrite\packetpages
+\immediate\openout\packetpages=\jobname.pages
+\newcount\packetpage
+\gdef\packetpart{}
+\AddToHook{shipout/after}{\global\advance\packetpage by 1
+  \immediate\write\packetpages{\packetpart\space\the\packetpage}}
+"""
+
+
+def part_marker(name):
+    """LaTeX that starts a new part on a fresh page."""
+    return "\\clearpage\n\\gdef\\packetpart{" + name + "}"
+
+
+def read_page_ranges(pages_file):
+    """Parse a .pages log into {part: (first_page, last_page)}, in order."""
+    ranges = {}
+    with open(pages_file, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) != 2:
+                continue
+            part, page = fields[0], int(fields[1])
+            first, _ = ranges.get(part, (page, page))
+            ranges[part] = (first, page)
+    return ranges
+
+
+def pdf_info_dict(info):
+    """Convert a generator's pdf_info() into PDF string values."""
+    return {key: pdf_text_string(value) for key, value in info.items() if value}
+
+
+def compile_and_split(generator, tex_file, outputs):
+    """Compile ``tex_file`` twice and split it by the logged page ranges.
+
+    ``generator`` supplies the pdflatex limits (any DocumentGenerator).
+    ``outputs`` maps a part name to ``(pdf_path, info_dict)``. Returns the
+    merged PDF path and {part: pdf_path}.
+    """
+    output_dir = os.path.dirname(tex_file)
+    base_name = os.path.splitext(tex_file)[0]
+    try:
+        pdflatex_cmd = find_pdflatex()
+        for _ in range(2):
+            generator.run_pdflatex(pdflatex_cmd, tex_file, output_dir)
+    finally:
+        for ext in [".aux", ".log", ".out"]:
+            aux_file = base_name + ext
+            if os.path.exists(aux_file):
+                os.remove(aux_file)
+
+    pdf_file = base_name + ".pdf"
+    pages_file = base_name + ".pages"
+    if not os.path.exists(pdf_file):
+        raise Exception("PDF file was not generated")
+    ranges = read_page_ranges(pages_file)
+    os.remove(pages_file)
+
+    reader = PdfReader(pdf_file)
+    written = {}
+    for part, (path, info) in outputs.items():
+        if part not in ranges:
+            raise Exception(f"Part '{part}' produced no pages")
+        first, last = ranges[part]
+        written[part] = write_pages(
+            reader, range(first, last + 1), path, pdf_info_dict(info)
+        )
+    return pdf_file, written
+
+
+class PacketGenerator:
+    """Resume and cover letter typeset together behind one preamble.
+
+    The resume preamble is the base; the letter switches to its own
+    geometry, 12pt type and full-block paragraph settings inside a group.
+    """
+
+    def __init__(self, resume_generator, coverletter_generator):
+        self.resume = resume_generator
+        self.coverletter = coverletter_generator
+
+    def generate_tex(self, company_name):
+        """Build the combined LaTeX source for one application."""
+        self.coverletter.replace_placeholders(company_name)
+        name = self.resume.data.get("personal", {}).get("name", "")
+
+        content = [
+            self.resume.latex_preamble,
+            "% Cover letter packages on top of the resume preamble\n"
+            "\\usepackage{calligra}\n"
+            "\\hypersetup{pdftitle={" + self.resume.escape_latex(name)
+            + " - Application Packet}}",
+            PAGE_LOG_PREAMBLE,
+            "\\begin{document}",
+            part_marker("resume"),
+            self.resume.generate_body(),
+            part_marker("coverletter"),
+            # Match the standalone letter: 0.75in margins, 12pt class sizes
+            "\\newgeometry{margin=0.75in}\n\\pagestyle{empty}\n\\begingroup\n"
+            "\\fontsize{12}{14.5}\\selectfont",
+            self.coverletter.get_letter_layout(),
+            self.coverletter.generate_body(),
+            "\\par\\endgroup",
+            "\\end{document}",
+        ]
+        return "\n\n".join(content)
+
+    def generate_pdf(self, packet_file, resume_file, coverletter_file, company_name):
+        """Compile once; return (packet_pdf, resume_pdf, coverletter_pdf)."""
+        tex_source = self.generate_tex(company_name)
+        fields = ([("resume.yml " + path, text) for path, text in self.resume.lint_fields()]
+                  + [("coverletter.yml " + path, text) for path, text in self.coverletter.lint_fields()])
+        problems = lint(tex_source, fields)
+        if problems:
+            raise LintError(problems)
+        tex_file = os.path.splitext(packet_file)[0] + ".tex"
+        os.makedirs(os.path.dirname(tex_file), exist_ok=True)
+        with open(tex_file, "w", encoding="utf-8") as f:
+            f.write(tex_source)
+
+        try:
+            packet_pdf, parts = compile_and_split(self.resume, tex_file, {
+                "resume": (os.path.splitext(resume_file)[0] + ".pdf", self.resume.pdf_info()),
+                "coverletter": (os.path.splitext(coverletter_file)[0] + ".pdf",
+                                self.coverletter.pdf_info()),
+            })
+        except CompileTimeout:
+            raise
+        except Exception as e:
+            print(f"Failed to generate packet: {str(e)}")
+            raise
+
+        if os.path.exists(tex_file):
+            os.remove(tex_file)
+        return packet_pdf, parts["resume"], parts["coverletter"]
@@ -0,0 +1,598 @@
+"""Minimal PDF reader and writer for post-processing pdflatex output.
+
+Only what the pipeline needs without pulling in a PDF library: parse the
+xref (classic tables, xref streams and object streams), walk the page
+tree, and write a subset of pages back out as a standalone file.
+"""
+import re
+import zlib
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+DELIMITERS = b"()<>[]{}/%"
+NUMBER_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+TOKEN_RE = re.compile(rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+OBJ_HEADER_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+# Attributes a Page inherits from its ancestors in the page tree
+INHERITABLE = ("Resources", "MediaBox", "CropBox", "Rotate")
+# Catalog entries that point into the page tree (or describe all of its
+# pages); write_pages leaves them out and copies the rest (/Lang,
+# /ViewerPreferences, /PageMode, /Metadata, ...)
+CATALOG_PAGE_KEYS = ("Type", "Pages", "Outlines", "Names", "Dests", "OpenAction", "PageLabels",
+                     "StructTreeRoot", "MarkInfo", "AcroForm")
+
+
+class PdfError(Exception):
+    """Raised when a PDF cannot be parsed."""
+
+
+class PdfName(str):
+    """A PDF name object such as /Type (stored without the slash)."""
+
+
+class PdfRef:
+    """An indirect reference ``num gen R``."""
+
+    __slots__ = ("num", "gen")
+
+    def __init__(self, num, gen=0):
+        self.num = num
+        self.gen = gen
+
+    def __eq__(self, other):
+        return isinstance(other, PdfRef) and (self.num, self.gen) == (other.num, other.gen)
+
+    def __hash__(self):
+        return hash((self.num, self.gen))
+
+    def __repr__(self):
+        return f"PdfRef({self.num}, {self.gen})"
+
+
+class PdfStream:
+    """A stream object: its dictionary plus the still-encoded data."""
+
+    def __init__(self, dictionary, raw):
+        self.dict = dictionary
+        self.raw = raw
+
+    def decode(self):
+        """Return the decoded stream data (FlateDecode only)."""
+        filters = self.dict.get("Filter")
+        params = self.dict.get("DecodeParms")
+        if filters is None:
+            return self.raw
+        if not isinstance(filters, list):
+            filters, params = [filters], [params]
+        elif not isinstance(params, list):
+            params = [params] * len(filters)
+        data = self.raw
+        for name, parm in zip(filters, params):
+            if name != "FlateDecode":
+                raise PdfError(f"Unsupported stream filter /{name}")
+            data = zlib.decompress(data)
+            if parm and parm.get("Predictor", 1) >= 10:
+                data = _png_unpredict(data, parm.get("Columns", 1))
+        return data
+
+
+def _png_unpredict(data, columns):
+    """Undo the PNG row predictors used by xref streams."""
+    row_len = columns + 1
+    out = bytearray()
+    prev = bytearray(columns)
+    for i in range(0, len(data), row_len):
+        kind = data[i]
+        row = bytearray(data[i + 1:i + row_len])
+        if kind == 2:  # Up
+            for j in range(len(row)):
+                row[j] = (row[j] + prev[j]) & 0xFF
+        elif kind != 0:
+            raise PdfError(f"Unsupported PNG predictor {kind}")
+        out += row
+        prev = row
+    return bytes(out)
+
+
+class PdfParser:
+    """Tokenizer and object parser over a bytes buffer."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def skip_ws(self, pos):
+        data = self.data
+        n = len(data)
+        while pos < n:
+            c = data[pos]
+            if c in WHITESPACE:
+                pos += 1
+            elif c == 0x25:  # % comment runs to end of line
+                while pos < n and data[pos] not in b"\r\n":
+                    pos += 1
+            else:
+                break
+        return pos
+
+    def parse(self, pos):
+        """Parse one object starting at pos; return (value, new_pos)."""
+        data = self.data
+        pos = self.skip_ws(pos)
+        c = data[pos:pos + 1]
+        if c == b"/":
+            m = TOKEN_RE.match(data, pos + 1)
+            raw = m.group(0) if m else b""
+            name = re.sub(rb"#([0-9A-Fa-f]{2})", lambda h: bytes([int(h.group(1), 16)]), raw)
+            return PdfName(name.decode("latin-1")), pos + 1 + len(raw)
+        if c == b"<":
+            if data[pos + 1:pos + 2] == b"<":
+                return self._parse_dict(pos + 2)
+            end = data.index(b">", pos)
+            hexdigits = re.sub(rb"\s", b"", data[pos + 1:end])
+            if len(hexdigits) % 2:
+                hexdigits += b"0"
+            return bytes.fromhex(hexdigits.decode("ascii")), end + 1
+        if c == b"[":
+            items = []
+            pos += 1
+            while True:
+                pos = self.skip_ws(pos)
+                if data[pos:pos + 1] == b"]":
+                    return items, pos + 1
+                value, pos = self.parse(pos)
+                items.append(value)
+        if c == b"(":
+            return self._parse_string(pos + 1)
+        m = NUMBER_RE.match(data, pos)
+        if m:
+            text = m.group(0)
+            end = m.end()
+            if b"." not in text:
+                # Look ahead for "gen R" to form an indirect reference
+                ref = re.compile(rb"\s+(\d+)\s+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])").match(data, end)
+                if ref:
+                    return PdfRef(int(text), int(ref.group(1))), ref.end()
+                return int(text), end
+            return float(text), end
+        m = TOKEN_RE.match(data, pos)
+        if not m:
+            raise PdfError(f"Unexpected byte {c!r} at offset {pos}")
+        word = m.group(0)
+        if word == b"true":
+            return True, m.end()
+        if word == b"false":
+            return False, m.end()
+        if word == b"null":
+            return None, m.end()
+        raise PdfError(f"Unexpected token {word!r} at offset {pos}")
+
+    def _parse_dict(self, pos):
+        data = self.data
+        result = {}
+        while True:
+            pos = self.skip_ws(pos)
+            if data[pos:pos + 2] == b">>":
+                return result, pos + 2
+            key, pos = self.parse(pos)
+            value, pos = self.parse(pos)
+            result[key] = value
+
+    def _parse_string(self, pos):
+        data = self.data
+        out = bytearray()
+        depth = 1
+        escapes = {ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t",
+                   ord("b"): b"\b", ord("f"): b"\f"}
+        while True:
+            c = data[pos]
+            if c == 0x5C:  # backslash
+                nxt = data[pos + 1]
+                if nxt in escapes:
+                    out += escapes[nxt]
+                    pos += 2
+                elif 0x30 <= nxt <= 0x37:
+                    m = re.compile(rb"[0-7]{1,3}").match(data, pos + 1)
+                    out.append(int(m.group(0), 8) & 0xFF)
+                    pos = m.end()
+                elif nxt in b"\r\n":  # line continuation
+                    pos += 2
+                    if nxt == 0x0D and data[pos:pos + 1] == b"\n":
+                        pos += 1
+                else:
+                    out.append(nxt)
+                    pos += 2
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    return bytes(out), pos + 1
+            out.append(c)
+            pos += 1
+
+
+class PdfReader:
+    """Random-access reader for a single PDF file."""
+
+    def __init__(self, path_or_bytes):
+        if isinstance(path_or_bytes, (bytes, bytearray)):
+            self.data = bytes(path_or_bytes)
+        else:
+            with open(path_or_bytes, "rb") as f:
+                self.data = f.read()
+        self.parser = PdfParser(self.data)
+        # num -> (1, offset) for plain objects, (2, objstm_num, index) for compressed
+        self.xref = {}
+        self.trailer = {}
+        self._cache = {}
+        self._objstm_cache = {}
+        try:
+            self._read_xref()
+        except (PdfError, ValueError, IndexError, KeyError, zlib.error):
+            self._rebuild_xref()
+        self._pages = None
+
+    # -- xref -----------------------------------------------------------
+
+    def _read_xref(self):
+        tail = self.data[-1024:]
+        idx = tail.rfind(b"startxref")
+        if idx < 0:
+            raise PdfError("startxref not found")
+        offset = int(tail[idx + 9:].split()[0])
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            pos = self.parser.skip_ws(offset)
+            if self.data.startswith(b"xref", pos):
+                trailer = self._read_xref_table(pos + 4)
+                if "XRefStm" in trailer:
+                    self._read_xref_stream(trailer["XRefStm"])
+            else:
+                trailer = self._read_xref_stream(pos)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            offset = trailer.get("Prev")
+        if "Root" not in self.trailer:
+            raise PdfError("trailer has no /Root")
+
+    def _read_xref_table(self, pos):
+        data = self.data
+        while True:
+            pos = self.parser.skip_ws(pos)
+            if data.startswith(b"trailer", pos):
+                trailer, _ = self.parser.parse(pos + 7)
+                return trailer
+            m = re.compile(rb"(\d+)\s+(\d+)").match(data, pos)
+            start, count = int(m.group(1)), int(m.group(2))
+            pos = self.parser.skip_ws(m.end())
+            for i in range(count):
+                entry = data[pos:pos + 20].split()
+                if len(entry) >= 3 and entry[2] == b"n":
+                    self.xref.setdefault(start + i, (1, int(entry[0])))
+                pos += 20
+
+    def _read_xref_stream(self, pos):
+        _, stream = self._read_object_at(pos)
+        d = stream.dict
+        widths = d["W"]
+        index = d.get("Index", [0, d["Size"]])
+        rows = stream.decode()
+        row_len = sum(widths)
+        r = 0
+        for start, count in zip(index[0::2], index[1::2]):
+            for num in range(start, start + count):
+                fields = []
+                p = r
+                for w in widths:
+                    fields.append(int.from_bytes(rows[p:p + w], "big") if w else None)
+                    p += w
+                r += row_len
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    self.xref.setdefault(num, (1, fields[1]))
+                elif kind == 2:
+                    self.xref.setdefault(num, (2, fields[1], fields[2]))
+        return d
+
+    def _rebuild_xref(self):
+        """Recover a damaged file by scanning for ``N G obj`` headers."""
+        self.xref = {}
+        for m in OBJ_HEADER_RE.finditer(self.data):
+            self.xref[int(m.group(1))] = (1, m.start())
+        self.trailer = {}
+        idx = self.data.rfind(b"trailer")
+        if idx >= 0:
+            self.trailer, _ = self.parser.parse(idx + 7)
+        if "Root" not in self.trailer:
+            for num in list(self.xref):
+                obj = self.get(num)
+                if isinstance(obj, PdfStream) and obj.dict.get("Type") == "XRef":
+                    self.trailer = obj.dict
+                elif isinstance(obj, PdfStream) and obj.dict.get("Type") == "ObjStm":
+                    self._index_object_stream(num)
+                elif isinstance(obj, dict) and obj.get("Type") == "Catalog":
+                    self.trailer.setdefault("Root", PdfRef(num))
+        if "Root" not in self.trailer:
+            raise PdfError("Could not locate the document catalog")
+
+    def _index_object_stream(self, num):
+        for i, (obj_num, _) in enumerate(self._object_stream(num)[0]):
+            self.xref.setdefault(obj_num, (2, num, i))
+
+    # -- objects --------------------------------------------------------
+
+    def _read_object_at(self, pos):
+        m = OBJ_HEADER_RE.match(self.data, self.parser.skip_ws(pos))
+        if not m:
+            raise PdfError(f"No object header at offset {pos}")
+        value, end = self.parser.parse(m.end())
+        end = self.parser.skip_ws(end)
+        if isinstance(value, dict) and self.data.startswith(b"stream", end):
+            start = end + 6
+            if self.data[start:start + 2] == b"\r\n":
+                start += 2
+            elif self.data[start:start + 1] in (b"\n", b"\r"):
+                start += 1
+            length = value.get("Length")
+            if isinstance(length, PdfRef):
+                length = self.get(length)
+            if not isinstance(length, int) or not self.data.startswith(
+                    b"endstream", self.parser.skip_ws(start + length)):
+                length = self.data.index(b"endstream", start) - start
+                while length and self.data[start + length - 1] in b"\r\n":
+                    length -= 1
+            value = PdfStream(value, self.data[start:start + length])
+        return int(m.group(1)), value
+
+    def _object_stream(self, num):
+        if num not in self._objstm_cache:
+            stream = self.get(num)
+            data = stream.decode()
+            parser = PdfParser(data)
+            header = data[:stream.dict["First"]].split()
+            pairs = [(int(header[i]), int(header[i + 1])) for i in range(0, len(header), 2)]
+            self._objstm_cache[num] = (pairs, parser, stream.dict["First"])
+        return self._objstm_cache[num]
+
+    def packed_objects(self, num):
+        """[(obj_num, offset)] stored in object stream ``num``, and the length
+        of the object data after its header."""
+        pairs, parser, first = self._object_stream(num)
+        return pairs, len(parser.data) - first
+
+    def get(self, ref):
+        """Return the object for a PdfRef or object number (None if missing)."""
+        num = ref.num if isinstance(ref, PdfRef) else ref
+        if num in self._cache:
+            return self._cache[num]
+        entry = self.xref.get(num)
+        if entry is None:
+            return None
+        if entry[0] == 1:
+            _, value = self._read_object_at(entry[1])
+        else:
+            pairs, parser, first = self._object_stream(entry[1])
+            value, _ = parser.parse(first + pairs[entry[2]][1])
+        self._cache[num] = value
+        return value
+
+    def resolve(self, value):
+        """Follow a reference (if any) to its object."""
+        while isinstance(value, PdfRef):
+            value = self.get(value)
+        return value
+
+    def objects(self):
+        """Yield (num, object) for every object in the xref."""
+        for num in sorted(self.xref):
+            yield num, self.get(num)
+
+    # -- pages ----------------------------------------------------------
+
+    @property
+    def catalog(self):
+        return self.resolve(self.trailer["Root"])
+
+    @property
+    def info(self):
+        return self.resolve(self.trailer.get("Info")) or {}
+
+    @property
+    def pages(self):
+        """List of (page_ref, page_dict_with_inherited_attributes)."""
+        if self._pages is None:
+            self._pages = []
+            self._walk(self.catalog["Pages"], {}, set())
+        return self._pages
+
+    def _walk(self, ref, inherited, seen):
+        if isinstance(ref, PdfRef):
+            if ref in seen:
+                return
+            seen.add(ref)
+        node = self.resolve(ref)
+        attrs = dict(inherited)
+        for key in INHERITABLE:
+            if key in node:
+                attrs[key] = node[key]
+        if node.get("Type") == "Pages" or "Kids" in node:
+            for kid in self.resolve(node.get("Kids", [])):
+                self._walk(kid, attrs, seen)
+        else:
+            page = dict(attrs)
+            page.update(node)
+            self._pages.append((ref, page))
+
+    def page_count(self):
+        return len(self.pages)
+
+
+# -- writing ------------------------------------------------------------
+
+def _format_number(value):
+    if isinstance(value, float):
+        text = f"{value:.6f}".rstrip("0").rstrip(".")
+        return text if text not in ("", "-0") else "0"
+    return str(value)
+
+
+def _format_name(name):
+    out = []
+    for ch in name.encode("latin-1"):
+        if ch < 0x21 or ch > 0x7E or ch in b"#()<>[]{}/%":
+            out.append(f"#{ch:02X}")
+        else:
+            out.append(chr(ch))
+    return "/" + "".join(out)
+
+
+def serialize(value):
+    """Serialize a parsed PDF value back to bytes (streams excluded)."""
+    if value is None:
+        return b"null"
+    if value is True:
+        return b"true"
+    if value is False:
+        return b"false"
+    if isinstance(value, PdfName):
+        return _format_name(value).encode("latin-1")
+    if isinstance(value, (int, float)):
+        return _format_number(value).encode("ascii")
+    if isinstance(value, PdfRef):
+        return f"{value.num} {value.gen} R".encode("ascii")
+    if isinstance(value, (bytes, bytearray)):
+        escaped = (bytes(value).replace(b"\\", b"\\\\")
+                   .replace(b"(", b"\\(").replace(b")", b"\\)")
+                   .replace(b"\r", b"\\r"))
+        return b"(" + escaped + b")"
+    if isinstance(value, str):
+        return serialize(value.encode("latin-1", errors="replace"))
+    if isinstance(value, list):
+        return b"[" + b" ".join(serialize(v) for v in value) + b"]"
+    if isinstance(value, dict):
+        parts = [b"<<"]
+        for key, item in value.items():
+            parts.append(serialize(PdfName(key)) + b" " + serialize(item))
+        parts.append(b">>")
+        return b"\n".join(parts)
+    raise PdfError(f"Cannot serialize {type(value).__name__}")
+
+
+class PdfWriter:
+    """Collects objects and writes a classic-xref PDF.
+
+    The output carries no /ID and no dates, so identical inputs produce
+    identical bytes.
+    """
+
+    def __init__(self):
+        self.objects = [None]  # 1-based object numbers
+
+    def reserve(self):
+        self.objects.append(None)
+        return PdfRef(len(self.objects) - 1)
+
+    def set(self, ref, value):
+        self.objects[ref.num] = value
+
+    def add(self, value):
+        ref = self.reserve()
+        self.set(ref, value)
+        return ref
+
+    def write(self, path, root, info=None):
+        out = bytearray(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+        offsets = [0]
+        for num in range(1, len(self.objects)):
+            offsets.append(len(out))
+            value = self.objects[num]
+            out += f"{num} 0 obj\n".encode("ascii")
+            if isinstance(value, PdfStream):
+                d = dict(value.dict)
+                d["Length"] = len(value.raw)
+                out += serialize(d) + b"\nstream\n" + value.raw + b"\nendstream"
+            else:
+                out += serialize(value)
+            out += b"\nendobj\n"
+        xref_at = len(out)
+        out += f"xref\n0 {len(self.objects)}\n0000000000 65535 f \n".encode("ascii")
+        for offset in offsets[1:]:
+            out += f"{offset:010d} 00000 n \n".encode("ascii")
+        trailer = {"Size": len(self.objects), "Root": root}
+        if info is not None:
+            trailer["Info"] = info
+        out += b"trailer\n" + serialize(trailer) + f"\nstartxref\n{xref_at}\n%%EOF\n".encode("ascii")
+        with open(path, "wb") as f:
+            f.write(out)
+        return path
+
+
+def write_pages(reader, page_numbers, output_path, info=None):
+    """Write the given 1-based pages of ``reader`` to a new PDF.
+
+    Everything reachable from those pages (fonts, content, annotations) is
+    copied. References to pages that are not included become null, so
+    internal links into the dropped pages simply stop working. Catalog
+    entries such as /Lang, /ViewerPreferences and /Metadata are kept;
+    outlines, name trees and other page-indexed entries are not.
+    ``info`` replaces the document information dictionary when given.
+    """
+    writer = PdfWriter()
+    catalog_ref = writer.reserve()
+    pages_ref = writer.reserve()
+    pages = reader.pages
+    selected = [pages[n - 1] for n in page_numbers]
+    page_refs = {ref: writer.reserve() for ref, _ in selected}
+    copied = {}
+
+    def copy(value):
+        if isinstance(value, PdfRef):
+            if value in page_refs:
+                return page_refs[value]
+            if value in copied:
+                return copied[value]
+            target = reader.get(value)
+            kind = target.get("Type") if isinstance(target, dict) else None
+            if kind == "Page":
+                return None
+            if kind == "Pages":
+                return pages_ref
+            new_ref = writer.reserve()
+            copied[value] = new_ref
+            writer.set(new_ref, copy(target))
+            return new_ref
+        if isinstance(value, PdfStream):
+            return PdfStream(copy(value.dict), value.raw)
+        if isinstance(value, list):
+            return [copy(v) for v in value]
+        if isinstance(value, dict):
+            return {k: copy(v) for k, v in value.items()}
+        return value
+
+    for ref, page in selected:
+        new_page = {k: copy(v) for k, v in page.items() if k != "Parent"}
+        new_page["Parent"] = pages_ref
+        writer.set(page_refs[ref], new_page)
+
+    writer.set(pages_ref, {
+        "Type": PdfName("Pages"),
+        "Kids": [page_refs[ref] for ref, _ in selected],
+        "Count": len(selected),
+    })
+    catalog = {k: copy(v) for k, v in reader.catalog.items() if k not in CATALOG_PAGE_KEYS}
+    writer.set(catalog_ref, {"Type": PdfName("Catalog"), "Pages": pages_ref, **catalog})
+
+    if info is None:
+        info = {k: v for k, v in reader.info.items()
+                if k in ("Title", "Author", "Subject", "Keywords", "Creator", "Producer")}
+    info_ref = writer.add(copy(info)) if info else None
+    return writer.write(output_path, catalog_ref, info_ref)
+
+
+def pdf_text_string(text):
+    """Encode text for a PDF info dictionary entry."""
+    try:
+        return text.encode("latin-1")
+    except UnicodeEncodeError:
+        return b"\xfe\xff" + text.encode("utf-16-be")
@@ -0,0 +1,204 @@
+"""Where the bytes of a rendered PDF go, checked against a size budget.
+
+Some ATS upload forms cap the file size, and every PDF ``main.py``
+produces is archived, so each render reports its size split into fonts,
+page content, images, metadata and the rest (page tree, links, xref).
+Objects stored inside object streams are charged their share of the
+compressed stream. The report also says how many bytes Flate compression
+saved (decoded minus stored stream length) and names any embedded font
+that is not subset (its /BaseFont lacks the ``ABCDEF+`` tag).
+
+The templates ask pdfTeX for the smallest output in their preamble
+(``\\pdfcompresslevel=9`` and ``\\pdfobjcompresslevel=2``), so nothing
+here needs a second compile: the report reads the PDF that was written.
+
+    python -m generators.pdfsize applications/Globex/Jane_Doe_Resume_Engineer.pdf --budget 300
+"""
+import re
+import zlib
+
+from generators.pdf import PdfError, PdfReader, PdfRef, PdfStream
+
+# Default size budget in KB; ATS forms usually cap uploads at 2 to 5 MB,
+# a one-page resume with subset fonts is well under a tenth of that
+SIZE_BUDGET_KB = 300
+CATEGORIES = ("fonts", "content", "images", "metadata", "other")
+SUBSET_RE = re.compile(r"^[A-Z]{6}\+")
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+
+
+def _kb(size):
+    return f"{size / 1024:.1f} KB"
+
+
+class SizeReport:
+    """Byte breakdown of one PDF."""
+
+    def __init__(self, path, total, sizes, saved, full_fonts):
+        self.path = path
+        self.total = total
+        self.sizes = sizes  # {category: bytes}
+        self.saved = saved  # bytes saved by Flate across all streams
+        self.full_fonts = full_fonts  # embedded fonts that are not subset
+
+    @classmethod
+    def read(cls, path):
+        reader = PdfReader(path)
+        spans = _object_sizes(reader)
+        owner = {}
+
+        def claim(value, category):
+            # Everything reachable from value, stopping at pages and the catalog
+            pending = [value]
+            while pending:
+                value = pending.pop()
+                if isinstance(value, PdfRef):
+                    if value.num in owner:
+                        continue
+                    target = reader.get(value)
+                    if isinstance(target, dict) and target.get("Type") in ("Page", "Pages", "Catalog"):
+                        continue
+                    owner[value.num] = category
+                    pending.append(target)
+                elif isinstance(value, PdfStream):
+                    pending.append(value.dict)
+                elif isinstance(value, dict):
+                    pending.extend(value.values())
+                elif isinstance(value, list):
+                    pending.extend(value)
+
+        def claim_resources(resources):
+            resources = reader.resolve(resources) or {}
+            for font in (reader.resolve(resources.get("Font")) or {}).values():
+                claim(font, "fonts")
+            for ref in (reader.resolve(resources.get("XObject")) or {}).values():
+                xobject = reader.resolve(ref)
+                if isinstance(xobject, PdfStream) and xobject.dict.get("Subtype") == "Form":
+                    claim_resources(xobject.dict.get("Resources"))
+                    claim(ref, "content")
+                else:
+                    claim(ref, "images")
+
+        for _, page in reader.pages:
+            claim_resources(page.get("Resources"))
+            claim(page.get("Contents"), "content")
+        claim(reader.trailer.get("Info"), "metadata")
+        claim(reader.catalog.get("Metadata"), "metadata")
+
+        sizes = dict.fromkeys(CATEGORIES, 0)
+        for num, size in spans.items():
+            if owner.get(num, "other") != "other":
+                sizes[owner[num]] += size
+        sizes["other"] = len(reader.data) - sum(sizes.values())
+        return cls(path, len(reader.data), sizes, _flate_savings(reader), _full_fonts(reader))
+
+    def over_budget(self, budget_kb=SIZE_BUDGET_KB):
+        return bool(budget_kb) and self.total > budget_kb * 1024
+
+    def problems(self, budget_kb=SIZE_BUDGET_KB):
+        """Failed size checks as messages; empty when the PDF passes."""
+        found = []
+        if self.over_budget(budget_kb):
+            largest = max(CATEGORIES, key=lambda category: self.sizes[category])
+            found.append(f"{_kb(self.total)} is over the {budget_kb:g} KB budget "
+                         f"(largest part: {largest}, {_kb(self.sizes[largest])})")
+        if self.full_fonts:
+            found.append(f"font(s) embedded in full, not subset: {', '.join(self.full_fonts)}")
+        return found
+
+    def describe(self):
+        parts = ", ".join(f"{category} {_kb(self.sizes[category])}"
+                          for category in CATEGORIES if self.sizes[category])
+        return f"{_kb(self.total)} ({parts}); compression saved {_kb(self.saved)}"
+
+
+def _object_sizes(reader):
+    """{object number: bytes it occupies in the file}.
+
+    A plain object runs from its header to the next object (or the xref);
+    an object inside an object stream gets the stream's stored bytes in
+    proportion to its share of the decoded data.
+    """
+    data = reader.data
+    bounds = sorted({entry[1] for entry in reader.xref.values() if entry[0] == 1}
+                    | {int(m.group(1)) for m in STARTXREF_RE.finditer(data)} | {len(data)})
+    index = {offset: i for i, offset in enumerate(bounds)}
+    sizes = {}
+    packed = {}
+    for num, entry in reader.xref.items():
+        if entry[0] == 1:
+            sizes[num] = bounds[index[entry[1]] + 1] - entry[1] if entry[1] in index else 0
+        else:
+            packed.setdefault(entry[1], []).append((num, entry[2]))
+    for stream_num, members in packed.items():
+        try:
+            pairs, body = reader.packed_objects(stream_num)
+        except (PdfError, KeyError, TypeError, zlib.error):
+            continue
+        stored = sizes.pop(stream_num, 0)
+        if body <= 0:
+            continue
+        offsets = [offset for _, offset in pairs] + [body]
+        for num, i in members:
+            if i < len(pairs):
+                sizes[num] = stored * (offsets[i + 1] - offsets[i]) // body
+    return sizes
+
+
+def _flate_savings(reader):
+    saved = 0
+    for num, entry in reader.xref.items():
+        if entry[0] != 1:
+            continue
+        try:
+            obj = reader.get(num)
+            if isinstance(obj, PdfStream) and obj.dict.get("Filter") is not None:
+                saved += len(obj.decode()) - len(obj.raw)
+        except (PdfError, zlib.error):
+            continue
+    return saved
+
+
+def _full_fonts(reader):
+    """BaseFont names of embedded fonts without a subset tag."""
+    names = []
+    for _, page in reader.pages:
+        resources = reader.resolve(page.get("Resources")) or {}
+        for font in (reader.resolve(resources.get("Font")) or {}).values():
+            font = reader.resolve(font) or {}
+            for part in [font] + [reader.resolve(f) for f in reader.resolve(font.get("DescendantFonts")) or []]:
+                descriptor = reader.resolve(part.get("FontDescriptor")) or {}
+                embedded = any(key in descriptor for key in ("FontFile", "FontFile2", "FontFile3"))
+                name = str(part.get("BaseFont", ""))
+                if embedded and not SUBSET_RE.match(name) and name not in names:
+                    names.append(name)
+    return names
+
+
+def size_report(path, budget_kb=SIZE_BUDGET_KB):
+    """(report, problems) for the PDF at ``path``."""
+    report = SizeReport.read(path)
+    return report, report.problems(budget_kb)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Break down a PDF's size and check it against a budget")
+    parser.add_argument("pdf", nargs="+", help="PDF(s) to check")
+    parser.add_argument("--budget", type=float, default=SIZE_BUDGET_KB,
+                        help=f"Largest allowed size in KB, 0 to skip (default: {SIZE_BUDGET_KB})")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.pdf:
+        report, problems = size_report(path, args.budget)
+        print(f"{path}: {report.describe()}")
+        for problem in problems:
+            print(f"  FAIL {problem}")
+        failed = failed or bool(problems)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
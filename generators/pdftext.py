@@ -0,0 +1,216 @@
+"""Positioned text lines from a PDF page, for comparing layouts.
+
+Runs the text operators of a page's content stream and records where
+each string is drawn. Glyphs are decoded through the font's /ToUnicode
+map when it has one (pdflatex with ``\\pdfgentounicode=1``) and as
+WinAnsi otherwise; advances come from the font's /Widths. Runs sharing a
+baseline are joined into one line, with a space wherever the gap between
+two runs is wider than a fraction of the font size.
+
+Only what a one-column document needs: no Type3 fonts, no vertical
+writing, no clipping.
+"""
+import re
+import unicodedata
+
+from generators.pdf import NUMBER_RE, TOKEN_RE, PdfParser, PdfStream
+
+# A gap wider than this many ems between runs on one line reads as a space
+SPACE_GAP = 0.15
+# Runs whose baselines differ by less than this (PDF units) share a line
+BASELINE_TOLERANCE = 1.0
+HEX_RE = re.compile(rb"<([0-9A-Fa-f]+)>")
+
+
+def content_ops(data):
+    """Yield (operator, operands) for a decoded content stream."""
+    parser = PdfParser(data)
+    operands = []
+    pos = 0
+    n = len(data)
+    while True:
+        pos = parser.skip_ws(pos)
+        if pos >= n:
+            return
+        c = data[pos:pos + 1]
+        if c in b"/<[(" or NUMBER_RE.match(data, pos):
+            value, pos = parser.parse(pos)
+            operands.append(value)
+            continue
+        m = TOKEN_RE.match(data, pos)
+        if not m:
+            pos += 1  # stray delimiter such as ] or }
+            continue
+        op = m.group(0).decode("latin-1")
+        pos = m.end()
+        if op == "BI":
+            # Inline image: skip its data up to EI
+            end = data.find(b"EI", pos)
+            pos = n if end < 0 else end + 2
+            operands = []
+            continue
+        if op in ("true", "false", "null"):
+            operands.append({"true": True, "false": False, "null": None}[op])
+            continue
+        yield op, operands
+        operands = []
+
+
+def _multiply(m, n):
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + b * c2, a * b2 + b * d2,
+            c * a2 + d * c2, c * b2 + d * d2,
+            e * a2 + f * c2 + e2, e * b2 + f * d2 + f2)
+
+
+def _to_unicode(reader, font):
+    """{code: text} from a /ToUnicode CMap (bfchar and bfrange entries)."""
+    stream = reader.resolve(font.get("ToUnicode"))
+    if not isinstance(stream, PdfStream):
+        return None
+    data = stream.decode()
+    mapping = {}
+
+    def text(hexbytes):
+        return bytes.fromhex(hexbytes.decode("ascii")).decode("utf-16-be", errors="replace")
+
+    for block in re.findall(rb"beginbfchar(.*?)endbfchar", data, re.S):
+        codes = HEX_RE.findall(block)
+        for src, dst in zip(codes[::2], codes[1::2]):
+            mapping[int(src, 16)] = text(dst)
+    for block in re.findall(rb"beginbfrange(.*?)endbfrange", data, re.S):
+        for line in block.splitlines():
+            codes = HEX_RE.findall(line)
+            if len(codes) < 3:
+                continue
+            lo, hi = int(codes[0], 16), int(codes[1], 16)
+            if b"[" in line:
+                for offset, dst in enumerate(codes[2:]):
+                    mapping[lo + offset] = text(dst)
+            else:
+                start = int(codes[2], 16)
+                width = len(codes[2]) // 2
+                for offset in range(hi - lo + 1):
+                    mapping[lo + offset] = (start + offset).to_bytes(width, "big").decode(
+                        "utf-16-be", errors="replace")
+    return mapping
+
+
+class _Font:
+    def __init__(self, reader, font):
+        font = reader.resolve(font) or {}
+        self.first = font.get("FirstChar", 0)
+        self.widths = reader.resolve(font.get("Widths")) or []
+        self.unicode = _to_unicode(reader, font)
+
+    def width(self, code):
+        index = code - self.first
+        if 0 <= index < len(self.widths) and isinstance(self.widths[index], (int, float)):
+            return self.widths[index]
+        return 500
+
+    def text(self, code):
+        if self.unicode is not None and code in self.unicode:
+            return self.unicode[code]
+        return bytes([code]).decode("cp1252", errors="replace")
+
+
+def text_runs(reader, page):
+    """[(x, y, x_end, size, text)] for each string shown on the page."""
+    resources = reader.resolve(page.get("Resources")) or {}
+    font_dicts = reader.resolve(resources.get("Font")) or {}
+    fonts = {}
+    contents = reader.resolve(page.get("Contents"))
+    if not isinstance(contents, list):
+        contents = [contents]
+    data = b"\n".join(reader.resolve(part).decode() for part in contents if part is not None)
+
+    runs = []
+    ctm = (1, 0, 0, 1, 0, 0)
+    stack = []
+    tm = tlm = (1, 0, 0, 1, 0, 0)
+    font, size, leading = None, 0, 0
+    char_space = word_space = 0
+    scale = 1.0
+
+    def show(string):
+        nonlocal tm
+        if font is None:
+            return
+        x0 = _multiply(tm, ctm)
+        chars = []
+        for code in string:
+            chars.append(font.text(code))
+            advance = font.width(code) / 1000 * size + char_space
+            if code == 32:
+                advance += word_space
+            tm = _multiply((1, 0, 0, 1, advance * scale, 0), tm)
+        x1 = _multiply(tm, ctm)
+        text = "".join(chars)
+        if text:
+            runs.append((x0[4], x0[5], x1[4], size * abs(x0[3] or x0[0] or 1), text))
+
+    for op, args in content_ops(data):
+        if op == "q":
+            stack.append(ctm)
+        elif op == "Q":
+            ctm = stack.pop() if stack else (1, 0, 0, 1, 0, 0)
+        elif op == "cm" and len(args) == 6:
+            ctm = _multiply(tuple(args), ctm)
+        elif op == "BT":
+            tm = tlm = (1, 0, 0, 1, 0, 0)
+        elif op == "Tf" and len(args) == 2:
+            name, size = args
+            if name not in fonts:
+                fonts[name] = _Font(reader, font_dicts.get(name))
+            font = fonts[name]
+        elif op == "Tc" and args:
+            char_space = args[0]
+        elif op == "Tw" and args:
+            word_space = args[0]
+        elif op == "Tz" and args:
+            scale = args[0] / 100
+        elif op == "TL" and args:
+            leading = args[0]
+        elif op in ("Td", "TD") and len(args) == 2:
+            if op == "TD":
+                leading = -args[1]
+            tm = tlm = _multiply((1, 0, 0, 1, args[0], args[1]), tlm)
+        elif op == "Tm" and len(args) == 6:
+            tm = tlm = tuple(args)
+        elif op == "T*":
+            tm = tlm = _multiply((1, 0, 0, 1, 0, -leading), tlm)
+        elif op == "Tj" and args:
+            show(args[0])
+        elif op in ("'", '"') and args:
+            if op == '"':
+                word_space, char_space = args[0], args[1]
+            tm = tlm = _multiply((1, 0, 0, 1, 0, -leading), tlm)
+            show(args[-1])
+        elif op == "TJ" and args:
+            for item in args[0]:
+                if isinstance(item, bytes):
+                    show(item)
+                elif isinstance(item, (int, float)):
+                    tm = _multiply((1, 0, 0, 1, -item / 1000 * size * scale, 0), tm)
+    return runs
+
+
+def text_lines(reader, page):
+    """[(y, x, x_end, text)] top to bottom, one entry per baseline."""
+    lines = []
+    for x, y, x_end, size, text in sorted(text_runs(reader, page), key=lambda r: (-r[1], r[0])):
+        if lines and abs(lines[-1][0] - y) < BASELINE_TOLERANCE:
+            line = lines[-1]
+            if x - line[2] > SPACE_GAP * size and not line[3].endswith(" ") and not text.startswith(" "):
+                text = " " + text
+            lines[-1] = [line[0], line[1], max(line[2], x_end), line[3] + text]
+        else:
+            lines.append([y, x, x_end, text])
+    return [(y, x, x_end, normalize(text)) for y, x, x_end, text in lines]
+
+
+def normalize(text):
+    """Compatibility-fold ligatures and collapse whitespace, for comparisons."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
@@ -0,0 +1,158 @@
+"""Plain-text and HTML previews of the resume and cover letter, without LaTeX.
+
+While tailoring, what matters is the wording and the section structure,
+not the typesetting. A preview generator renders the same
+``build_context()`` as the PDF through a ``.txt`` or ``.html`` layout
+template next to the LaTeX one (``resume/templates/default.txt``, ...),
+with ``esc`` turning the YAML's LaTeX markup into the target format:
+``\\textbf{...}`` becomes ``<strong>`` in HTML and plain words in text,
+and escapes such as ``\\&`` and ``\\%`` are undone. A render takes a few
+milliseconds and needs no TeX installation.
+
+The text version is ATS-plain: no wrapping, one bullet per line, ready to
+paste into application forms. The HTML is a single self-contained file.
+
+    python main.py --company "Example Corp" --role "Engineer" --format txt
+"""
+import html
+import os
+import re
+
+from coverletter.generator import CoverLetterGenerator
+from resume.generator import ResumeGenerator
+
+FORMATS = ("txt", "html")
+
+# \textbf{...} and friends, innermost first so nested spans unwrap in order
+SPAN_RE = re.compile(r"\\(textbf|textit|emph|underline|texttt)\{([^{}]*)\}|\{\\bfseries ([^{}]*)\}")
+HREF_RE = re.compile(r"\\href\{([^{}]*)\}\{([^{}]*)\}")
+SYMBOLS = (
+    (r"$|$", "|"),
+    (r"\textbackslash{}", "\\"),
+    (r"\textasciitilde{}", "~"),
+    (r"\textasciicircum{}", "^"),
+    (r"\textunderscore{}", "_"),
+    (r"\textless{}", "<"),
+    (r"\textgreater{}", ">"),
+    (r"\textbar{}", "|"),
+    (r"\ldots{}", "..."),
+    (r"\ldots", "..."),
+    (r"\\", " "),
+    ("~", " "),
+)
+ESCAPE_RE = re.compile(r"\\([&%$#_{}])")
+HTML_TAGS = {"textbf": "strong", "textit": "em", "emph": "em", "underline": "u", "texttt": "code"}
+
+
+def _unescape(text, quote=str):
+    for source, target in SYMBOLS:
+        text = text.replace(source, quote(target))
+    return ESCAPE_RE.sub(lambda m: quote(m.group(1)), text)
+
+
+def latex_to_text(text):
+    """Plain text for a YAML string that may hold LaTeX markup."""
+    if text is None:
+        return ""
+    text = str(text)
+    previous = None
+    while previous != text:
+        previous = text
+        text = SPAN_RE.sub(lambda m: m.group(2) if m.group(2) is not None else m.group(3), text)
+    text = HREF_RE.sub(r"\2", text)
+    return _unescape(text)
+
+
+def latex_to_html(text):
+    """HTML for a YAML string that may hold LaTeX markup (bold -> <strong>)."""
+    if text is None:
+        return ""
+    # Escape HTML first (LaTeX markup holds no < or >); \& is the only
+    # LaTeX escape whose character HTML also escapes
+    text = html.escape(str(text).replace("\\&", "&"), quote=False)
+
+    def span(m):
+        if m.group(3) is not None:
+            return f"<strong>{m.group(3)}</strong>"
+        tag = HTML_TAGS[m.group(1)]
+        return f"<{tag}>{m.group(2)}</{tag}>"
+
+    previous = None
+    while previous != text:
+        previous = text
+        text = SPAN_RE.sub(span, text)
+    text = HREF_RE.sub(lambda m: f'<a href="{html.escape(m.group(1))}">{m.group(2)}</a>', text)
+    return _unescape(text, lambda s: html.escape(s, quote=False))
+
+
+class PreviewMixin:
+    """Render a generator's layout context to text or HTML instead of LaTeX.
+
+    Mixed in ahead of a DocumentGenerator subclass; ``preview_format`` picks
+    the template extension and the markup conversion.
+    """
+
+    preview_format = "txt"
+
+    def set_format(self, preview_format):
+        if preview_format not in FORMATS:
+            raise ValueError(f"Unknown preview format '{preview_format}' (choose from {', '.join(FORMATS)})")
+        self.preview_format = preview_format
+        self.template_extension = "." + preview_format
+
+    def markup(self, text):
+        return latex_to_html(text) if self.preview_format == "html" else latex_to_text(text)
+
+    def build_context(self):
+        context = super().build_context()
+        context["esc"] = context["esc_skill"] = self.markup
+        return context
+
+    def get_latex_preamble(self):
+        return ""
+
+    def render_preview(self):
+        return self.get_template().render_string(self.build_context())
+
+    def write_preview(self, output_file_path):
+        """Write the preview next to ``output_file_path`` with this format's extension."""
+        path = os.path.splitext(output_file_path)[0] + "." + self.preview_format
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render_preview())
+        return path
+
+
+class ResumePreview(PreviewMixin, ResumeGenerator):
+    """Resume YAML rendered through resume/templates/<name>.txt or .html."""
+
+    def __init__(self, yaml_file, preview_format="txt", template="default"):
+        self.set_format(preview_format)
+        super().__init__(yaml_file, template)
+
+    def generate_tex(self):
+        return self.render_preview()
+
+    def generate_preview(self, output_file_path):
+        return self.write_preview(output_file_path)
+
+
+class CoverLetterPreview(PreviewMixin, CoverLetterGenerator):
+    """Cover letter rendered through coverletter/templates/<name>.txt or .html."""
+
+    def __init__(self, yaml_file, preview_format="txt", template="default"):
+        self.set_format(preview_format)
+        super().__init__(yaml_file, template)
+
+    def markup(self, text):
+        # Letter fields are plain text, not LaTeX
+        text = "" if text is None else str(text)
+        return html.escape(text) if self.preview_format == "html" else text
+
+    def generate_tex(self, company_name):
+        self.replace_placeholders(company_name)
+        return self.render_preview()
+
+    def generate_preview(self, output_file_path, company_name):
+        self.replace_placeholders(company_name)
+        return self.write_preview(output_file_path)
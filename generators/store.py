@@ -0,0 +1,234 @@
+"""Content-addressed store for the PDFs and DOCX files under applications/.
+
+The same tailored resume PDF often goes out to many companies. Instead of
+a full copy per company folder, each generated document is kept once
+under ``applications/.store/<sha256[:2]>/<sha256>`` and the company
+folders hold hardlinks to it. The link count doubles as the reference
+count: a blob whose count drops to one is referenced by nobody and ``gc``
+removes it.
+
+Blobs are made read-only because every link shares the same inode; a
+write through one folder would otherwise change the file in all of them.
+Files are therefore only ever replaced by rename (see ``link``), and
+``release`` detaches a path before something rewrites it in place.
+
+Only generated outputs (``STORED_EXTENSIONS``) go into the store. The
+YAML and job description inputs in a company folder stay plain, writable
+copies: an editor that saves in place would otherwise rewrite every
+folder's copy through the shared inode. ``dedupe`` skips them, and turns
+any that an older version linked back into plain copies.
+
+    python -m generators.store dedupe     # move existing copies into the store
+    python -m generators.store gc         # drop blobs nobody links to
+"""
+import hashlib
+import os
+import shutil
+import stat
+
+STORE_DIR = ".store"
+CHUNK_SIZE = 1024 * 1024
+# Generated, never edited by hand: safe to share one inode between folders
+STORED_EXTENSIONS = (".pdf", ".docx")
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_stored_type(path):
+    """True for files the store may hold (generated PDF and DOCX outputs)."""
+    return path.lower().endswith(STORED_EXTENSIONS)
+
+
+def detach(path):
+    """Turn a hardlinked ``path`` into a plain, writable copy of its content."""
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp-{os.getpid()}")
+    release(tmp)
+    shutil.copyfile(path, tmp)
+    os.chmod(tmp, stat.S_IWRITE | stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+    release(path)
+    os.replace(tmp, path)
+    return path
+
+
+def release(path):
+    """Unlink ``path`` if it exists so it can be rewritten safely.
+
+    pdflatex and the PDF splitter open their outputs for writing, which
+    would write straight through a hardlink into the shared blob.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # Windows refuses to delete read-only files
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.unlink(path)
+
+
+class ArtifactStore:
+    """Hardlink store rooted at an ``applications/`` directory."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, STORE_DIR)
+
+    def blob_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest)
+
+    def _add_blob(self, src, digest, move=False):
+        """Put ``src`` in the store under ``digest`` unless already there.
+
+        With ``move`` the blob is a hardlink to ``src`` itself, which skips
+        the copy for files that are about to become store links anyway.
+        """
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp = os.path.join(os.path.dirname(blob), f".tmp-{digest}-{os.getpid()}")
+            release(tmp)
+            try:
+                try:
+                    if not move:
+                        raise OSError
+                    os.link(src, tmp)
+                except OSError:
+                    shutil.copy2(src, tmp)
+                os.chmod(tmp, stat.S_IREAD | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(tmp, blob)
+            except BaseException:
+                release(tmp)
+                raise
+        return blob
+
+    def link(self, blob, dest):
+        """Point ``dest`` at ``blob``, replacing whatever was there atomically.
+
+        Falls back to a plain copy where hardlinks are not available
+        (another filesystem, FAT/exFAT drives).
+        """
+        if os.path.exists(dest) and os.path.samefile(blob, dest):
+            return dest
+        tmp = os.path.join(os.path.dirname(dest), f".{os.path.basename(dest)}.tmp-{os.getpid()}")
+        release(tmp)
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            shutil.copy2(blob, tmp)
+            os.chmod(tmp, stat.S_IWRITE | stat.S_IREAD)
+        try:
+            os.replace(tmp, dest)
+        except PermissionError:
+            release(dest)
+            os.replace(tmp, dest)
+        return dest
+
+    def ingest(self, path):
+        """Move a freshly written output into the store, leaving a link behind."""
+        if not is_stored_type(path):
+            raise ValueError(f"{path}: only {', '.join(STORED_EXTENSIONS)} outputs go into the store")
+        return self.link(self._add_blob(path, file_digest(path), move=True), path)
+
+    def blobs(self):
+        """Yield (path, stat) for every blob in the store."""
+        if not os.path.isdir(self.path):
+            return
+        for prefix in sorted(os.listdir(self.path)):
+            shard = os.path.join(self.path, prefix)
+            if not os.path.isdir(shard):
+                continue
+            for name in sorted(os.listdir(shard)):
+                if name.startswith(".tmp-"):
+                    continue
+                blob = os.path.join(shard, name)
+                yield blob, os.stat(blob)
+
+    def dedupe(self):
+        """Replace every unlinked PDF and DOCX under the root with a store link.
+
+        Inputs (YAML, job descriptions) that are hardlinked are detached
+        into plain copies instead. Returns (files linked, bytes saved,
+        inputs detached).
+        """
+        linked = saved = detached = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d != STORE_DIR]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                info = os.lstat(path)
+                if not stat.S_ISREG(info.st_mode):
+                    continue
+                if not is_stored_type(path):
+                    if info.st_nlink > 1:
+                        detach(path)
+                        detached += 1
+                    continue
+                if info.st_nlink > 1:
+                    continue
+                blob = self.blob_path(file_digest(path))
+                if os.path.exists(blob):
+                    saved += info.st_size
+                self.ingest(path)
+                linked += 1
+        return linked, saved, detached
+
+    def gc(self, dry_run=False):
+        """Remove blobs no company folder links to. Returns (count, bytes)."""
+        removed = freed = 0
+        for blob, info in self.blobs():
+            if info.st_nlink > 1:
+                continue
+            if not dry_run:
+                release(blob)
+            removed += 1
+            freed += info.st_size
+        if not dry_run:
+            for shard in os.listdir(self.path) if os.path.isdir(self.path) else []:
+                shard_path = os.path.join(self.path, shard)
+                if os.path.isdir(shard_path) and not os.listdir(shard_path):
+                    os.rmdir(shard_path)
+        return removed, freed
+
+    def stats(self):
+        """Blob count, stored bytes, and bytes the links would take as copies."""
+        count = stored = logical = 0
+        for _, info in self.blobs():
+            count += 1
+            stored += info.st_size
+            logical += info.st_size * max(info.st_nlink - 1, 0)
+        return {"blobs": count, "stored_bytes": stored, "linked_bytes": logical}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Manage the applications/ artifact store")
+    parser.add_argument("command", choices=["gc", "dedupe", "stats"])
+    parser.add_argument("--root", default="applications", help="applications directory (default: applications)")
+    parser.add_argument("--dry-run", action="store_true", help="gc: only report what would be removed")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root)
+    if args.command == "gc":
+        removed, freed = store.gc(dry_run=args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        print(f"{verb} {removed} unreferenced blobs ({freed / 1024:.1f} KiB)")
+    elif args.command == "dedupe":
+        linked, saved, detached = store.dedupe()
+        print(f"Linked {linked} files into {store.path} ({saved / 1024:.1f} KiB saved)")
+        if detached:
+            print(f"Turned {detached} linked YAML/job description files back into plain copies")
+    else:
+        info = store.stats()
+        print(f"{info['blobs']} blobs, {info['stored_bytes'] / 1024:.1f} KiB stored, "
+              f"{info['linked_bytes'] / 1024:.1f} KiB referenced from company folders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Compiled templates for the document layouts.
+
+Templates live next to each generator (``resume/templates/``,
+``coverletter/templates/``) and are compiled once into Python code objects.
+The compiled form is cached per process and recompiled only when the
+file's mtime changes, so edits show up without a restart.
+
+Syntax, chosen to stay clear of LaTeX braces and backslashes::
+
+    << expr >>              write str(expr)
+    <% for x in items %>    Python control flow: for / if / elif / else,
+    <% end %>               closed with <% end %>
+    <% block name %>        named part that can also be rendered alone,
+    <% end %>               e.g. just the preamble or just the body
+    <%# comment %>          dropped from the output
+
+A line holding nothing but a ``<% %>`` tag is removed entirely, newline
+included, so control flow does not leave blank lines behind.
+"""
+import io
+import os
+import re
+
+TAG_RE = re.compile(r"(<<.*?>>|<%.*?%>)", re.DOTALL)
+STANDALONE_TAG_RE = re.compile(r"^[ \t]*(<%(?:(?!%>).)*%>)[ \t]*(?:\n|\Z)", re.MULTILINE | re.DOTALL)
+BLOCK_KEYWORDS = ("for", "if", "while", "with")
+BRANCH_KEYWORDS = ("elif", "else")
+
+_cache = {}
+
+
+class TemplateError(Exception):
+    """Raised for template syntax errors, with the template name and line."""
+
+
+class Template:
+    """A template compiled into Python code objects.
+
+    ``render(out, context)`` writes the whole document to ``out`` (any object
+    with ``write``); ``render_block(name, out, context)`` writes one block.
+    """
+
+    def __init__(self, source, name="<template>"):
+        self.name = name
+        self.blocks = {}
+        nodes = self._parse(source)
+        self.code = self._compile(nodes, "document")
+        self.block_code = {
+            block: self._compile(children, block)
+            for block, children in self.blocks.items()
+        }
+
+    # -- parsing --------------------------------------------------------
+
+    def _parse(self, source):
+        # Fold a standalone tag's newline into the tag so line numbers hold
+        source = STANDALONE_TAG_RE.sub(
+            lambda m: m.group(1)[:-2] + ("\n" if m.group(0).endswith("\n") else "") + "%>",
+            source,
+        )
+        root = []
+        # Stack of (children list, clause list or None, opening line)
+        stack = [(root, None, 0)]
+        line = 1
+        for token in TAG_RE.split(source):
+            if not token:
+                continue
+            children = stack[-1][0]
+            if token.startswith("<<") and token.endswith(">>"):
+                children.append(("expr", token[2:-2].strip(), line))
+            elif token.startswith("<%") and token.endswith("%>"):
+                stmt = token[2:-2].strip()
+                keyword = stmt.split(None, 1)[0] if stmt else ""
+                if stmt.startswith("#"):
+                    pass
+                elif keyword in BLOCK_KEYWORDS:
+                    clauses = [(stmt, [])]
+                    children.append(("control", clauses, line))
+                    stack.append((clauses[0][1], clauses, line))
+                elif keyword in BRANCH_KEYWORDS:
+                    _, clauses, _ = stack.pop()
+                    if clauses is None:
+                        raise TemplateError(f"{self.name}:{line}: '{keyword}' outside a block")
+                    clauses.append((stmt, []))
+                    stack.append((clauses[-1][1], clauses, line))
+                elif keyword == "block":
+                    block_name = stmt.split(None, 1)[1].strip()
+                    body = []
+                    children.append(("block", body, line))
+                    self.blocks[block_name] = body
+                    stack.append((body, None, line))
+                elif keyword == "end":
+                    if len(stack) == 1:
+                        raise TemplateError(f"{self.name}:{line}: unmatched 'end'")
+                    stack.pop()
+                else:
+                    raise TemplateError(f"{self.name}:{line}: unknown statement '{stmt}'")
+            else:
+                children.append(("text", token, line))
+            line += token.count("\n")
+        if len(stack) > 1:
+            raise TemplateError(f"{self.name}:{stack[-1][2]}: block is never closed with 'end'")
+        return root
+
+    # -- code generation ------------------------------------------------
+
+    def _emit(self, nodes, lines, depth):
+        pad = "    " * depth
+        start = len(lines)
+        for kind, value, line in nodes:
+            if kind == "text":
+                lines.append(f"{pad}_write({value!r})")
+            elif kind == "expr":
+                lines.append(f"{pad}_write(_str({value}))  # line {line}")
+            elif kind == "block":
+                self._emit(value, lines, depth)
+            else:
+                for header, children in value:
+                    lines.append(f"{pad}{header}:  # line {line}")
+                    self._emit(children, lines, depth + 1)
+        if len(lines) == start:
+            lines.append(f"{pad}pass")
+
+    def _compile(self, nodes, label):
+        lines = []
+        self._emit(nodes, lines, 0)
+        try:
+            return compile("\n".join(lines), f"{self.name} ({label})", "exec")
+        except SyntaxError as e:
+            raise TemplateError(f"{self.name}: {e.msg} in: {e.text}") from None
+
+    # -- rendering ------------------------------------------------------
+
+    def _run(self, code, out, context):
+        namespace = dict(context)
+        namespace["_write"] = out.write
+        namespace["_str"] = str
+        exec(code, namespace)
+        return out
+
+    def render(self, out, context):
+        """Write the full template to ``out``."""
+        return self._run(self.code, out, context)
+
+    def render_block(self, name, out, context):
+        """Write a single named block to ``out``."""
+        if name not in self.block_code:
+            raise TemplateError(f"{self.name}: no block named '{name}'")
+        return self._run(self.block_code[name], out, context)
+
+    def render_string(self, context, block=None):
+        """Render into a fresh buffer and return the text."""
+        out = io.StringIO()
+        if block is None:
+            self.render(out, context)
+        else:
+            self.render_block(block, out, context)
+        return out.getvalue()
+
+
+def load_template(path):
+    """Return the compiled template for ``path``, recompiling if it changed."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        template = Template(f.read(), os.path.basename(path))
+    _cache[path] = (mtime, template)
+    return template
+
+
+def find_template(template_dir, name, extension=".tex"):
+    """Resolve a template name (or an explicit file path) to a file path."""
+    if os.sep in name or name.endswith(extension):
+        return os.path.abspath(name)
+    path = os.path.join(template_dir, name + extension)
+    if not os.path.isfile(path):
+        available = sorted(
+            os.path.splitext(f)[0] for f in os.listdir(template_dir) if f.endswith(extension)
+        ) if os.path.isdir(template_dir) else []
+        raise TemplateError(
+            f"Template '{name}' not found in {template_dir} (available: {', '.join(available) or 'none'})"
+        )
+    return path
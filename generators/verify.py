@@ -0,0 +1,173 @@
+"""Check a rendered PDF the way WORKFLOW.md's verification phase does.
+
+Reads the PDF with ``generators/pdf.py`` and the positioned text with
+``generators/pdftext.py``, with no pdftotext or other external tool, and
+reports:
+
+- the page count (the resume must be exactly one page)
+- the gap between the lowest text baseline and the bottom of the page, in
+  points (a large gap means too little content or bad sizing)
+- how many lines the Summary wraps to
+- words from the YAML that do not come back out of the extracted text,
+  which is how glued or split words (a lost space around a bold span, a
+  word broken by a kern) show up to an ATS parser
+
+A one-page resume verifies in a few milliseconds; ``main.py`` runs it on
+every PDF it renders.
+
+    python -m generators.verify applications/Globex/Jane_Doe_Resume_Engineer.pdf --yaml resume/resume.yml
+"""
+import re
+
+from generators.pdf import PdfReader
+from generators.pdftext import text_lines
+from generators.preview import latex_to_text
+
+# Bottom gap (lowest baseline to the page edge) that counts as a hole, in points
+MAX_BOTTOM_GAP = 72
+WORD_RE = re.compile(r"[A-Za-z0-9]+")
+SECTION_TITLES = ("summary", "experience", "projects", "skills", "education", "certifications",
+                  "leadership & awards", "activities & club involvement")
+
+
+def resume_fields(data):
+    """The prose fields of a resume YAML whose words must survive extraction."""
+    fields = [data.get("summary") or ""]
+    for job in data.get("experience") or []:
+        fields += [job.get("title") or "", job.get("company") or ""]
+        fields += [str(bullet) for bullet in job.get("achievements") or []]
+    for project in data.get("projects") or []:
+        fields += [project.get("name") or "", project.get("description") or ""]
+    for group in data.get("skills") or []:
+        if isinstance(group, dict):
+            fields += [group.get("name") or "", str(group.get("items") or "")]
+    return fields
+
+
+def letter_fields(data):
+    """The body paragraphs of a cover letter YAML (unfilled placeholders dropped)."""
+    letter = data.get("letter") or {}
+    return [(letter.get(key) or "").replace("[Company Name]", "") for key in ("opening", "body")]
+
+
+class PdfReport:
+    """What one PDF looks like to the verification checklist."""
+
+    def __init__(self, path, pages, bottom_gaps, lines):
+        self.path = path
+        self.pages = pages
+        self.bottom_gaps = bottom_gaps  # points per page, None for a page without text
+        self.lines = lines  # [[text, ...] per page]
+        self.missing_words = []
+
+    @classmethod
+    def read(cls, path):
+        reader = PdfReader(path)
+        gaps = []
+        lines = []
+        for _, page in reader.pages:
+            page_lines = text_lines(reader, page)
+            box = reader.resolve(page.get("MediaBox")) or [0, 0, 612, 792]
+            gaps.append(round(min(y for y, _, _, _ in page_lines) - box[1], 1) if page_lines else None)
+            lines.append([text for _, _, _, text in page_lines])
+        return cls(path, len(gaps), gaps, lines)
+
+    @property
+    def text(self):
+        return "\n".join("\n".join(page) for page in self.lines)
+
+    def summary_lines(self):
+        """Lines between the Summary heading and the next section (None if absent)."""
+        lines = [line for page in self.lines for line in page]
+        titles = [index for index, line in enumerate(lines) if line.lower() in SECTION_TITLES]
+        for position, index in enumerate(titles):
+            if lines[index].lower() == "summary":
+                end = titles[position + 1] if position + 1 < len(titles) else len(lines)
+                return end - index - 1
+        return None
+
+    def check_words(self, fields):
+        """Record source words that the extracted text does not contain as words."""
+        # Join words hyphenated across a line end back together
+        extracted = re.sub(r"-\n(?=[a-z])", "", self.text)
+        found = set(WORD_RE.findall(extracted.lower()))
+        missing = []
+        for field in fields:
+            for word in WORD_RE.findall(latex_to_text(field)):
+                if word.lower() not in found and word not in missing:
+                    missing.append(word)
+        self.missing_words = missing
+        return missing
+
+    def problems(self, expected_pages=1, max_gap=MAX_BOTTOM_GAP, summary_lines=2):
+        """Failed checks as messages; empty when the PDF passes.
+
+        Pass ``max_gap=None`` for documents that need not fill the page,
+        such as a cover letter.
+        """
+        found = []
+        if expected_pages and self.pages != expected_pages:
+            found.append(f"{self.pages} pages (expected {expected_pages})")
+        if not any(self.lines):
+            found.append("no extractable text")
+            return found
+        last_gap = self.bottom_gaps[-1] if self.bottom_gaps else None
+        if max_gap and last_gap is not None and last_gap > max_gap:
+            found.append(f"{last_gap:.0f}pt empty at the bottom of the last page (over {max_gap}pt)")
+        wrapped = self.summary_lines()
+        if summary_lines and wrapped is not None and wrapped > summary_lines:
+            found.append(f"summary wraps to {wrapped} lines (expected {summary_lines})")
+        if self.missing_words:
+            shown = ", ".join(self.missing_words[:8]) + (" ..." if len(self.missing_words) > 8 else "")
+            found.append(f"{len(self.missing_words)} word(s) not extractable as written: {shown}")
+        return found
+
+    def describe(self):
+        gap = self.bottom_gaps[-1] if self.bottom_gaps else None
+        parts = [f"{self.pages} page{'s' if self.pages != 1 else ''}",
+                 f"bottom gap {gap:.0f}pt" if gap is not None else "no text"]
+        wrapped = self.summary_lines()
+        if wrapped is not None:
+            parts.append(f"summary {wrapped} line{'s' if wrapped != 1 else ''}")
+        return ", ".join(parts)
+
+
+def verify_pdf(path, fields=None, expected_pages=1, max_gap=MAX_BOTTOM_GAP):
+    """(report, problems) for ``path``; ``fields`` are source strings to find."""
+    report = PdfReport.read(path)
+    if fields:
+        report.check_words(fields)
+    return report, report.problems(expected_pages, max_gap)
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Verify a rendered resume or cover letter PDF")
+    parser.add_argument("pdf", help="PDF to check")
+    parser.add_argument("--yaml", help="Resume or cover letter YAML whose words must be extractable")
+    parser.add_argument("--pages", type=int, default=1, help="Expected page count, 0 for any (default: 1)")
+    parser.add_argument("--max-gap", type=float, default=MAX_BOTTOM_GAP,
+                        help=f"Largest allowed bottom gap in points, 0 to skip (default: {MAX_BOTTOM_GAP})")
+    parser.add_argument("--text", action="store_true", help="Print the extracted text")
+    args = parser.parse_args()
+
+    fields = None
+    if args.yaml:
+        from resume.overlay import load_resume
+        data = load_resume(args.yaml)
+        fields = letter_fields(data) if "letter" in data else resume_fields(data)
+    start = time.perf_counter()
+    report, problems = verify_pdf(args.pdf, fields, args.pages, args.max_gap)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.text:
+        print(report.text)
+    print(f"{args.pdf}: {report.describe()} ({elapsed:.0f} ms)")
+    for problem in problems:
+        print(f"  FAIL {problem}")
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Pre-started pdflatex engines that have already read the preamble.
+
+Most of a one-page compile is engine start-up and package loading, and
+the preamble (everything before ``\\begin{document}``) does not change
+between edits. A ``WarmPool`` starts pdflatex on ``\\input{head.tex}``
+followed by ``\\@@input "body.tex"``, where ``body.tex`` is a named pipe:
+the engine loads the format, fonts and packages, then blocks opening the
+pipe. The body is read with the ``\\@@input`` primitive because LaTeX's
+``\\input{}`` first opens and closes the file to test that it exists,
+which would consume the writer's end of the pipe. A render writes ``\\begin{document} ... \\end{document}`` into an
+idle engine's pipe, so it only pays for typesetting. Each engine is used
+once; a replacement is started as soon as one is taken, and loads its
+preamble while the current document typesets.
+
+The .aux/.out of the previous render with the same preamble are handed to
+the next engine, so hyperref bookmarks settle after the first render and
+later ones need a single pass.
+
+Named pipes need a POSIX system; elsewhere ``available`` is False and
+generators fall back to the regular two-pass compile. They also fall back
+to it when a warm engine times out or dies (see
+``DocumentGenerator.render_warm``).
+
+    pool = WarmPool()
+    generator.warm_pool = pool      # any DocumentGenerator
+    generator.generate_pdf(...)     # misses now cost typesetting only
+
+    python -m generators.warm resume/resume.yml --renders 5
+"""
+import atexit
+from collections import OrderedDict
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from generators.base import (
+    COMPILE_CPU_LIMIT,
+    COMPILE_MEMORY_LIMIT,
+    COMPILE_TIMEOUT,
+    REPRODUCIBLE_PRIMITIVES,
+    CompileTimeout,
+    _kill_process_group,
+    find_pdflatex,
+    reproducible_env,
+    _spawn_limited,
+)
+
+BEGIN_DOCUMENT = "\\begin{document}"
+JOBNAME = "doc"
+# Files carried from one render to the next with the same preamble
+CARRIED_EXTENSIONS = (".aux", ".out")
+
+
+def split_preamble(tex_source):
+    """(head, body): body starts at \\begin{document}. Raises ValueError."""
+    head, marker, rest = tex_source.partition(BEGIN_DOCUMENT)
+    if not marker:
+        raise ValueError("no \\begin{document} in the LaTeX source")
+    return head, marker + rest
+
+
+class WarmEngine:
+    """One pdflatex process parked on its body pipe."""
+
+    def __init__(self, pdflatex_cmd, head_file, directory, env=None, primitives="",
+                 cpu_limit=COMPILE_CPU_LIMIT, memory_limit=COMPILE_MEMORY_LIMIT):
+        self.directory = directory
+        self.fifo = os.path.join(directory, "body.tex")
+        os.mkfifo(self.fifo)
+        self.capture = tempfile.TemporaryFile()
+        head, fifo = (path.replace(os.sep, "/") for path in (head_file, self.fifo))
+        self.proc = _spawn_limited(
+            [
+                pdflatex_cmd,
+                "-interaction=nonstopmode",
+                "-output-directory=" + directory,
+                "-jobname=" + JOBNAME,
+                primitives + "\\input{" + head + "}\\csname @@input\\endcsname \"" + fifo + "\" ",
+            ],
+            cpu_limit,
+            memory_limit,
+            stdin=subprocess.DEVNULL,
+            stdout=self.capture,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+
+    def output(self, extension):
+        return os.path.join(self.directory, JOBNAME + extension)
+
+    def _open_pipe(self, deadline):
+        """Open the body pipe for writing once the engine is reading it."""
+        while True:
+            try:
+                return os.open(self.fifo, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                # ENXIO: the engine is still loading the preamble (or died)
+                if self.proc.poll() is not None:
+                    return None
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.005)
+
+    def typeset(self, body, timeout=COMPILE_TIMEOUT):
+        """Send the body and wait for the PDF; returns the engine output."""
+        deadline = time.monotonic() + timeout
+        try:
+            fd = self._open_pipe(deadline)
+        except OSError:
+            log = self.log()
+            self.kill()
+            raise CompileTimeout(self.fifo, timeout, log)
+        if fd is not None:
+            os.set_blocking(fd, True)
+            with os.fdopen(fd, "w", encoding="utf-8") as pipe:
+                pipe.write(body)
+        try:
+            self.proc.wait(timeout=max(deadline - time.monotonic(), 0.1))
+        except subprocess.TimeoutExpired:
+            log = self.log()
+            self.kill()
+            raise CompileTimeout(self.fifo, timeout, log)
+        _kill_process_group(self.proc)
+        if self.proc.returncode != 0:
+            raise subprocess.CalledProcessError(self.proc.returncode, self.proc.args, output=self.log().encode())
+        return self.log()
+
+    def log(self):
+        try:
+            with open(self.output(".log"), "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            self.capture.seek(0)
+            return self.capture.read().decode("utf-8", errors="replace")
+
+    def kill(self):
+        if self.proc.poll() is None:
+            _kill_process_group(self.proc)
+            self.proc.wait()
+        self.capture.close()
+
+
+class WarmPool:
+    """Idle warm engines for the most recently used preambles.
+
+    ``size`` engines are kept ready per preamble, for up to ``preambles``
+    different ones (a resume and a cover letter alternate in the UI). A new
+    preamble, such as another template or a changed \\hypersetup, retires
+    the least recently used one; its first render pays for the start-up.
+    """
+
+    def __init__(self, size=2, preambles=2, pdflatex_cmd=None, cpu_limit=COMPILE_CPU_LIMIT,
+                 memory_limit=COMPILE_MEMORY_LIMIT):
+        self.size = size
+        self.preambles = preambles
+        self.pdflatex_cmd = pdflatex_cmd
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+        self.root = None
+        self.idle = OrderedDict()  # key -> [WarmEngine], least recently used first
+        self._serial = 0
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def available(self):
+        return hasattr(os, "mkfifo")
+
+    def _key_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _spawn(self, key, epoch):
+        """Start one engine for ``key`` (call with the lock held)."""
+        self._serial += 1
+        directory = os.path.join(self._key_dir(key), f"engine-{self._serial}")
+        os.makedirs(directory)
+        env = None
+        primitives = ""
+        if epoch is not None:
+            env = {**os.environ, **reproducible_env(epoch)}
+            primitives = REPRODUCIBLE_PRIMITIVES
+        return WarmEngine(self.pdflatex_cmd, os.path.join(self._key_dir(key), "head.tex"), directory,
+                          env, primitives, self.cpu_limit, self.memory_limit)
+
+    def _retire(self, key):
+        for engine in self.idle.pop(key, []):
+            engine.kill()
+        shutil.rmtree(self._key_dir(key), ignore_errors=True)
+
+    def _use(self, head, epoch):
+        """Key for ``head``, set up and marked most recently used (lock held)."""
+        key = hashlib.sha256(f"{epoch}\0{head}".encode("utf-8")).hexdigest()[:16]
+        if key in self.idle:
+            self.idle.move_to_end(key)
+            return key
+        if self.pdflatex_cmd is None:
+            self.pdflatex_cmd = find_pdflatex()
+        if self.root is None:
+            self.root = tempfile.mkdtemp(prefix="warm-pdflatex-")
+        while len(self.idle) >= self.preambles:
+            self._retire(next(iter(self.idle)))
+        self.idle[key] = []
+        os.makedirs(self._key_dir(key))
+        with open(os.path.join(self._key_dir(key), "head.tex"), "w", encoding="utf-8") as f:
+            f.write(head)
+        return key
+
+    def _fill(self, key, epoch):
+        with self._lock:
+            while key in self.idle and len(self.idle[key]) < self.size:
+                self.idle[key].append(self._spawn(key, epoch))
+
+    def prewarm(self, tex_source, epoch=None):
+        """Start engines for this document's preamble ahead of the first render."""
+        head, _ = split_preamble(tex_source)
+        with self._lock:
+            key = self._use(head, epoch)
+        self._fill(key, epoch)
+
+    def render(self, tex_source, pdf_file, timeout=COMPILE_TIMEOUT, epoch=None, passes=2):
+        """Typeset a full LaTeX document into ``pdf_file`` on a warm engine.
+
+        Takes a second pass (on another warm engine) only when the .aux or
+        .out it produced differ from the ones it was given.
+        """
+        head, body = split_preamble(tex_source)
+        with self._lock:
+            key = self._use(head, epoch)
+            idle = self.idle[key]
+            engine = idle.pop(0) if idle else self._spawn(key, epoch)
+            key_dir = self._key_dir(key)
+        # Replacements load their preamble while this one typesets
+        threading.Thread(target=self._fill, args=(key, epoch), daemon=True).start()
+
+        carried = {}
+        for extension in CARRIED_EXTENSIONS:
+            previous = os.path.join(key_dir, "last" + extension)
+            if os.path.exists(previous):
+                shutil.copyfile(previous, engine.output(extension))
+                with open(previous, "rb") as f:
+                    carried[extension] = f.read()
+        try:
+            engine.typeset(body, timeout)
+        finally:
+            engine.kill()
+
+        settled = True
+        for extension in CARRIED_EXTENSIONS:
+            produced = engine.output(extension)
+            if os.path.exists(produced):
+                with open(produced, "rb") as f:
+                    data = f.read()
+                settled = settled and carried.get(extension) == data
+                with open(os.path.join(key_dir, "last" + extension), "wb") as f:
+                    f.write(data)
+        pdf = engine.output(".pdf")
+        if not os.path.exists(pdf):
+            raise subprocess.CalledProcessError(engine.proc.returncode, engine.proc.args,
+                                                output=b"PDF file was not generated")
+        if not settled and passes > 1:
+            # Cross-references moved since the last render: one more pass
+            shutil.rmtree(engine.directory, ignore_errors=True)
+            return self.render(tex_source, pdf_file, timeout, epoch, passes - 1)
+        os.makedirs(os.path.dirname(os.path.abspath(pdf_file)), exist_ok=True)
+        shutil.move(pdf, pdf_file)
+        shutil.rmtree(engine.directory, ignore_errors=True)
+        return pdf_file
+
+    def close(self):
+        with self._lock:
+            for key in list(self.idle):
+                self._retire(key)
+            if self.root:
+                shutil.rmtree(self.root, ignore_errors=True)
+                self.root = None
+
+
+def main():
+    import argparse
+    from resume.generator import ResumeGenerator
+    parser = argparse.ArgumentParser(description="Time cold and warm resume renders")
+    parser.add_argument("resume", nargs="?", default=os.path.join("resume", "resume.yml"))
+    parser.add_argument("--renders", type=int, default=5, help="Warm renders to time (default: 5)")
+    parser.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "warm-resume.pdf"))
+    args = parser.parse_args()
+
+    generator = ResumeGenerator(args.resume)
+    start = time.perf_counter()
+    generator.generate_pdf(args.out)
+    print(f"cold two-pass compile: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    pool = WarmPool()
+    generator.warm_pool = pool
+    pool.prewarm(generator.generate_tex())
+    time.sleep(1.0)  # let the engines finish loading the preamble
+    for i in range(args.renders):
+        start = time.perf_counter()
+        generator.generate_pdf(args.out)
+        print(f"warm render {i + 1}: {(time.perf_counter() - start) * 1000:.0f} ms")
+        time.sleep(0.2)
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
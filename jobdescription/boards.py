@@ -0,0 +1,287 @@
+"""Sweep ATS job boards and report what changed since the last sweep.
+
+Greenhouse, Lever and Ashby publish every open posting of a company as one
+JSON document. This module reads those documents (over HTTP through
+``JobDescriptionScraptor``, or from saved dumps), normalizes each posting
+to the same fields, and compares it with the board's snapshot from the
+previous sweep. Only new, changed and removed postings are reported, as
+JSON lines.
+
+Re-scanning stays proportional to the diff: an unchanged board answers the
+conditional request with a 304 (or hashes to the same bytes as last time)
+and is not parsed at all, and within a changed board only postings whose
+content hash moved are normalized and have their description extracted.
+
+Boards are named ``ats:token``, e.g. ``greenhouse:globex``:
+
+    python -m jobdescription.boards greenhouse:globex lever:initech -o sweep.jsonl
+    python -m jobdescription.boards --boards boards.txt --api-base http://127.0.0.1:8765
+    python -m jobdescription.boards --from-dir dumps/   # <ats>-<token>.json files
+"""
+from datetime import datetime, timezone
+import hashlib
+import html
+import json
+import os
+import sys
+
+from jobdescription.extract import extract_html
+from jobdescription.scraptor import JobDescriptionScraptor, ScrapeError
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(".cache", "boards")
+
+# Public board endpoints; {token} is the company's board name
+ENDPOINTS = {
+    "greenhouse": "https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true",
+    "lever": "https://api.lever.co/v0/postings/{token}?mode=json",
+    "ashby": "https://api.ashbyhq.com/posting-api/job-board/{token}",
+}
+# Layout expected under --api-base (a local stand-in server or mirror)
+MIRROR_PATH = "/{ats}/{token}.json"
+
+
+def _iso_from_millis(value):
+    if not value:
+        return ""
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _greenhouse(job):
+    return {
+        "id": str(job["id"]),
+        "title": job.get("title", ""),
+        "location": (job.get("location") or {}).get("name", ""),
+        "department": ", ".join(d["name"] for d in job.get("departments") or [] if d.get("name")),
+        "url": job.get("absolute_url", ""),
+        "req_id": job.get("requisition_id") or "",
+        "updated": job.get("updated_at", ""),
+        # The board API returns the description HTML entity-escaped
+        "description_html": html.unescape(job.get("content") or ""),
+    }
+
+
+def _lever(job):
+    categories = job.get("categories") or {}
+    sections = "".join(
+        f"<h3>{section.get('text', '')}</h3><ul>{section.get('content', '')}</ul>"
+        for section in job.get("lists") or []
+    )
+    return {
+        "id": job["id"],
+        "title": job.get("text", ""),
+        "location": categories.get("location", ""),
+        "department": categories.get("team", ""),
+        "url": job.get("hostedUrl", ""),
+        "req_id": "",
+        "updated": _iso_from_millis(job.get("createdAt")),
+        "description_html": (job.get("description") or "") + sections + (job.get("additional") or ""),
+    }
+
+
+def _ashby(job):
+    return {
+        "id": job["id"],
+        "title": job.get("title", ""),
+        "location": job.get("location", ""),
+        "department": job.get("department") or job.get("team") or "",
+        "url": job.get("jobUrl", ""),
+        "req_id": "",
+        "updated": job.get("publishedAt", ""),
+        "description_html": job.get("descriptionHtml") or "",
+    }
+
+
+PARSERS = {"greenhouse": _greenhouse, "lever": _lever, "ashby": _ashby}
+
+
+def board_jobs(ats, document):
+    """The raw posting list out of a board document."""
+    if ats == "lever":
+        return document if isinstance(document, list) else []
+    return document.get("jobs") or []
+
+
+def content_hash(job):
+    """Hash of the raw posting; key order in the JSON does not matter."""
+    canonical = json.dumps(job, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def normalize(ats, token, job, description=True):
+    """One posting in the shared shape, with the description as markdown."""
+    posting = PARSERS[ats](job)
+    body = posting.pop("description_html")
+    posting = {"board": f"{ats}:{token}", "ats": ats, "company": token, **posting}
+    if description:
+        posting["description"] = extract_html(body) if body else ""
+    return posting
+
+
+def parse_board_name(name):
+    """"greenhouse:globex" -> ("greenhouse", "globex")."""
+    ats, _, token = name.partition(":")
+    ats = ats.strip().lower()
+    if ats not in PARSERS or not token.strip():
+        raise ValueError(f"board must look like greenhouse:<token>, lever:<token> or ashby:<token>, got '{name}'")
+    return ats, token.strip()
+
+
+def read_board_list(path):
+    """Board names from a file, one per line; blank lines and # comments skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+class BoardSnapshots:
+    """Per-board JSON files: {"body": sha, "postings": {id: [hash, title]}}."""
+
+    def __init__(self, directory=DEFAULT_SNAPSHOT_DIR):
+        self.directory = directory
+
+    def _path(self, ats, token):
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in token)
+        return os.path.join(self.directory, f"{ats}-{safe}.json")
+
+    def load(self, ats, token):
+        try:
+            with open(self._path(ats, token), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"body": None, "postings": {}}
+
+    def save(self, ats, token, snapshot):
+        path = self._path(ats, token)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+
+def diff_board(ats, token, body, snapshots, description=True):
+    """Yield change events for one board document and update its snapshot.
+
+    Events are postings with an extra ``event`` key: "new", "changed" or
+    "removed" (removed ones carry only board, id and title).
+    """
+    previous = snapshots.load(ats, token)
+    body_hash = hashlib.sha1(body).hexdigest()
+    if body_hash == previous.get("body"):
+        return
+    jobs = board_jobs(ats, json.loads(body))
+    seen = {}
+    old = previous.get("postings", {})
+    for job in jobs:
+        job_id = str(job.get("id", ""))
+        digest = content_hash(job)
+        if job_id in old and old[job_id][0] == digest:
+            seen[job_id] = old[job_id]
+            continue
+        posting = normalize(ats, token, job, description)
+        seen[job_id] = [digest, posting["title"]]
+        yield {"event": "changed" if job_id in old else "new", **posting}
+    for job_id, (_, title) in old.items():
+        if job_id not in seen:
+            yield {"event": "removed", "board": f"{ats}:{token}", "ats": ats, "company": token,
+                   "id": job_id, "title": title}
+    snapshots.save(ats, token, {"body": body_hash, "postings": seen})
+
+
+def board_url(ats, token, api_base=None):
+    if api_base:
+        return api_base.rstrip("/") + MIRROR_PATH.format(ats=ats, token=token)
+    return ENDPOINTS[ats].format(token=token)
+
+
+def sweep(boards, snapshots, scraptor, api_base=None, description=True, errors=None):
+    """Fetch every board concurrently and yield change events, board by board.
+
+    Boards that fail to fetch or parse are skipped (their snapshot is kept)
+    and reported through ``errors`` as (board, message) when given.
+    """
+    parsed = [parse_board_name(name) for name in boards]
+    urls = [board_url(ats, token, api_base) for ats, token in parsed]
+    results = scraptor.fetch_many(urls)
+    for (ats, token), result in zip(parsed, results):
+        if isinstance(result, ScrapeError):
+            if errors is not None:
+                errors.append((f"{ats}:{token}", str(result)))
+            continue
+        try:
+            yield from diff_board(ats, token, result.body, snapshots, description)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            if errors is not None:
+                errors.append((f"{ats}:{token}", f"unreadable board JSON: {e}"))
+
+
+def sweep_dir(directory, snapshots, description=True, errors=None):
+    """Like sweep(), over saved ``<ats>-<token>.json`` dumps in ``directory``."""
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        ats, _, token = stem.partition("-")
+        if ext != ".json" or ats not in PARSERS or not token:
+            continue
+        with open(os.path.join(directory, name), "rb") as f:
+            body = f.read()
+        try:
+            yield from diff_board(ats, token, body, snapshots, description)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            if errors is not None:
+                errors.append((f"{ats}:{token}", f"unreadable board JSON: {e}"))
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Report new, changed and removed postings on ATS boards")
+    parser.add_argument("boards", nargs="*", help="Boards as ats:token (greenhouse:globex, lever:initech)")
+    parser.add_argument("--boards", dest="board_file", help="File listing boards, one per line")
+    parser.add_argument("--from-dir", help="Read saved <ats>-<token>.json dumps instead of fetching")
+    parser.add_argument("--api-base", help=f"Fetch from a mirror laid out as {MIRROR_PATH}")
+    parser.add_argument("--snapshots", default=DEFAULT_SNAPSHOT_DIR,
+                        help=f"Snapshot directory (default: {DEFAULT_SNAPSHOT_DIR})")
+    parser.add_argument("-o", "--output", help="Append JSON lines here (default: stdout)")
+    parser.add_argument("--no-description", action="store_true", help="Skip description markdown")
+    parser.add_argument("--concurrency", type=int, default=8, help="Boards fetched at once (default: 8)")
+    parser.add_argument("--min-interval", type=float, default=1.0,
+                        help="Seconds between requests to one host (default: 1.0)")
+    args = parser.parse_args()
+
+    boards = list(args.boards)
+    if args.board_file:
+        boards += read_board_list(args.board_file)
+    if not boards and not args.from_dir:
+        parser.error("name some boards, or use --boards FILE or --from-dir DIR")
+    try:
+        for name in boards:
+            parse_board_name(name)
+    except ValueError as e:
+        parser.error(str(e))
+
+    snapshots = BoardSnapshots(args.snapshots)
+    errors = []
+    counts = {"new": 0, "changed": 0, "removed": 0}
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        if args.from_dir:
+            events = sweep_dir(args.from_dir, snapshots, not args.no_description, errors)
+        else:
+            scraptor = JobDescriptionScraptor(concurrency=args.concurrency, min_interval=args.min_interval)
+            events = sweep(boards, snapshots, scraptor, args.api_base, not args.no_description, errors)
+        for event in events:
+            counts[event["event"]] += 1
+            out.write(json.dumps(event, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if not args.from_dir:
+            scraptor.close()
+
+    for board, message in errors:
+        print(f"Skipped {board}: {message}", file=sys.stderr)
+    print(f"{counts['new']} new, {counts['changed']} changed, {counts['removed']} removed "
+          f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""Turn job posting HTML into the markdown kept as ``job_description.md``.
+
+``PostingExtractor`` is an ``html.parser`` subclass fed in chunks. Text is
+written to the output as each block closes, so memory stays bounded by the
+longest paragraph rather than the page. Navigation, scripts, forms and
+other boilerplate are dropped; headings become ``#`` lines and list items
+``-`` bullets (nested lists indent).
+
+Site rules plug in for the ATS pages we see most. A rule can restrict
+output to the posting's container elements, skip extra elements (apply
+buttons, EEO footers), or pull the posting out of embedded JSON (Ashby
+renders client side). When a rule's containers never show up, the generic
+extraction is used instead.
+
+    python -m jobdescription.extract saved/*.html --out-dir postings/
+"""
+from html.parser import HTMLParser
+import json
+import os
+import re
+import sys
+import tempfile
+from urllib.parse import urlsplit
+
+# Elements whose content is never part of the posting
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe", "nav", "header",
+    "footer", "aside", "form", "button", "select", "textarea", "head", "canvas",
+}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "table", "tr", "blockquote", "pre",
+    "dl", "dt", "dd", "figure", "figcaption", "address", "body", "center",
+}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+LIST_TAGS = {"ul", "ol"}
+BOLD_TAGS = {"strong", "b"}
+# class/id tokens that mark site chrome rather than content
+BOILERPLATE_RE = re.compile(
+    r"(?:^|[\s_-])(?:nav|navbar|navigation|menu|footer|cookies?|consent|banner|breadcrumbs?"
+    r"|share|social|skip-link|sidebar|modal|popup|newsletter)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+WHITESPACE_RE = re.compile(r"\s+")
+# Flush a block early past this many characters to keep memory bounded
+MAX_PENDING = 64 * 1024
+# Bytes of page start searched for site rule markers
+SNIFF_SIZE = 4096
+
+
+class SiteRule:
+    """Extraction tweaks for one job board.
+
+    ``hosts``: hostnames the rule applies to. ``markers``: byte strings
+    that identify the board's markup when the URL is unknown.
+    ``roots``: (attribute, regex) pairs; only text inside a matching
+    element is kept. ``skip``: (attribute, regex) pairs for extra elements
+    to drop. ``json_script``: regex locating embedded posting JSON.
+    """
+
+    def __init__(self, name, hosts=(), markers=(), roots=(), skip=(), json_script=None):
+        self.name = name
+        self.hosts = tuple(hosts)
+        self.markers = tuple(markers)
+        self.roots = [(attr, re.compile(pattern)) for attr, pattern in roots]
+        self.skip = [(attr, re.compile(pattern)) for attr, pattern in skip]
+        self.json_script = re.compile(json_script, re.DOTALL) if json_script else None
+
+    def matches_host(self, host):
+        return any(host == h or host.endswith("." + h) for h in self.hosts)
+
+    @staticmethod
+    def _hit(selectors, attrs):
+        for attr, pattern in selectors:
+            value = attrs.get(attr)
+            if value and pattern.search(value):
+                return True
+        return False
+
+    def is_root(self, attrs):
+        return self._hit(self.roots, attrs)
+
+    def is_skipped(self, attrs):
+        return self._hit(self.skip, attrs)
+
+
+SITE_RULES = [
+    SiteRule(
+        "greenhouse",
+        hosts=("greenhouse.io",),
+        markers=(b"boards.greenhouse.io", b"job-boards.greenhouse.io", b'id="app_body"'),
+        # Classic boards: #header (title, location) + #content; new boards:
+        # .job__header / .job__description
+        roots=[("id", r"^(header|content)$"), ("class", r"\bjob__(header|title|location|description)\b")],
+        skip=[("id", r"^(application|apply_button|application_form)$"),
+              ("class", r"\b(application|apply|eeoc|demographic)\w*")],
+    ),
+    SiteRule(
+        "lever",
+        hosts=("lever.co",),
+        markers=(b"lever-jobs", b"jobs.lever.co", b"posting-headline"),
+        roots=[("class", r"\bposting-headline\b"), ("class", r"\bsection-wrapper\b")],
+        skip=[("class", r"\b(posting-apply|postings-btn\w*|main-footer|template-btn-submit)\b")],
+    ),
+    SiteRule(
+        "ashby",
+        hosts=("ashbyhq.com",),
+        markers=(b"ashbyhq", b"__appData"),
+        # #root is the React mount point: a loading shell until JS runs
+        skip=[("id", r"^root$")],
+        json_script=r"window\.__appData\s*=\s*(\{.*?\})\s*;?\s*$",
+    ),
+]
+
+
+def rule_for(url=None, head=b""):
+    """Pick the site rule for a URL, or by sniffing the start of the page."""
+    if url:
+        host = (urlsplit(url).hostname or "").lower()
+        for rule in SITE_RULES:
+            if rule.matches_host(host):
+                return rule
+    if isinstance(head, str):
+        head = head.encode("utf-8", "ignore")
+    for rule in SITE_RULES:
+        if any(marker in head for marker in rule.markers):
+            return rule
+    return None
+
+
+def _find_posting(data):
+    """Depth-first search of Ashby app data for the posting dict."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "descriptionHtml" in node:
+                return node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+class PostingExtractor(HTMLParser):
+    """Streaming HTML to markdown. ``feed()`` chunks, then ``close()``."""
+
+    def __init__(self, out, rule=None):
+        super().__init__(convert_charrefs=True)
+        self.out = out
+        self.rule = rule
+        # Without a rule root, everything goes straight to out; with one,
+        # text outside the roots is spooled in case no root ever appears
+        self.spool = tempfile.SpooledTemporaryFile(MAX_PENDING, mode="w+", encoding="utf-8") \
+            if rule and rule.roots else None
+        self.root_seen = False
+        self.stack = []  # (tag, skipping, is_root)
+        self.skip_depth = 0
+        self.root_depth = 0
+        self.lists = []  # ["ul" | "ol", counter]
+        self.pending = []
+        self.pending_size = 0
+        self.prefix = ""
+        self.bold = 0
+        self.bold_start = None  # index in pending of the open "**", if any
+        self.script_json = None
+        self.blank = {"out": True, "spool": True}
+
+    # -- output ---------------------------------------------------------
+
+    def _target(self):
+        if self.spool is None or self.root_depth:
+            return "out", self.out
+        return "spool", self.spool
+
+    def _write_line(self, line):
+        name, stream = self._target()
+        if not line:
+            if not self.blank[name]:
+                stream.write("\n")
+                self.blank[name] = True
+            return
+        stream.write(line + "\n")
+        self.blank[name] = False
+
+    def _flush(self, gap=True):
+        """End the current block: write its collapsed text with its prefix."""
+        # A bold span cut by a line break is closed here and reopened after
+        reopen = self.bold_start is not None
+        self._close_bold()
+        text = WHITESPACE_RE.sub(" ", "".join(self.pending)).strip()
+        self.pending = []
+        self.pending_size = 0
+        if text:
+            self._write_line(self.prefix + text)
+        if gap and not self.lists:
+            self._write_line("")
+        self.prefix = ""
+        if reopen:
+            self._open_bold()
+
+    def _text(self, text):
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size > MAX_PENDING:
+            self._flush(gap=False)
+
+    def _open_bold(self):
+        self.bold_start = len(self.pending)
+        self.pending.append("**")
+        self.pending_size += 2
+
+    def _close_bold(self):
+        """Close the open bold span with its markers hugging the text.
+
+        Whitespace at either end of the span moves outside the markers, so
+        ``<b>Go </b>,`` reads ``**Go** ,`` never ``**Go **,``; a span with
+        no text loses its markers altogether.
+        """
+        start, self.bold_start = self.bold_start, None
+        if start is None:
+            return
+        inner = "".join(self.pending[start + 1:])
+        del self.pending[start:]
+        core = inner.strip()
+        if not core:
+            self.pending.append(inner)
+            self.pending_size -= 2
+            return
+        lead = inner[:len(inner) - len(inner.lstrip())]
+        trail = inner[len(inner.rstrip()):]
+        self.pending += [lead, "**", core, "**", trail]
+        self.pending_size += 2
+
+    # -- parser callbacks -----------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {key: value or "" for key, value in attrs}
+        if tag == "script" and self.rule and self.rule.json_script:
+            self.script_json = []
+        skipping = (
+            tag in SKIP_TAGS
+            or BOILERPLATE_RE.search(attrs.get("class", "") + " " + attrs.get("id", "")) is not None
+            or (self.rule is not None and self.rule.is_skipped(attrs))
+        )
+        is_root = bool(self.rule and self.rule.roots and not self.root_depth and self.rule.is_root(attrs))
+        if tag in VOID_TAGS:
+            if tag == "br" and not self.skip_depth:
+                self._text("\n")
+                self._flush(gap=False)
+            elif tag == "hr" and not self.skip_depth:
+                self._flush()
+            return
+        if is_root:
+            self._flush()
+            self.root_depth = 1
+            self.root_seen = True
+        elif self.root_depth:
+            self.root_depth += 1
+        self.stack.append((tag, skipping, is_root))
+        if skipping:
+            self.skip_depth += 1
+        if self.skip_depth:
+            return
+
+        if tag in HEADING_TAGS:
+            self._flush()
+            self.prefix = "#" * HEADING_TAGS[tag] + " "
+        elif tag in LIST_TAGS:
+            self._flush()
+            self.lists.append([tag, 0])
+        elif tag == "li":
+            self._flush(gap=False)
+            depth = max(len(self.lists) - 1, 0)
+            if self.lists and self.lists[-1][0] == "ol":
+                self.lists[-1][1] += 1
+                marker = f"{self.lists[-1][1]}. "
+            else:
+                marker = "- "
+            self.prefix = "  " * depth + marker
+        elif tag in BLOCK_TAGS:
+            if not self.lists:
+                self._flush()
+        elif tag in BOLD_TAGS:
+            self.bold += 1
+            if self.bold == 1:
+                self._open_bold()
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Pop to the matching open tag; tolerates unclosed inner elements
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > index:
+            open_tag, skipping, is_root = self.stack.pop()
+            self._close(open_tag, skipping, is_root)
+
+    def _close(self, tag, skipping, is_root):
+        if not self.skip_depth:
+            if tag in HEADING_TAGS or tag in BLOCK_TAGS:
+                self._flush(gap=not self.lists or tag in HEADING_TAGS)
+            elif tag == "li":
+                self._flush(gap=False)
+            elif tag in LIST_TAGS:
+                self._flush(gap=False)
+                if self.lists:
+                    self.lists.pop()
+                if not self.lists:
+                    self._write_line("")
+            elif tag in BOLD_TAGS and self.bold:
+                self.bold -= 1
+                if not self.bold:
+                    self._close_bold()
+        if skipping:
+            self.skip_depth -= 1
+        if self.root_depth:
+            if is_root:
+                self._flush()
+                self.root_depth = 0
+            else:
+                self.root_depth -= 1
+        if tag == "script" and self.script_json is not None:
+            self._embedded_json("".join(self.script_json))
+            self.script_json = None
+
+    def handle_data(self, data):
+        if self.script_json is not None:
+            self.script_json.append(data)
+            return
+        if not self.skip_depth:
+            self._text(data)
+
+    def _embedded_json(self, script):
+        """Ashby-style pages: the posting lives in a JSON blob, not the DOM."""
+        match = self.rule.json_script.search(script.strip())
+        if not match:
+            return
+        try:
+            posting = _find_posting(json.loads(match.group(1)))
+        except ValueError:
+            return
+        if not posting:
+            return
+        self._flush()
+        if posting.get("title"):
+            self._write_line("# " + posting["title"])
+            self._write_line("")
+        location = posting.get("locationName") or posting.get("location")
+        if isinstance(location, str) and location:
+            self._write_line(f"**Location:** {location}")
+            self._write_line("")
+        inner = PostingExtractor(self.out)
+        inner.feed(posting["descriptionHtml"])
+        inner.close()
+        self.blank["out"] = inner.blank["out"]
+        # The DOM around the blob is only a loading shell
+        self.skip_depth += 1
+        self.stack.append(("#json", True, False))
+
+    def close(self):
+        super().close()
+        self._flush()
+        if self.spool is not None:
+            if not self.root_seen:
+                self.spool.seek(0)
+                for line in self.spool:
+                    self.out.write(line)
+            self.spool.close()
+
+
+def extract(chunks, out, url=None):
+    """Stream HTML ``chunks`` (str or bytes) into markdown on ``out``."""
+    extractor = None
+    head = []
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+        if extractor is None:
+            # Hold back the first few KB so the rule sniff sees enough markup
+            head.append(chunk)
+            if sum(map(len, head)) < SNIFF_SIZE:
+                continue
+            chunk = "".join(head)
+            extractor = PostingExtractor(out, rule_for(url, chunk[:SNIFF_SIZE]))
+        extractor.feed(chunk)
+    if extractor is None:
+        chunk = "".join(head)
+        extractor = PostingExtractor(out, rule_for(url, chunk))
+        extractor.feed(chunk)
+    extractor.close()
+    return out
+
+
+def extract_html(html, url=None):
+    """Markdown for an HTML string."""
+    from io import StringIO
+    return extract([html], StringIO(), url).getvalue().strip() + "\n"
+
+
+def extract_file(path, out, url=None, chunk_size=64 * 1024):
+    """Markdown for a saved page, read in chunks."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return extract(iter(lambda: f.read(chunk_size), ""), out, url)
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Extract job description markdown from saved HTML pages")
+    parser.add_argument("pages", nargs="+", help="HTML files")
+    parser.add_argument("--out-dir", help="Write <page>.md files here (default: stdout)")
+    parser.add_argument("--url", help="Source URL, used to pick the site rule")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for path in args.pages:
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            name = os.path.splitext(os.path.basename(path))[0] + ".md"
+            with open(os.path.join(args.out_dir, name), "w", encoding="utf-8") as out:
+                extract_file(path, out, args.url)
+        else:
+            extract_file(path, sys.stdout, args.url)
+    if args.out_dir:
+        elapsed = time.perf_counter() - start
+        print(f"{len(args.pages)} pages in {elapsed:.2f}s into {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
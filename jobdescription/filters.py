@@ -0,0 +1,295 @@
+"""WORKFLOW.md's posting filters as a compiled pipeline.
+
+The rule file (``jobdescription/filters.yml``) lists each gate's patterns.
+``FilterPipeline`` compiles every pattern list into one alternation regex
+per gate, reads the dedupe set out of the applications log once, and then
+checks postings gate by gate, stopping at the first failure:
+
+    role_family -> seniority -> freshness -> location -> sponsorship -> dedupe
+
+A posting is a dict with ``title``, ``location``, ``description``,
+``company``, ``req_id`` and ``updated`` (what ``jobdescription.boards``
+emits); ``from_markdown`` builds one from a ``job_description.md``.
+
+    python -m jobdescription.filters sweep.jsonl -o shortlist.jsonl
+    python -m jobdescription.filters applications/*/job_description.md
+"""
+from datetime import date, timedelta
+import json
+import os
+import re
+import sys
+
+import yaml
+
+from tracker.dedupe import compact_req_id
+from tracker.log import COOLDOWN_DAYS, DEFAULT_DB, ApplicationsLog, normalize_company, normalize_date
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filters.yml")
+GATES = ("role_family", "seniority", "freshness", "location", "sponsorship", "dedupe")
+
+# "3+ years of experience", "2-4 years of professional software experience"
+YEARS_RE = re.compile(
+    r"(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*\+?\s*)?years?(?:'s)?\s+"
+    r"(?:of\s+)?(?:[\w-]+\s+){0,3}?experience",
+    re.IGNORECASE,
+)
+# "3 days ago", "30+ days ago", "an hour ago", "Posted 2 weeks ago"
+RELATIVE_RE = re.compile(r"^(?:posted\s+)?(\d+\+?|an?|one)\s+(minute|hour|day|week|month)s?\s+ago$",
+                         re.IGNORECASE)
+RELATIVE_DAYS = {"minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30}
+FIELD_RE = re.compile(r"^\*\*(Company|Location|Req(?:uisition)? ?ID|Posted):\*\*\s*(.+)$",
+                      re.IGNORECASE | re.MULTILINE)
+
+
+def compile_patterns(patterns):
+    """One case-insensitive, word-bounded regex for a list of patterns, or None."""
+    patterns = [p for p in patterns or [] if p]
+    if not patterns:
+        return None
+    return re.compile(r"\b(?:" + "|".join(f"(?:{p})" for p in patterns) + r")\b", re.IGNORECASE)
+
+
+def load_rules(path=DEFAULT_RULES):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def years_floor(text):
+    """Largest years-of-experience floor stated in ``text``, or None."""
+    floors = [int(match.group(1)) for match in YEARS_RE.finditer(text)]
+    return max(floors) if floors else None
+
+
+def posted_date(value, today):
+    """The date a posting went up: ISO, "Oct 5, 2026" or "3 days ago"; None if unreadable."""
+    text = str(value or "").strip()
+    lowered = text.lower()
+    if lowered in ("today", "just posted", "posted today"):
+        return today
+    if lowered in ("yesterday", "posted yesterday"):
+        return today - timedelta(days=1)
+    match = RELATIVE_RE.match(text)
+    if match:
+        count = match.group(1).rstrip("+")
+        count = int(count) if count.isdigit() else 1
+        return today - timedelta(days=count * RELATIVE_DAYS[match.group(2).lower()])
+    for candidate in (text[:10], normalize_date(text)):
+        try:
+            return date.fromisoformat(candidate)
+        except ValueError:
+            continue
+    return None
+
+
+def from_markdown(text, source=""):
+    """A posting dict from job_description.md text (examples/ format)."""
+    title = ""
+    for line in text.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip()
+            break
+    fields = {name.lower().replace(" ", "").replace("requisition", "req"): value.strip()
+              for name, value in FIELD_RE.findall(text)}
+    return {
+        "title": title,
+        "company": fields.get("company", ""),
+        "location": fields.get("location", ""),
+        "req_id": fields.get("reqid", ""),
+        "updated": fields.get("posted", ""),
+        "description": text,
+        "url": source,
+    }
+
+
+class FilterPipeline:
+    """Ordered gates compiled from a rules dict.
+
+    Gates missing from the rules are not run. ``log`` (an ApplicationsLog)
+    feeds the dedupe gate; without one it only catches duplicates within
+    the stream itself.
+    """
+
+    def __init__(self, rules, log=None, today=None):
+        self.today = today or date.today()
+        self.gates = []
+        for name in GATES:
+            if rules.get(name) is not None:
+                self.gates.append((name, getattr(self, f"_{name}_gate")(rules[name] or {}, log)))
+        self.rejected = {name: 0 for name, _ in self.gates}
+        self.kept = 0
+        self.undated = 0  # postings whose date the freshness gate could not read
+
+    # Each builder returns a predicate: posting -> True to keep
+
+    def _role_family_gate(self, rule, log):
+        include = compile_patterns(rule.get("include"))
+        exclude = compile_patterns(rule.get("exclude"))
+
+        def keep(posting):
+            title = posting.get("title") or ""
+            if include and not include.search(title):
+                return False
+            return not (exclude and exclude.search(title))
+        return keep
+
+    def _seniority_gate(self, rule, log):
+        titles = compile_patterns(rule.get("exclude_titles"))
+        max_years = rule.get("max_years")
+
+        def keep(posting):
+            if titles and titles.search(posting.get("title") or ""):
+                return False
+            if max_years is None:
+                return True
+            floor = years_floor(posting.get("description") or "")
+            return floor is None or floor <= max_years
+        return keep
+
+    def _freshness_gate(self, rule, log):
+        max_days = rule.get("max_days")
+        cutoff = self.today - timedelta(days=max_days) if max_days is not None else None
+        undated = rule.get("undated", "keep")
+        if undated not in ("keep", "reject"):
+            raise ValueError(f"freshness.undated must be keep or reject, got {undated!r}")
+
+        def keep(posting):
+            # Postings without a date get the benefit of the doubt; ones whose
+            # date cannot be read are counted and kept or rejected by the rule
+            raw = posting.get("updated") or posting.get("posted")
+            if not raw or cutoff is None:
+                return True
+            posted = posted_date(raw, self.today)
+            if posted is None:
+                self.undated += 1
+                return undated == "keep"
+            return posted >= cutoff
+        return keep
+
+    def _location_gate(self, rule, log):
+        include = compile_patterns(rule.get("include"))
+        relocation = compile_patterns(rule.get("relocation"))
+
+        def keep(posting):
+            if not include or include.search(posting.get("location") or ""):
+                return True
+            return bool(relocation and relocation.search(posting.get("description") or ""))
+        return keep
+
+    def _sponsorship_gate(self, rule, log):
+        patterns = list(rule.get("reject") or [])
+        if rule.get("requires_sponsorship"):
+            patterns += rule.get("reject_if_sponsorship_needed") or []
+        reject = compile_patterns(patterns)
+
+        def keep(posting):
+            return not (reject and reject.search(posting.get("description") or ""))
+        return keep
+
+    def _dedupe_gate(self, rule, log):
+        cooldown = rule.get("cooldown_days", COOLDOWN_DAYS)
+        req_keys, role_keys = set(), set()
+        if log is not None:
+            since = (self.today - timedelta(days=cooldown)).isoformat()
+            for company_key, role, req_id in log.db.execute(
+                "SELECT company_key, role, req_id FROM applications"
+                " WHERE date >= ? AND status != 'skipped'", (since,)
+            ):
+                if req_id:
+                    req_keys.add(compact_req_id(req_id))
+                role_keys.add((company_key, (role or "").strip().lower()))
+
+        def keep(posting):
+            req_key = compact_req_id(posting.get("req_id"))
+            role_key = (normalize_company(posting.get("company") or ""),
+                        (posting.get("title") or "").strip().lower())
+            # A req-id decides on its own; without one fall back to company + title
+            duplicate = req_key in req_keys if req_key else role_key in role_keys
+            if duplicate:
+                return False
+            if req_key:
+                req_keys.add(req_key)
+            role_keys.add(role_key)
+            return True
+        return keep
+
+    def check(self, posting):
+        """Name of the first gate ``posting`` fails, or None if it passes."""
+        for name, keep in self.gates:
+            if not keep(posting):
+                return name
+        return None
+
+    def run(self, postings):
+        """Yield the postings that pass every gate, counting rejections."""
+        for posting in postings:
+            failed = self.check(posting)
+            if failed:
+                self.rejected[failed] += 1
+            else:
+                self.kept += 1
+                yield posting
+
+    def summary(self):
+        total = self.kept + sum(self.rejected.values())
+        lines = [f"{total} postings, {self.kept} kept"]
+        for name, count in self.rejected.items():
+            lines.append(f"  {name:<12} rejected {count}")
+        if self.undated:
+            lines.append(f"  {'freshness':<12} unreadable date {self.undated}")
+        return "\n".join(lines)
+
+
+def read_postings(paths):
+    """Postings from JSONL sweeps ("-" is stdin) and job_description.md files.
+
+    "removed" events from a board sweep are skipped.
+    """
+    for path in paths:
+        if path.endswith(".md"):
+            with open(path, "r", encoding="utf-8") as f:
+                yield from_markdown(f.read(), path)
+            continue
+        stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+        try:
+            for line in stream:
+                if not line.strip():
+                    continue
+                posting = json.loads(line)
+                if posting.get("event") != "removed":
+                    yield posting
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Apply the WORKFLOW.md posting filters in order")
+    parser.add_argument("inputs", nargs="+", help="JSONL sweeps (- for stdin) or job_description.md files")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="Rule file (default: jobdescription/filters.yml)")
+    parser.add_argument("--db", help="Applications log for the dedupe gate (default: the rule file's db)")
+    parser.add_argument("-o", "--output", help="Write kept postings as JSONL here (default: stdout)")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules)
+    db = args.db or (rules.get("dedupe") or {}).get("db") or DEFAULT_DB
+    log = ApplicationsLog(db) if "dedupe" in rules and os.path.exists(db) else None
+    start = time.perf_counter()
+    pipeline = FilterPipeline(rules, log)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for posting in pipeline.run(read_postings(args.inputs)):
+            out.write(json.dumps(posting, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if log:
+            log.close()
+    print(pipeline.summary(), file=sys.stderr)
+    print(f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,332 @@
+"""Fetch job postings over HTTP.
+
+One ``JobDescriptionScraptor`` keeps a pool of keep-alive connections per
+host, spaces requests to the same host by ``min_interval`` seconds, and
+caches responses on disk. A cached page is revalidated with
+If-None-Match / If-Modified-Since, so an unchanged posting costs a 304 and
+no body. Connection errors and 5xx answers are retried with backoff;
+4xx answers are final. Bulk URL lists run concurrently under an asyncio semaphore, with
+the blocking fetches on a small thread pool.
+
+Pages come back as markdown via ``jobdescription.extract``. Standard
+library only; plain ``http://`` works, so a local
+``http.server`` serving fixture pages is enough to exercise it offline.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+import zlib
+
+from jobdescription.extract import extract_html
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "jobdescription")
+USER_AGENT = "ResumeCoverLetterGenerator/1.0 (+job description fetcher)"
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+# Connection errors and 5xx answers are retried this many times, waiting
+# RETRY_BACKOFF seconds and then twice as long each time; 4xx never is
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+CHARSET_RE = re.compile(r"charset=([\w-]+)", re.IGNORECASE)
+
+
+class ScrapeError(Exception):
+    """Raised when a posting cannot be fetched."""
+
+    def __init__(self, url, message):
+        self.url = url
+        super().__init__(f"{url}: {message}")
+
+
+class FetchResult:
+    """A fetched page: final URL, status, headers and body bytes."""
+
+    def __init__(self, url, status, headers, body, from_cache=False):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        """Body decoded with the charset from Content-Type (UTF-8 otherwise)."""
+        match = CHARSET_RE.search(self.headers.get("content-type", ""))
+        encoding = match.group(1) if match else "utf-8"
+        try:
+            return self.body.decode(encoding, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, keyed by (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host=4, timeout=20):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme, host, port):
+        """Return (connection, reused)."""
+        with self._lock:
+            idle = self._idle.get((scheme, host, port))
+            if idle:
+                return idle.pop(), True
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout), False
+
+    def release(self, scheme, host, port, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host, port), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+            self._idle.clear()
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least ``interval`` seconds apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ResponseCache:
+    """On-disk cache: ``<sha256(url)>.json`` metadata next to ``.body`` bytes."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def load(self, url):
+        """Return (metadata, body) or (None, None)."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def store(self, url, meta, body=None):
+        """Save metadata, and the body when given (a 304 only refreshes meta)."""
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        if body is not None:
+            with open(body_path + ".tmp", "wb") as f:
+                f.write(body)
+            os.replace(body_path + ".tmp", body_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+
+def _decode_body(body, encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
 class JobDescriptionScraptor:
-    def __init__(self):
-        pass
+    """Pooled, cached, rate-limited fetcher for job posting pages.
+
+    ``max_age`` seconds: a cached page younger than this is served without
+    touching the network; older ones are revalidated. ``cache_dir=None``
+    disables the disk cache.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, concurrency=8, min_interval=1.0,
+                 max_age=0, timeout=20, user_agent=USER_AGENT, retries=RETRIES,
+                 retry_backoff=RETRY_BACKOFF):
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.concurrency = concurrency
+        self.max_age = max_age
+        self.user_agent = user_agent
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.pool = ConnectionPool(max_idle_per_host=concurrency, timeout=timeout)
+        self.limiter = HostRateLimiter(min_interval)
+        self._executor = None
+
+    def close(self):
+        self.pool.close()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- single requests ------------------------------------------------
+
+    def _request(self, url, headers):
+        """One GET over a pooled connection: (status, headers, body)."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ScrapeError(url, "only http(s) URLs can be fetched")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        request_headers = {
+            "Host": parts.netloc,
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            **headers,
+        }
+
+        failures = 0
+        stale_retried = False
+        while True:
+            self.limiter.wait(parts.hostname)
+            connection, reused = self.pool.acquire(parts.scheme, parts.hostname, port)
+            try:
+                connection.request("GET", path, headers=request_headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                # A keep-alive connection the server already dropped: retry at once, fresh
+                if reused and not stale_retried:
+                    stale_retried = True
+                    continue
+                if failures >= self.retries:
+                    raise ScrapeError(url, str(e)) from None
+                self._back_off(failures)
+                failures += 1
+                continue
+            response_headers = {key.lower(): value for key, value in response.getheaders()}
+            if response.will_close:
+                connection.close()
+            else:
+                self.pool.release(parts.scheme, parts.hostname, port, connection)
+            if response.status >= 500 and failures < self.retries:
+                self._back_off(failures)
+                failures += 1
+                continue
+            return response.status, response_headers, _decode_body(
+                body, response_headers.get("content-encoding"))
+
+    def _back_off(self, failures):
+        if self.retry_backoff > 0:
+            time.sleep(self.retry_backoff * 2 ** failures)
+
+    def fetch(self, url):
+        """GET ``url`` through the cache, following redirects."""
+        meta, cached_body = self.cache.load(url) if self.cache else (None, None)
+        if meta and self.max_age and time.time() - meta["fetched_at"] < self.max_age:
+            return FetchResult(meta["final_url"], meta["status"], meta["headers"], cached_body, True)
+
+        conditional = {}
+        if meta:
+            if meta["headers"].get("etag"):
+                conditional["If-None-Match"] = meta["headers"]["etag"]
+            if meta["headers"].get("last-modified"):
+                conditional["If-Modified-Since"] = meta["headers"]["last-modified"]
+
+        current = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = self._request(current, conditional if current == url else {})
+            if status in REDIRECT_CODES and headers.get("location"):
+                current = urljoin(current, headers["location"])
+                continue
+            break
+        else:
+            raise ScrapeError(url, f"more than {MAX_REDIRECTS} redirects")
+
+        if status == 304 and meta:
+            meta["fetched_at"] = time.time()
+            self.cache.store(url, meta)
+            return FetchResult(meta["final_url"], meta["status"], meta["headers"], cached_body, True)
+        if status >= 400:
+            raise ScrapeError(url, f"HTTP {status}")
+
+        if self.cache:
+            kept = {key: headers[key] for key in ("etag", "last-modified", "content-type") if key in headers}
+            self.cache.store(url, {
+                "url": url, "final_url": current, "status": status,
+                "headers": kept, "fetched_at": time.time(),
+            }, body)
+        return FetchResult(current, status, headers, body)
 
     def scrape(self, url: str) -> str:
-        pass
+        """Return a job posting as ``job_description.md`` markdown."""
+        result = self.fetch(url)
+        return extract_html(result.text, result.url)
+
+    # -- bulk -----------------------------------------------------------
+
+    async def fetch_many_async(self, urls, concurrency=None):
+        """Fetch ``urls`` with at most ``concurrency`` in flight.
+
+        Returns a list of FetchResult or ScrapeError, in input order.
+        """
+        limit = asyncio.Semaphore(concurrency or self.concurrency)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=concurrency or self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def one(url):
+            async with limit:
+                try:
+                    return await loop.run_in_executor(self._executor, self.fetch, url)
+                except ScrapeError as e:
+                    return e
+
+        return await asyncio.gather(*(one(url) for url in urls))
+
+    def fetch_many(self, urls, concurrency=None):
+        """Blocking wrapper around fetch_many_async."""
+        return asyncio.run(self.fetch_many_async(urls, concurrency))
+
+    def scrape_many(self, urls, concurrency=None):
+        """{url: posting markdown or ScrapeError} for a list of postings."""
+        results = self.fetch_many(urls, concurrency)
+        return {
+            url: result if isinstance(result, ScrapeError) else extract_html(result.text, result.url)
+            for url, result in zip(urls, results)
+        }
@@ -4,7 +4,37 @@ import sys
 import shutil
 import yaml
 from resume.generator import ResumeGenerator
+from resume.overlay import load_resume
+from resume.traceability import check_resume, format_missing
 from coverletter.generator import CoverLetterGenerator
+from generators.base import CompileTimeout
+from generators.lint import LintError
+from generators.docx import CoverLetterDocxGenerator, ResumeDocxGenerator
+from generators.packet import PacketGenerator
+from generators.pdfsize import SIZE_BUDGET_KB, size_report
+from generators.preview import CoverLetterPreview, ResumePreview
+from generators.store import ArtifactStore, release
+from generators.verify import MAX_BOTTOM_GAP, letter_fields, resume_fields, verify_pdf
+from jobdescription.scraptor import JobDescriptionScraptor, ScrapeError
+from tracker.dedupe import DedupeIndex, format_lookup
+from tracker.log import DEFAULT_DB, ApplicationsLog, normalize_company
+
+OUTPUT_FORMATS = ('pdf', 'docx', 'txt', 'html')
+
+
+def save_job_description(url, output_dir):
+    """Fetch the posting at ``url`` into job_description.md; warn on failure."""
+    try:
+        with JobDescriptionScraptor() as scraptor:
+            markdown = scraptor.scrape(url)
+    except ScrapeError as e:
+        print(f"Warning: could not fetch the job description ({e}); only the URL was saved")
+        return
+    path = os.path.join(output_dir, 'job_description.md')
+    release(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Source: {url}\n\n{markdown}")
+    print(f"Job description saved: {path}")
 
 
 def create_output_structure(base_dir, company_name):
@@ -18,8 +48,7 @@ def create_output_structure(base_dir, company_name):
 def read_candidate_name(yaml_path, default="Candidate"):
     """Read the candidate name from a resume/profile YAML for filenames."""
     try:
-        with open(yaml_path) as f:
-            data = yaml.safe_load(f) or {}
+        data = load_resume(yaml_path)
         block = data.get('personal') or data.get('personal_information') or {}
         return block.get('name', default) or default
     except Exception:
@@ -33,6 +62,211 @@ def generate_filename(role_name, file_type, candidate_name="Candidate"):
     return f"{name}_{file_type.capitalize()}_{position_title}"
 
 
+def open_store(base_dir, args):
+    """The applications/.store artifact store, or None with --no-store."""
+    if args.no_store:
+        return None
+    return ArtifactStore(os.path.join(base_dir, "applications"))
+
+
+def keep_copy(src, dest):
+    """Copy an input into a company folder as a plain, writable file.
+
+    Inputs are never store links (see generators/store.py): editing one
+    folder's copy in place must not change any other folder's.
+    """
+    release(dest)
+    return shutil.copy2(src, dest)
+
+
+def store_outputs(store, *paths):
+    """Swap freshly written outputs for links into the store."""
+    if store:
+        for path in paths:
+            store.ingest(path)
+
+
+def log_renders(args, applications):
+    """Append a 'rendered' row per (company, role, details) to the applications log."""
+    if args.no_log:
+        return
+    with ApplicationsLog(os.path.join(os.getcwd(), DEFAULT_DB)) as log:
+        for company, role, details in applications:
+            row_id = log.record_render(
+                company, role, details.get('req_id', ''), details.get('ats', ''),
+                details.get('location', ''), details.get('variant', ''))
+            print(f"Logged {company} ({role}) to {DEFAULT_DB} as #{row_id}")
+
+
+def warn_earlier_applications(args, base_dir):
+    """Print earlier or similar applications before rendering a new one."""
+    db_file = os.path.join(base_dir, DEFAULT_DB)
+    if args.no_log or not os.path.exists(db_file):
+        return
+    with ApplicationsLog(db_file) as log:
+        index = DedupeIndex(log, os.path.join(base_dir, "applications"))
+        result = index.lookup(args.company, args.req_id)
+    key = normalize_company(args.company)
+
+    def is_rerender(row):
+        return row['company_key'] == key and row['role'] == args.role and row['status'] == 'rendered'
+
+    result['req_ids'] = [row for row in result['req_ids'] if not is_rerender(row)]
+    result['companies'] = [
+        (company_key, score, folder, [row for row in rows if not is_rerender(row)])
+        for company_key, score, folder, rows in result['companies']
+    ]
+    result['companies'] = [match for match in result['companies'] if match[0] != key or match[3]]
+    lines = format_lookup(result, args.company, args.req_id)
+    if lines:
+        print("Earlier or similar applications (python -m tracker.dedupe for details):")
+        print("\n".join("  " + line for line in lines))
+
+
+def warn_untraceable(resume_data, base_dir):
+    """Print resume claims that do not trace back to the profile."""
+    profile = os.path.join(base_dir, "profile", "about_candidate.yml")
+    if not os.path.exists(profile):
+        return
+    missing = check_resume(resume_data, profile, os.path.join(base_dir, ".cache", "profile-index.json"))
+    if missing:
+        print("Warning: " + format_missing(missing, os.path.relpath(profile, base_dir)))
+
+
+def generate_other_formats(args, base_dir, output_dir, store):
+    """Write the DOCX and text / HTML previews asked for with --format (no LaTeX).
+
+    DOCX files go into the store like PDFs; previews are scratch output.
+    """
+    formats = [fmt for fmt in args.format if fmt != 'pdf']
+    if args.type in ['resume', 'both']:
+        base_resume = os.path.join(base_dir, "resume", "resume.yml")
+        if not os.path.exists(base_resume):
+            print(f"Error: resume not found at {base_resume}")
+            sys.exit(1)
+        target = os.path.join(output_dir, generate_filename(args.role, 'Resume', read_candidate_name(base_resume)))
+        for fmt in formats:
+            if fmt == 'docx':
+                generator = ResumeDocxGenerator(base_resume, args.resume_template)
+                release(target + ".docx")
+                output_file = generator.generate_docx(target)
+                store_outputs(store, output_file)
+            else:
+                generator = ResumePreview(base_resume, fmt, args.resume_template)
+                output_file = generator.generate_preview(target)
+            print(f"\nResume {fmt}: {output_file}")
+        if 'pdf' not in args.format:
+            warn_untraceable(generator.data, base_dir)
+
+    if args.type in ['coverletter', 'both']:
+        base_cover = os.path.join(base_dir, "coverletter", "coverletter.yml")
+        if not os.path.exists(base_cover):
+            print(f"Error: cover letter not found at {base_cover}")
+            sys.exit(1)
+        target = os.path.join(output_dir, generate_filename(args.role, 'CoverLetter', read_candidate_name(base_cover)))
+        for fmt in formats:
+            if fmt == 'docx':
+                release(target + ".docx")
+                output_file = CoverLetterDocxGenerator(base_cover, args.letter_template).generate_docx(
+                    target, args.company)
+                store_outputs(store, output_file)
+            else:
+                output_file = CoverLetterPreview(base_cover, fmt, args.letter_template).generate_preview(
+                    target, args.company)
+            print(f"\nCover letter {fmt}: {output_file}")
+
+
+def report_verification(pdf_file, fields, letter=False, size_budget=SIZE_BUDGET_KB):
+    """Print the Phase 5 checks (pages, bottom gap, extractable words) for a PDF."""
+    try:
+        # A letter need not fill the page, so its bottom gap is not checked
+        report, problems = verify_pdf(pdf_file, fields, max_gap=None if letter else MAX_BOTTOM_GAP)
+    except Exception as e:
+        print(f"Warning: could not verify {os.path.basename(pdf_file)}: {e}")
+        return
+    print(f"  Checked: {report.describe()}")
+    for problem in problems:
+        print(f"  Warning: {problem}")
+    report_size(pdf_file, size_budget)
+
+
+def report_size(pdf_file, size_budget=SIZE_BUDGET_KB):
+    """Print where a PDF's bytes go and warn when it is over the size budget."""
+    try:
+        report, problems = size_report(pdf_file, size_budget)
+    except Exception as e:
+        print(f"Warning: could not size {os.path.basename(pdf_file)}: {e}")
+        return
+    print(f"  Size: {report.describe()}")
+    for problem in problems:
+        print(f"  Warning: {problem}")
+
+
+def apply_build_options(generator, args):
+    """Copy the compile limits and reproducibility flags onto a generator."""
+    if args.timeout:
+        generator.compile_timeout = args.timeout
+    generator.deterministic = args.deterministic
+    generator.source_date = args.date
+    return generator
+
+
+def generate_bulk_coverletters(args):
+    """Render one cover letter per --bulk entry from a single pdflatex run."""
+    base_dir = os.getcwd()
+    base_cover = os.path.join(base_dir, "coverletter", "coverletter.yml")
+    if not os.path.exists(base_cover):
+        print(f"Error: cover letter not found at {base_cover}")
+        sys.exit(1)
+
+    with open(args.bulk) as f:
+        entries = yaml.safe_load(f) or []
+    if not isinstance(entries, list):
+        print(f"Error: {args.bulk} must be a list of entries (- company: ...), not a {type(entries).__name__}")
+        sys.exit(1)
+
+    candidate_name = read_candidate_name(base_cover)
+    store = open_store(base_dir, args)
+    outputs = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            print(f"Error: every --bulk entry must be a mapping with a company and a role: {entry!r}")
+            sys.exit(1)
+        role = entry.get('role') or args.role
+        if not entry.get('company') or not role:
+            print(f"Error: every --bulk entry needs a company and a role: {entry}")
+            sys.exit(1)
+        entry['role'] = role  # the letter's recipient title must match its filename
+        output_dir = create_output_structure(base_dir, entry['company'])
+        entry['output'] = os.path.join(
+            output_dir, generate_filename(role, 'CoverLetter', candidate_name) + ".pdf")
+        if entry['output'] in outputs:
+            print(f"Error: --bulk entries {outputs[entry['output']]} and {entry['company']} / {role} "
+                  f"both write {os.path.relpath(entry['output'], base_dir)}; give each a distinct company or role")
+            sys.exit(1)
+        outputs[entry['output']] = f"{entry['company']} / {role}"
+    for entry in entries:
+        release(entry['output'])
+
+    coverletter_generator = apply_build_options(
+        CoverLetterGenerator(base_cover, args.letter_template), args)
+    coverletter_generator.backend = args.letter_backend
+    try:
+        written = coverletter_generator.generate_bulk_pdf(entries)
+    except CompileTimeout as e:
+        print(f"\nCover letters skipped: {e}\n{e.log_tail()}")
+        sys.exit(1)
+    except LintError as e:
+        print(f"\nCover letters not compiled (coverletter.yml, --bulk entries): {e}")
+        sys.exit(1)
+    store_outputs(store, *written)
+    for output_file in written:
+        print(f"Cover letter generated: {output_file}")
+        report_verification(output_file, None, letter=True, size_budget=args.size_budget)
+    print(f"\n{len(written)} cover letters" + (" from one compile" if coverletter_generator.backend == 'latex' else ""))
+    log_renders(args, [(entry['company'], entry['role'], entry) for entry in entries])
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(
@@ -47,6 +281,25 @@ Workflow:
   --type resume       Resume only
   --type coverletter  Cover letter only
   --type both         Both (default when omitted)
+  --packet            With --type both: one pdflatex run that also writes a
+                      merged resume + cover letter PDF
+
+Mail-merge cover letters for many companies in one compile:
+    python main.py --bulk companies.yml
+
+Other formats, rendered without LaTeX (comma-separate to get several):
+    python main.py --company "Example Corp" --role "Engineer" --format pdf,docx
+    python main.py --company "Example Corp" --role "Engineer" --format txt    # pastes into ATS forms
+    python main.py --company "Example Corp" --role "Engineer" --format html
+
+Cover letter typeset in Python, no pdflatex needed (default layout only):
+    python main.py --company "Example Corp" --role "Engineer" --type coverletter --letter-backend fast
+
+Each successful render adds a 'rendered' row to applications-log.db
+(python -m tracker.log check --company X --req-id Y for dedupe).
+
+Byte-identical PDFs for caching and dedupe (same YAML + same date = same file):
+    python main.py --company "Example Corp" --role "Engineer" --deterministic --date 2025-10-15
         """
     )
     parser.add_argument('--ui', action='store_true', help='Launch the GUI version')
@@ -54,8 +307,50 @@ Workflow:
     parser.add_argument('--role', type=str, required=False, help='Role title')
     parser.add_argument('--type', type=str, choices=['resume', 'coverletter', 'both'],
                         default='both', help='What to generate (default: both)')
-    parser.add_argument('--url', type=str, default='', help='Job description URL (optional, saved for reference)')
+    parser.add_argument('--url', type=str, default='', help='Job description URL (optional; fetched into job_description.md)')
+    parser.add_argument('--req-id', type=str, default='', help='Requisition ID, recorded in the applications log')
+    parser.add_argument('--ats', type=str, default='', help='ATS (Greenhouse, Lever, ...), recorded in the applications log')
+    parser.add_argument('--location', type=str, default='', help='Job location, recorded in the applications log')
+    parser.add_argument('--variant', type=str, default='',
+                        help='Resume variant this was tailored from (e.g. ml, sw), for the weekly analytics')
+    parser.add_argument('--no-log', action='store_true',
+                        help=f'Do not append a row to {DEFAULT_DB} after rendering')
+    parser.add_argument('--timeout', type=int, default=None,
+                        help='Wall-clock seconds allowed per pdflatex pass (default: 60)')
+    parser.add_argument('--bulk', type=str, default='',
+                        help='YAML list of {company, role, recipient}: one cover letter per entry, one compile')
+    parser.add_argument('--resume-template', type=str, default='default',
+                        help='Resume layout: a name in resume/templates/ or a path (default: default)')
+    parser.add_argument('--letter-template', type=str, default='default',
+                        help='Cover letter layout: a name in coverletter/templates/ or a path (default: default)')
+    parser.add_argument('--format', type=str, default='pdf',
+                        help='Comma-separated output formats: pdf, docx, and txt / html previews; '
+                             'all but pdf render without LaTeX in milliseconds (default: pdf)')
+    parser.add_argument('--letter-backend', type=str, choices=['latex', 'fast'], default='latex',
+                        help='Cover letter renderer: latex, or fast to typeset the default layout '
+                             'in Python without pdflatex (default: latex)')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='Reproducible PDFs: pinned timestamps, no random trailer ID')
+    parser.add_argument('--date', type=str, default=None,
+                        help='Letter and PDF date as YYYY-MM-DD (default: $SOURCE_DATE_EPOCH, else today)')
+    parser.add_argument('--no-store', action='store_true',
+                        help='Write plain PDF/DOCX copies instead of links into applications/.store')
+    parser.add_argument('--size-budget', type=float, default=SIZE_BUDGET_KB,
+                        help=f'Warn when a PDF is larger than this many KB, 0 to skip (default: {SIZE_BUDGET_KB})')
+    parser.add_argument('--packet', action='store_true',
+                        help='Render resume and cover letter in one LaTeX job and also save the merged PDF')
     args = parser.parse_args()
+    args.format = [fmt.strip().lower() for fmt in args.format.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in args.format if fmt not in OUTPUT_FORMATS]
+    if unknown or not args.format:
+        parser.error(f"--format takes {', '.join(OUTPUT_FORMATS)} (comma-separated), got '{','.join(unknown)}'")
+    if args.letter_backend == 'fast' and args.letter_template != 'default':
+        parser.error("--letter-backend fast only renders the default letter layout")
+    if args.date:
+        try:
+            args.date = datetime.strptime(args.date, "%Y-%m-%d").date()
+        except ValueError:
+            parser.error(f"--date must look like 2025-10-15, got '{args.date}'")
 
     if args.ui:
         try:
@@ -65,17 +360,85 @@ Workflow:
             print(f"\nError: PyQt6 is not properly installed. {e}")
         return
 
+    if args.bulk and args.format != ['pdf']:
+        parser.error("--bulk renders PDFs only; drop --format")
+    if args.bulk:
+        generate_bulk_coverletters(args)
+        return
+
     if not args.company:
         parser.error("--company is required. Example: --company 'Example Corp'")
     if not args.role:
         parser.error("--role is required. Example: --role 'Software Engineer'")
+    if args.packet and args.type != 'both':
+        parser.error("--packet renders both documents; use it with --type both")
+    if args.packet and 'pdf' not in args.format:
+        parser.error("--packet renders PDFs; add pdf to --format")
+    if args.packet and args.letter_backend == 'fast':
+        parser.error("--packet typesets both documents in one LaTeX job; drop --letter-backend fast")
 
     base_dir = os.getcwd()
+    warn_earlier_applications(args, base_dir)
     output_dir = create_output_structure(base_dir, args.company)
+    store = open_store(base_dir, args)
 
     if args.url:
+        release(os.path.join(output_dir, 'job_description.txt'))
         with open(os.path.join(output_dir, 'job_description.txt'), 'w') as f:
             f.write(f"URL: {args.url}\n\n")
+        save_job_description(args.url, output_dir)
+
+    if args.format != ['pdf']:
+        generate_other_formats(args, base_dir, output_dir, store)
+    if 'pdf' not in args.format:
+        if 'docx' in args.format:
+            log_renders(args, [(args.company, args.role, vars(args))])
+        return
+
+    failed = []
+
+    # --- PACKET (resume + cover letter in one pdflatex job) ---
+    if args.packet:
+        base_resume = os.path.join(base_dir, "resume", "resume.yml")
+        base_cover = os.path.join(base_dir, "coverletter", "coverletter.yml")
+        for path in (base_resume, base_cover):
+            if not os.path.exists(path):
+                print(f"Error: {os.path.basename(path)} not found at {path}")
+                sys.exit(1)
+
+        candidate_name = read_candidate_name(base_resume)
+        keep_copy(base_resume, os.path.join(output_dir, "resume.yml"))
+
+        resume_generator = apply_build_options(ResumeGenerator(base_resume, args.resume_template), args)
+        warn_untraceable(resume_generator.data, base_dir)
+        packet = PacketGenerator(
+            resume_generator,
+            apply_build_options(CoverLetterGenerator(base_cover, args.letter_template), args),
+        )
+        targets = [
+            os.path.join(output_dir, generate_filename(args.role, kind, candidate_name) + ".pdf")
+            for kind in ('Packet', 'Resume', 'CoverLetter')
+        ]
+        for target in targets:
+            release(target)
+        try:
+            packet_file, resume_file, cover_file = packet.generate_pdf(*targets, args.company)
+        except CompileTimeout as e:
+            print(f"\nPacket skipped: {e}\n{e.log_tail()}")
+            sys.exit(1)
+        except LintError as e:
+            print(f"\nPacket not compiled: {e}")
+            sys.exit(1)
+        store_outputs(store, packet_file, resume_file, cover_file)
+        print(f"\nResume generated: {resume_file}")
+        report_verification(resume_file, resume_fields(resume_generator.data), size_budget=args.size_budget)
+        print(f"\nCover letter generated: {cover_file}")
+        report_verification(cover_file, letter_fields(packet.coverletter.data), letter=True,
+                            size_budget=args.size_budget)
+        print(f"\nApplication packet generated: {packet_file}")
+        report_size(packet_file, args.size_budget)
+        log_renders(args, [(args.company, args.role, vars(args))])
+        return
 
     # --- RESUME ---
     if args.type in ['resume', 'both']:
@@ -86,14 +449,26 @@ Workflow:
 
         candidate_name = read_candidate_name(base_resume)
         # Keep a copy of the resume used for this application
-        shutil.copy2(base_resume, os.path.join(output_dir, "resume.yml"))
+        keep_copy(base_resume, os.path.join(output_dir, "resume.yml"))
 
         base_name = generate_filename(args.role, 'Resume', candidate_name)
         tex_file = os.path.join(output_dir, base_name + ".tex")
 
-        resume_generator = ResumeGenerator(base_resume)
-        output_file = resume_generator.generate_pdf(tex_file, output_dir)
-        print(f"\nResume generated: {output_file}")
+        resume_generator = apply_build_options(ResumeGenerator(base_resume, args.resume_template), args)
+        warn_untraceable(resume_generator.data, base_dir)
+        release(os.path.splitext(tex_file)[0] + ".pdf")
+        try:
+            output_file = resume_generator.generate_pdf(tex_file, output_dir)
+            store_outputs(store, output_file)
+            print(f"\nResume generated: {output_file}")
+            report_verification(output_file, resume_fields(resume_generator.data), size_budget=args.size_budget)
+        except CompileTimeout as e:
+            # Keep going so a stuck resume does not block the cover letter
+            print(f"\nResume skipped: {e}")
+            failed.append('resume')
+        except LintError as e:
+            print(f"\nResume not compiled ({base_resume}): {e}")
+            failed.append('resume')
 
     # --- COVER LETTER ---
     if args.type in ['coverletter', 'both']:
@@ -106,9 +481,26 @@ Workflow:
         base_name = generate_filename(args.role, 'CoverLetter', candidate_name)
         cover_letter_file = os.path.join(output_dir, base_name + ".tex")
 
-        coverletter_generator = CoverLetterGenerator(base_cover)
-        output_file = coverletter_generator.generate_pdf(cover_letter_file, output_dir, args.company)
-        print(f"\nCover letter generated: {output_file}")
+        coverletter_generator = apply_build_options(
+            CoverLetterGenerator(base_cover, args.letter_template), args)
+        coverletter_generator.backend = args.letter_backend
+        release(os.path.splitext(cover_letter_file)[0] + ".pdf")
+        try:
+            output_file = coverletter_generator.generate_pdf(cover_letter_file, output_dir, args.company)
+            store_outputs(store, output_file)
+            print(f"\nCover letter generated: {output_file}")
+            report_verification(output_file, letter_fields(coverletter_generator.data), letter=True,
+                                size_budget=args.size_budget)
+        except CompileTimeout as e:
+            print(f"\nCover letter skipped: {e}\n{e.log_tail()}")
+            failed.append('coverletter')
+        except LintError as e:
+            print(f"\nCover letter not compiled ({base_cover}): {e}")
+            failed.append('coverletter')
+
+    if failed:
+        sys.exit(1)
+    log_renders(args, [(args.company, args.role, vars(args))])
 
 
 if __name__ == "__main__":
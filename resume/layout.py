@@ -0,0 +1,304 @@
+"""Resume spacing parameters and a tuner that makes the resume fill one page.
+
+The default template takes its margins and vertical spacing from
+``LAYOUT_PARAMS`` (each with an allowed range) instead of hardcoding them.
+A resume YAML can pin values in a top-level ``layout:`` block::
+
+    layout:
+      margin: 0.35          # top and bottom, in
+      entry_gap: 2          # before each job / project, pt
+
+``tune()`` adjusts them so the last line lands just above the bottom
+margin: no second page, no gap. Each parameter is used a known number
+of times in the LaTeX (one ``section_before`` per section, one
+``item_after`` per bullet, ...), so the space freed or consumed by a
+change is predicted from those counts. The tuner binary-searches one
+step along every range on that prediction, compiles once to measure,
+scales the prediction by what it observed, and repeats. A few points of
+overflow or gap settle in one or two compiles. Measurements are cached
+in ``.cache/layout-tuner.json`` by LaTeX source, so re-tuning an
+unchanged resume compiles nothing.
+
+    python -m resume.layout resume/resume.yml --write
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+from generators.pdf import PdfReader
+from generators.pdftext import text_lines
+
+# name: (default, low, high, unit)
+LAYOUT_PARAMS = {
+    "margin": (0.3, 0.2, 0.5, "in"),  # top and bottom page margin
+    "section_before": (-2.0, -6.0, 4.0, "pt"),  # above each section title
+    "section_after": (-5.0, -8.0, 0.0, "pt"),  # below each section rule
+    "item_after": (-2.0, -4.0, 1.0, "pt"),  # after each bullet
+    "entry_gap": (1.0, 0.0, 6.0, "pt"),  # before each job, project and school
+    "list_after": (-5.0, -8.0, -1.0, "pt"),  # after each bullet list
+}
+POINTS = {"pt": 1.0, "in": 72.27}
+# Target free space between the last baseline and the bottom margin, in pt
+TARGET_SLACK = 3.0
+FILL_TOLERANCE = 6.0  # slack in [0, FILL_TOLERANCE] counts as a full page
+DEFAULT_CACHE = os.path.join(".cache", "layout-tuner.json")
+
+
+def layout_params(overrides=None):
+    """Defaults updated with ``overrides`` (a YAML ``layout:`` block), validated."""
+    layout = {name: spec[0] for name, spec in LAYOUT_PARAMS.items()}
+    for name, value in (overrides or {}).items():
+        if name not in LAYOUT_PARAMS:
+            raise ValueError(f"Unknown layout parameter '{name}' (choose from {', '.join(LAYOUT_PARAMS)})")
+        _, low, high, unit = LAYOUT_PARAMS[name]
+        if not isinstance(value, (int, float)) or not low <= value <= high:
+            raise ValueError(f"layout.{name} must be a number from {low:g} to {high:g} ({unit}), got {value!r}")
+        layout[name] = float(value)
+    return layout
+
+
+def format_layout(layout):
+    """{name: LaTeX length} for the template, e.g. {'margin': '0.3in'}."""
+    return {name: f"{round(layout[name], 2):g}{LAYOUT_PARAMS[name][3]}" for name in LAYOUT_PARAMS}
+
+
+def usage_counts(tex_source):
+    """How many times each parameter's space is added to the page height."""
+    body = tex_source.split("\\begin{document}", 1)[-1]
+    sections = len(re.findall(r"\\section\*?\{", body))
+    return {
+        "margin": 2,  # the top margin pushes content down, the bottom one lifts the floor
+        "section_before": sections,
+        "section_after": sections,
+        "item_after": len(re.findall(r"\\resumeItem\{", body)),
+        "entry_gap": len(re.findall(r"\\entrygap\b|\\resumeSubheading\b", body)),
+        "list_after": len(re.findall(r"\\resumeItemListEnd\b", body)),
+    }
+
+
+class Measurement:
+    """Page count and free space of one render.
+
+    ``slack`` is the space between the last baseline and the bottom margin
+    in points, negative when the content runs onto a second page.
+    """
+
+    def __init__(self, pages, slack):
+        self.pages = pages
+        self.slack = slack
+
+    @classmethod
+    def read(cls, pdf_file, margin_pt):
+        reader = PdfReader(pdf_file)
+        baselines = []
+        for _, page in reader.pages:
+            box = reader.resolve(page.get("MediaBox")) or [0, 0, 612, 792]
+            ys = [y - box[1] for y, _, _, _ in text_lines(reader, page)]
+            baselines.append((min(ys), max(ys), box[3] - box[1]) if ys else None)
+        pages = len(baselines)
+        if not baselines or baselines[0] is None:
+            return cls(pages, None)
+        if pages == 1:
+            return cls(1, baselines[0][0] - margin_pt)
+        # Overflow: the height the text takes up on the later pages
+        overflow = 0.0
+        for used in baselines[1:]:
+            if used:
+                lowest, _, height = used
+                overflow += (height - margin_pt) - lowest
+        return cls(pages, -overflow)
+
+    def fits(self):
+        return self.pages == 1 and self.slack is not None and 0 <= self.slack <= FILL_TOLERANCE
+
+
+class LayoutCache:
+    """Measurements keyed by the LaTeX source they came from."""
+
+    def __init__(self, cache_path=DEFAULT_CACHE):
+        self.cache_path = cache_path
+        self.entries = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @staticmethod
+    def key(tex_source):
+        return hashlib.sha256(tex_source.encode("utf-8")).hexdigest()
+
+    def get(self, tex_source):
+        entry = self.entries.get(self.key(tex_source))
+        return Measurement(*entry) if entry else None
+
+    def put(self, tex_source, measurement):
+        self.entries[self.key(tex_source)] = [measurement.pages, measurement.slack]
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+
+
+def _step(start, t):
+    """Layout ``t`` of the way from ``start`` to every upper bound (t > 0,
+    more space used) or lower bound (t < 0)."""
+    layout = {}
+    for name, (_, low, high, _) in LAYOUT_PARAMS.items():
+        value = start[name]
+        layout[name] = value + t * ((high - value) if t > 0 else (value - low))
+    return layout
+
+
+def _consumed(start, layout, counts, gain):
+    """Predicted extra height (pt) that ``layout`` uses compared with ``start``."""
+    return gain * sum(counts[name] * (layout[name] - start[name]) * POINTS[LAYOUT_PARAMS[name][3]]
+                      for name in LAYOUT_PARAMS)
+
+
+def plan(start, counts, need, gain=1.0, iterations=40):
+    """Layout whose predicted extra height is ``need`` pt (negative to free space).
+
+    Bisects the step size along every parameter's range; the prediction is
+    monotonic in the step, so 40 halvings pin it far below a point.
+    """
+    low, high = -1.0, 1.0
+    if _consumed(start, _step(start, high), counts, gain) <= need:
+        return _step(start, high)  # even the loosest layout leaves a gap
+    if _consumed(start, _step(start, low), counts, gain) >= need:
+        return _step(start, low)  # even the tightest layout overflows
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        if _consumed(start, _step(start, middle), counts, gain) < need:
+            low = middle
+        else:
+            high = middle
+    return {name: round(value, 2) for name, value in _step(start, (low + high) / 2).items()}
+
+
+class TuneResult:
+    def __init__(self, layout, measurement, compiles, pdf_file):
+        self.layout = layout
+        self.measurement = measurement
+        self.compiles = compiles
+        self.pdf_file = pdf_file  # a render of exactly this layout, or None if only cached
+
+    def describe(self):
+        m = self.measurement
+        state = ("fills the page" if m.fits() else
+                 f"{m.pages} pages" if m.pages != 1 else f"{m.slack:.1f}pt free")
+        values = ", ".join(f"{name}={value}" for name, value in format_layout(self.layout).items())
+        return f"{state} after {self.compiles} compile(s): {values}"
+
+
+def tune(generator, pdf_file=None, max_compiles=3, cache_path=DEFAULT_CACHE):
+    """Adjust ``generator.layout`` until the resume fills exactly one page.
+
+    Renders go to ``pdf_file`` (a temporary file when None). Returns a
+    TuneResult; ``generator.layout`` is left at the best layout found,
+    preferring one page with the least free space.
+    """
+    cache = LayoutCache(cache_path)
+    work_dir = None
+    if pdf_file is None:
+        work_dir = tempfile.mkdtemp(prefix="layout-")
+        pdf_file = os.path.join(work_dir, "resume.pdf")
+    rendered = None  # layout the file at pdf_file was rendered with
+    compiles = 0
+    gain = 1.0
+    tried = []
+
+    def measure(layout):
+        nonlocal compiles, rendered
+        generator.layout = layout
+        tex_source = generator.generate_resume(generator.yaml_file)
+        cached = cache.get(tex_source)
+        if cached is not None:
+            return cached, usage_counts(tex_source)
+        generator.generate_pdf(pdf_file, os.path.dirname(pdf_file))
+        compiles += 1
+        rendered = dict(layout)
+        result = Measurement.read(pdf_file, layout["margin"] * POINTS["in"])
+        cache.put(tex_source, result)
+        return result, usage_counts(tex_source)
+
+    try:
+        layout = dict(generator.layout)
+        current, counts = measure(layout)
+        tried.append((layout, current))
+        while not current.fits() and current.slack is not None and compiles < max_compiles:
+            need = current.slack - TARGET_SLACK
+            proposal = plan(layout, counts, need, gain)
+            if all(abs(proposal[name] - layout[name]) < 1e-3 for name in LAYOUT_PARAMS):
+                break  # every parameter is at the end of its range
+            predicted = _consumed(layout, proposal, counts, 1.0)
+            result, counts = measure(proposal)
+            tried.append((proposal, result))
+            observed = current.slack - result.slack if result.slack is not None else None
+            # Scale later predictions by how far off this one was
+            if observed and predicted and 0.2 < observed / predicted < 5 and result.pages == current.pages:
+                gain = observed / predicted
+            layout, current = proposal, result
+
+        def rank(entry):
+            m = entry[1]
+            return (m.pages != 1, m.slack is None, m.slack < 0 if m.slack is not None else True,
+                    abs((m.slack or 0) - TARGET_SLACK))
+
+        best_layout, best = min(tried, key=rank)
+        generator.layout = best_layout
+        same = rendered is not None and all(rendered[n] == best_layout[n] for n in LAYOUT_PARAMS)
+        return TuneResult(best_layout, best, compiles, pdf_file if same and work_dir is None else None)
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+LAYOUT_BLOCK_RE = re.compile(r"^layout:[^\n]*\n(?:[ \t]+[^\n]*\n|[ \t]*\n)*", re.MULTILINE)
+
+
+def write_layout(yaml_file, layout):
+    """Replace (or append) the top-level ``layout:`` block of a resume YAML,
+    leaving the rest of the file and its comments untouched."""
+    block = "layout:\n" + "".join(
+        f"  {name}: {round(value, 2):g}\n" for name, value in layout.items()
+        if round(value, 2) != LAYOUT_PARAMS[name][0])
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        text = f.read()
+    text = LAYOUT_BLOCK_RE.sub("", text).rstrip("\n") + "\n"
+    if block != "layout:\n":
+        text += "\n" + block
+    with open(yaml_file, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def main():
+    import argparse
+    from resume.generator import ResumeGenerator
+    parser = argparse.ArgumentParser(description="Tune resume spacing so it fills exactly one page")
+    parser.add_argument("yaml", nargs="?", default=os.path.join("resume", "resume.yml"),
+                        help="Resume YAML (default: resume/resume.yml)")
+    parser.add_argument("--template", default="default", help="Resume layout template (default: default)")
+    parser.add_argument("--max-compiles", type=int, default=3, help="Compile budget (default: 3)")
+    parser.add_argument("-o", "--output", help="Keep the tuned PDF here")
+    parser.add_argument("--write", action="store_true", help="Save the tuned values in the YAML's layout: block")
+    args = parser.parse_args()
+
+    generator = ResumeGenerator(args.yaml, args.template)
+    result = tune(generator, args.output, args.max_compiles)
+    print(result.describe())
+    if args.write:
+        write_layout(args.yaml, result.layout)
+        print(f"Saved layout to {args.yaml}")
+    if not result.measurement.fits():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Resume variants and tailored resumes as overlays on a base resume.
+
+A variant need not repeat the personal, education and skills blocks of
+the resume it starts from. It names a base with ``extends:`` and lists
+only what differs::
+
+    extends: resume/resume_sw.yml
+    summary: |
+      Backend engineer who ...
+    experience:
+      patch:
+        Example Corp:
+          achievements:
+            drop: [3]
+            add:
+              - Cut p99 latency of the \\textbf{Go} gateway from 180ms to 90ms.
+    projects:
+      keep: [Distributed KV Store]
+    leadership: null
+
+Merging rules:
+
+- mappings merge key by key; any other value replaces the base's, and
+  ``null`` removes the key
+- a list is replaced by a list, or edited by a mapping of directives,
+  applied in this order: ``patch`` ({item: overlay}), ``drop`` ([item]),
+  ``add`` ([new items], appended), ``keep`` ([item], the items left, in
+  that order)
+- an item is named by its ``company``, ``name`` or ``title`` (the first
+  present), by its text when it is a plain string, or by its 0-based
+  position in the base list
+
+``extends`` is looked up in the overlay's folder and then in each folder
+above it, so ``resume/resume_sw.yml`` resolves from ``resume/`` and from
+``applications/{Company}/`` alike. A base may extend another base.
+
+Each layer is parsed only when its content changes (SHA-256), and every
+merge is memoized by the hashes of all the layers under it. Tailored
+resumes built on the same variant share its merged result, so after a
+base edit the base and variant are merged once and each application
+costs one merge of its own layer.
+
+    python -m resume.overlay applications/Globex/resume.yml           # print the merged resume
+    python -m resume.overlay applications/Globex/resume.yml --extends resume/resume_sw.yml --write
+"""
+import copy
+import hashlib
+import os
+
+import yaml
+
+EXTENDS_KEY = "extends"
+DIRECTIVES = ("patch", "drop", "add", "keep")
+# Fields that name a list item, in order of preference
+ITEM_KEYS = ("company", "name", "title")
+# Merged results kept in memory; one per distinct stack of layers
+MEMO_SIZE = 1024
+
+_layers = {}  # absolute path: ((mtime, size), digest, data)
+_merged = {}  # (digest, ...) base first: merged dict
+
+
+class OverlayError(ValueError):
+    """Raised when an overlay cannot be applied to its base."""
+
+
+def _read_layer(path):
+    """(digest, data) for one YAML file, re-parsed only when its content changed."""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _layers.get(path)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached[1] == digest:
+        data = cached[2]  # touched, not edited
+    else:
+        data = yaml.safe_load(raw) or {}
+        if not isinstance(data, dict):
+            raise OverlayError(f"{path}: expected a mapping at the top level")
+    _layers[path] = (key, digest, data)
+    return digest, data
+
+
+def find_base(name, folder):
+    """Path of ``extends: name`` looked up from ``folder`` upwards (None if absent)."""
+    if os.path.isabs(name):
+        return name if os.path.exists(name) else None
+    while True:
+        candidate = os.path.join(folder, name)
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+def layers(path):
+    """[(path, digest, data)] from the root base up to ``path``."""
+    chain = []
+    path = os.path.abspath(path)
+    while path:
+        if any(path == seen for seen, _, _ in chain):
+            names = " -> ".join(os.path.relpath(seen) for seen, _, _ in chain)
+            raise OverlayError(f"extends cycle: {names} -> {os.path.relpath(path)}")
+        digest, data = _read_layer(path)
+        chain.append((path, digest, data))
+        name = data.get(EXTENDS_KEY)
+        if name is None:
+            break
+        base = find_base(str(name), os.path.dirname(path))
+        if base is None:
+            raise OverlayError(f"{os.path.relpath(path)}: extends '{name}', which is not in "
+                               f"its folder or any folder above it")
+        path = base
+    chain.reverse()
+    return chain
+
+
+def _item_name(item):
+    if isinstance(item, dict):
+        for key in ITEM_KEYS:
+            if item.get(key) is not None:
+                return str(item[key])
+        return None
+    if isinstance(item, list):
+        return None
+    return str(item)
+
+
+def _find(entries, name, where):
+    """The [position, item] entry ``name`` refers to."""
+    if isinstance(name, int) and not isinstance(name, bool):
+        matches = [entry for entry in entries if entry[0] == name]
+    else:
+        matches = [entry for entry in entries if _item_name(entry[1]) == str(name)]
+    if not matches:
+        raise OverlayError(f"{where}: no item '{name}' in the base list")
+    if len(matches) > 1:
+        raise OverlayError(f"{where}: '{name}' names {len(matches)} items; use its position instead")
+    return matches[0]
+
+
+def _edit_list(base, edits, where):
+    unknown = [key for key in edits if key not in DIRECTIVES]
+    if unknown:
+        raise OverlayError(f"{where}: unknown list directive(s) {', '.join(map(str, unknown))} "
+                           f"(use {', '.join(DIRECTIVES)}, or give the whole list)")
+    entries = [[position, item] for position, item in enumerate(base)]
+    for name, overlay in (edits.get("patch") or {}).items():
+        entry = _find(entries, name, f"{where}.patch")
+        entry[1] = merge(entry[1], overlay, f"{where}[{name}]")
+    for name in edits.get("drop") or []:
+        entries.remove(_find(entries, name, f"{where}.drop"))
+    entries += [[None, item] for item in edits.get("add") or []]
+    if edits.get("keep") is not None:
+        entries = [_find(entries, name, f"{where}.keep") for name in edits["keep"]]
+    return [item for _, item in entries]
+
+
+def merge(base, overlay, where=""):
+    """``overlay`` applied to ``base``; neither argument is modified."""
+    if isinstance(overlay, dict) and isinstance(base, list):
+        return _edit_list(base, overlay, where or "list")
+    if not (isinstance(overlay, dict) and isinstance(base, dict)):
+        return overlay
+    merged = dict(base)
+    for key, value in overlay.items():
+        if key == EXTENDS_KEY and not where:
+            continue
+        if value is None:
+            merged.pop(key, None)
+        elif key in merged:
+            merged[key] = merge(merged[key], value, f"{where}.{key}" if where else str(key))
+        else:
+            merged[key] = value
+    return merged
+
+
+def _merge_chain(chain):
+    key = tuple(digest for _, digest, _ in chain)
+    merged = _merged.get(key)
+    if merged is not None:
+        return merged
+    path, _, data = chain[-1]
+    base = _merge_chain(chain[:-1]) if len(chain) > 1 else {}
+    try:
+        merged = merge(base, data)
+    except OverlayError as e:
+        raise OverlayError(f"{os.path.relpath(path)}: {e}") from None
+    if len(_merged) >= MEMO_SIZE:
+        _merged.pop(next(iter(_merged)))
+    _merged[key] = merged
+    return merged
+
+
+def load_resume(path):
+    """The resume YAML at ``path`` merged onto its bases.
+
+    Returns a fresh dict the caller may change; a file without
+    ``extends`` comes back as parsed.
+    """
+    return copy.deepcopy(_merge_chain(layers(path)))
+
+
+def diff(base, full):
+    """An overlay that turns ``base`` into ``full`` under ``merge``."""
+    if isinstance(base, dict) and isinstance(full, dict):
+        overlay = {}
+        for key, value in full.items():
+            if key not in base:
+                overlay[key] = value
+            elif base[key] != value:
+                overlay[key] = diff(base[key], value)
+        for key in base:
+            if key not in full:
+                overlay[key] = None
+        return overlay
+    if isinstance(base, list) and isinstance(full, list):
+        return _diff_list(base, full)
+    return full
+
+
+def _diff_list(base, full):
+    names = [_item_name(item) for item in base]
+    full_names = [_item_name(item) for item in full]
+    for listed in (names, full_names):
+        if None in listed or len(set(listed)) != len(listed):
+            return full  # items cannot all be named; give the list whole
+    edits = {}
+    patch = {}
+    for name, item in zip(full_names, full):
+        if name in names and base[names.index(name)] != item:
+            patch[name] = diff(base[names.index(name)], item)
+    if patch:
+        edits["patch"] = patch
+    added = [item for name, item in zip(full_names, full) if name not in names]
+    if added:
+        edits["add"] = added
+    if full_names != names + [name for name in full_names if name not in names]:
+        edits["keep"] = full_names
+    # Editing a list item by item only pays when it is shorter than the list
+    if len(yaml.safe_dump(edits)) >= len(yaml.safe_dump(full)):
+        return full
+    return edits
+
+
+class _Dumper(yaml.SafeDumper):
+    """Writes YAML the way the resumes are written: indented lists, ``|`` blocks."""
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+
+_Dumper.add_representer(str, lambda dumper, text: dumper.represent_scalar(
+    "tag:yaml.org,2002:str", text, style="|" if "\n" in text else None))
+
+
+def dump(data):
+    return yaml.dump(data, Dumper=_Dumper, sort_keys=False, allow_unicode=True, width=80)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Merge a resume overlay onto its bases, or turn a full resume into one")
+    parser.add_argument("yaml", help="Resume YAML (an overlay or a full resume)")
+    parser.add_argument("--layers", action="store_true", help="List the files merged, base first")
+    parser.add_argument("--extends", help="Rewrite the resume as an overlay on this base")
+    parser.add_argument("-o", "--output", help="Write the result here instead of printing it")
+    parser.add_argument("--write", action="store_true", help="Replace the YAML file with the result")
+    args = parser.parse_args()
+
+    try:
+        if args.layers:
+            for path, digest, _ in layers(args.yaml):
+                print(f"{digest[:12]}  {os.path.relpath(path)}")
+            return
+        merged = load_resume(args.yaml)
+        if args.extends:
+            target = args.output or args.yaml
+            base = find_base(args.extends, os.path.dirname(os.path.abspath(target)))
+            if base is None:
+                raise OverlayError(f"base '{args.extends}' is not in the folder of {target} or above it")
+            if os.path.abspath(base) == os.path.abspath(args.yaml):
+                raise OverlayError(f"{args.yaml} cannot extend itself")
+            result = {EXTENDS_KEY: args.extends, **diff(load_resume(base), merged)}
+            # The overlay must merge back into exactly the resume it replaces
+            if merge(_merge_chain(layers(base)), result) != merged:
+                raise OverlayError(f"{args.yaml}: the overlay does not reproduce the resume; left unchanged")
+        else:
+            result = merged
+    except (OSError, OverlayError, yaml.YAMLError) as e:
+        raise SystemExit(f"Error: {e}")
+
+    text = dump(result)
+    target = args.output or (args.yaml if args.write else None)
+    if target is None:
+        print(text, end="")
+        return
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"Wrote {target} ({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Pick the resume to start tailoring from, by similarity to the job description.
+
+Candidates are the role-slanted variants (``resume/resume_*.yml``) and every
+tailored ``resume.yml`` already under ``applications/``. Each one's
+summary, experience titles and bullets, project descriptions and skills
+(skills count double) are tokenized into words and word pairs, hashed
+into a fixed feature space, and compared with the job description by
+cosine similarity (IDF weighting on the job description side).
+
+Term vectors are cached in ``.cache/resume-selector.json`` keyed by path,
+mtime and size (and those of every base an overlay extends), so a ranking
+only parses files that changed; with hundreds of past resumes indexed it
+is a dictionary walk per candidate.
+Hardlinked copies (see ``generators/store.py``) are ranked once.
+
+    python -m resume.selector applications/Globex_Inc/job_description.md
+    python -m resume.selector posting.md --top 3 --copy   # best one -> resume/resume.yml
+"""
+import glob
+import json
+import math
+import os
+import re
+import shutil
+import zlib
+
+from resume.overlay import layers, load_resume
+
+DEFAULT_CACHE = os.path.join(".cache", "resume-selector.json")
+# 2**18 buckets keeps collisions rare for resume-sized vocabularies
+FEATURE_BITS = 18
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+LATEX_RE = re.compile(r"\\(?:textbf|textit|emph|underline)\{([^{}]*)\}|\\([&%$#_])")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the this
+to we will with you your who what which while about across over using use via per their
+they them than then also all any can may must should would able within work working
+""".split())
+
+
+def _plain(text):
+    """Drop LaTeX markup: \\textbf{PyTorch} -> PyTorch, \\& -> &."""
+    return LATEX_RE.sub(lambda m: m.group(1) if m.group(1) is not None else m.group(2), str(text))
+
+
+def tokens(text):
+    words = [w for w in TOKEN_RE.findall(_plain(text).lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def term_counts(text, weight=1, counts=None):
+    """Add hashed token counts of ``text`` to ``counts`` ({bucket: count})."""
+    counts = {} if counts is None else counts
+    mask = (1 << FEATURE_BITS) - 1
+    for token in tokens(text):
+        bucket = zlib.crc32(token.encode("utf-8")) & mask
+        counts[bucket] = counts.get(bucket, 0) + weight
+    return counts
+
+
+def resume_counts(data):
+    """Hashed term counts for the parts of a resume YAML that carry the role."""
+    counts = term_counts(data.get("summary") or "")
+    for job in data.get("experience") or []:
+        term_counts(job.get("title") or "", 1, counts)
+        for bullet in job.get("achievements") or []:
+            term_counts(bullet, 1, counts)
+    for project in data.get("projects") or []:
+        term_counts(f"{project.get('name') or ''} {project.get('description') or ''}", 1, counts)
+    for group in data.get("skills") or []:
+        items = group.get("items") if isinstance(group, dict) else group
+        if isinstance(items, list):
+            items = ", ".join(map(str, items))
+        term_counts(items or "", 2, counts)
+    return counts
+
+
+def candidate_paths(base_dir="."):
+    """Variants first, then tailored resumes under applications/ (store excluded)."""
+    paths = sorted(glob.glob(os.path.join(base_dir, "resume", "resume_*.yml")))
+    for path in sorted(glob.glob(os.path.join(base_dir, "applications", "**", "resume.yml"), recursive=True)):
+        if f"{os.sep}.store{os.sep}" not in path:
+            paths.append(path)
+    return paths
+
+
+def _unchanged(path, mtime, size):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_mtime_ns == mtime and stat.st_size == size
+
+
+class ResumeIndex:
+    """Cached term vectors for candidate resumes."""
+
+    def __init__(self, cache_path=DEFAULT_CACHE):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def vector(self, path, stat=None):
+        """({bucket: count}, norm) for ``path``, parsing the YAML only when it changed."""
+        stat = stat or os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.entries.get(key)
+        if (cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size
+                and "bases" in cached and all(_unchanged(*base) for base in cached["bases"])):
+            return cached["counts"], cached["norm"]
+        data = load_resume(path)
+        # JSON object keys are strings; keep them that way in memory too
+        counts = {str(bucket): count for bucket, count in resume_counts(data).items()}
+        norm = tf_norm(counts)
+        # An overlay's vector also goes stale when a file it extends changes
+        bases = [[base, os.stat(base).st_mtime_ns, os.stat(base).st_size] for base, _, _ in layers(path)[:-1]]
+        self.entries[key] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "bases": bases,
+                             "counts": counts, "norm": norm}
+        self.dirty = True
+        return counts, norm
+
+    def save(self):
+        if not (self.dirty and self.cache_path):
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(self.cache_path + ".tmp", self.cache_path)
+        self.dirty = False
+
+    def candidates(self, paths):
+        """[(path, counts, norm)], skipping hardlinks to a file already listed."""
+        seen = set()
+        found = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            found.append((path, *self.vector(path, stat)))
+        return found
+
+
+def tf_norm(counts):
+    """Length of a vector of sublinear TF weights."""
+    return math.sqrt(sum((1.0 + math.log(count)) ** 2 for count in counts.values()))
+
+
+def rank(job_description, candidates):
+    """[(score, path)] best first; ``candidates`` as from ResumeIndex.candidates.
+
+    lnc.ltc weighting: candidates use log TF with cosine normalization (so
+    their norms are cached with the vectors), the query log TF times IDF
+    over the candidate set. Only the query's buckets are ever looked up.
+    """
+    query_counts = {str(bucket): count for bucket, count in term_counts(job_description).items()}
+    if not candidates or not query_counts:
+        return []
+    docs = len(candidates) + 1
+    # Shared buckets per candidate: a C-level set intersection on dict keys
+    query_keys = set(query_counts)
+    shared = [query_keys.intersection(counts) for _, counts, _ in candidates]
+    df = dict.fromkeys(query_counts, 1)
+    for buckets in shared:
+        for bucket in buckets:
+            df[bucket] += 1
+    query = {
+        bucket: (1.0 + math.log(count)) * (math.log((1 + docs) / (1 + df[bucket])) + 1.0)
+        for bucket, count in query_counts.items()
+    }
+    query_norm = math.sqrt(sum(w * w for w in query.values()))
+
+    scored = []
+    for (path, counts, norm), buckets in zip(candidates, shared):
+        dot = sum(query[bucket] * (1.0 + math.log(counts[bucket])) for bucket in buckets)
+        score = dot / (query_norm * norm) if norm else 0.0
+        scored.append((round(score, 4), path))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored
+
+
+def select(job_description, base_dir=".", variants_only=False, cache_path=DEFAULT_CACHE):
+    """Ranked (score, path) list of starting points for this job description."""
+    paths = candidate_paths(base_dir)
+    if variants_only:
+        paths = [path for path in paths if os.path.basename(path).startswith("resume_")]
+    index = ResumeIndex(cache_path)
+    try:
+        return rank(job_description, index.candidates(paths))
+    finally:
+        index.save()
+
+
+def variant_name(path):
+    """"resume/resume_ml.yml" -> "ml"; None for tailored resumes."""
+    match = re.fullmatch(r"resume_(\w+)\.ya?ml", os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Rank resume variants and past resumes against a job description")
+    parser.add_argument("job_description", help="job_description.md (or any text file) for the role")
+    parser.add_argument("--top", type=int, default=5, help="How many candidates to list (default: 5)")
+    parser.add_argument("--variants-only", action="store_true",
+                        help="Only consider resume/resume_*.yml, not past applications")
+    parser.add_argument("--copy", action="store_true",
+                        help="Copy the best match to resume/resume.yml (overwrites it)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help=f"Vector cache (default: {DEFAULT_CACHE})")
+    args = parser.parse_args()
+
+    with open(args.job_description, "r", encoding="utf-8") as f:
+        text = f.read()
+    start = time.perf_counter()
+    ranked = select(text, variants_only=args.variants_only, cache_path=args.cache)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not ranked:
+        print("No candidate resumes found")
+        raise SystemExit(1)
+    for score, path in ranked[:args.top]:
+        print(f"  {score:.3f}  {path}")
+    print(f"{len(ranked)} candidates ranked in {elapsed:.0f} ms")
+
+    best = ranked[0][1]
+    variant = variant_name(best)
+    if variant:
+        print(f"Best start: {best} (pass --variant {variant} to main.py)")
+    if args.copy:
+        from generators.store import release
+        target = os.path.join("resume", "resume.yml")
+        release(target)
+        shutil.copyfile(best, target)
+        print(f"Copied {best} -> {target}")
+
+
+if __name__ == "__main__":
+    main()
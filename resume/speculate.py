@@ -0,0 +1,196 @@
+"""Render several candidate resumes at once and keep the one that fits best.
+
+While tailoring there are often a few plausible edits at once (drop a
+project, shorten a bullet, reorder skills). Instead of trying them one
+compile at a time, ``render_candidates`` typesets every candidate YAML
+concurrently through ``ResumeGenerator`` (one pdflatex per worker, so
+they spread across cores) and scores each PDF as it finishes:
+
+- fit: exactly one page
+- bottom gap: the empty space under the last line, at most ``max_gap`` points
+- keyword coverage: the share of the job description's words that any
+  candidate can supply which this PDF's text actually contains
+
+As soon as a finished candidate meets all three targets the remaining
+compiles are cancelled (queued ones never start, running engines are
+killed) and the best finished candidate wins. Candidates whose LaTeX fails
+the preflight lint are scored as failed without a compile.
+
+    python -m resume.speculate resume/try_*.yml --jd applications/Globex/job_description.md -o best.pdf
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import shutil
+import tempfile
+import threading
+
+from generators.base import CompileCancelled, CompileTimeout
+from generators.lint import LintError
+from generators.verify import MAX_BOTTOM_GAP, resume_fields, verify_pdf
+from resume.generator import ResumeGenerator
+from resume.overlay import load_resume
+from resume.selector import tokens
+
+# Share of the attainable job description keywords a candidate must show
+MIN_COVERAGE = 0.9
+
+
+class Candidate:
+    """One resume variant and how its render scored."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pdf = None
+        self.pages = None
+        self.bottom_gap = None
+        self.coverage = None
+        self.missing = []  # attainable keywords absent from the PDF text
+        self.error = None  # why it has no score: lint, timeout, cancelled
+
+    def meets(self, max_gap=MAX_BOTTOM_GAP, min_coverage=MIN_COVERAGE):
+        """True when the render is one page, fills it, and covers the keywords."""
+        return (self.error is None and self.pages == 1
+                and self.bottom_gap is not None and self.bottom_gap <= max_gap
+                and (self.coverage is None or self.coverage >= min_coverage))
+
+    def rank_key(self, max_gap=MAX_BOTTOM_GAP):
+        """Sort key, best first: one page, then no gap, coverage, smallest gap."""
+        gap = self.bottom_gap if self.bottom_gap is not None else float("inf")
+        return (self.error is not None, self.pages != 1, gap > max_gap, -(self.coverage or 0), gap)
+
+    def describe(self):
+        if self.error:
+            return f"{self.path}: {self.error}"
+        parts = [f"{self.pages} page{'s' if self.pages != 1 else ''}",
+                 f"bottom gap {self.bottom_gap:.0f}pt" if self.bottom_gap is not None else "no text"]
+        if self.coverage is not None:
+            parts.append(f"keywords {self.coverage:.0%}")
+        return f"{self.path}: {', '.join(parts)}"
+
+
+def _yaml_text(path):
+    data = load_resume(path)
+    return data, " ".join(resume_fields(data))
+
+
+def job_keywords(job_description, texts):
+    """Job description words (and word pairs) that at least one text contains."""
+    wanted = set(tokens(job_description))
+    supplied = set()
+    for text in texts:
+        supplied.update(tokens(text))
+    return wanted & supplied
+
+
+def render_candidates(paths, job_description="", template="default", workers=None,
+                      max_gap=MAX_BOTTOM_GAP, min_coverage=MIN_COVERAGE, stop_early=True,
+                      work_dir=None):
+    """Render ``paths`` concurrently; return (best Candidate or None, all Candidates).
+
+    Candidates come back best first. Their PDFs are left under ``work_dir``
+    (a new temporary directory when None) for the caller to copy and remove.
+    """
+    candidates = [Candidate(path) for path in paths]
+    sources = {candidate.path: _yaml_text(candidate.path) for candidate in candidates}
+    keywords = job_keywords(job_description, [text for _, text in sources.values()]) if job_description else set()
+    work_dir = work_dir or tempfile.mkdtemp(prefix="speculate-")
+    cancel = threading.Event()
+
+    def render(index, candidate):
+        data, _ = sources[candidate.path]
+        generator = ResumeGenerator(candidate.path, template)
+        generator.cancel_event = cancel
+        target = os.path.join(work_dir, str(index), "resume.pdf")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            candidate.pdf = generator.generate_pdf(target, os.path.dirname(target))
+        except LintError as e:
+            candidate.error = f"not compiled, {len(e.problems)} LaTeX problem(s)"
+            return candidate
+        except CompileCancelled:
+            candidate.error = "cancelled"
+            return candidate
+        except CompileTimeout as e:
+            candidate.error = str(e)
+            return candidate
+        report, _ = verify_pdf(candidate.pdf, resume_fields(data), max_gap=max_gap)
+        candidate.pages = report.pages
+        candidate.bottom_gap = report.bottom_gaps[-1] if report.bottom_gaps else None
+        if keywords:
+            found = set(tokens(report.text))
+            candidate.missing = sorted(keywords - found)
+            candidate.coverage = 1 - len(candidate.missing) / len(keywords)
+        return candidate
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 2) as executor:
+        futures = [executor.submit(render, index, candidate) for index, candidate in enumerate(candidates)]
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                continue
+            if stop_early and future.result().meets(max_gap, min_coverage):
+                cancel.set()
+                for pending in futures:
+                    if pending.cancel():
+                        candidates[futures.index(pending)].error = "cancelled"
+                break
+    for candidate, future in zip(candidates, futures):
+        if not future.cancelled() and future.done() and future.exception() is not None:
+            candidate.error = str(future.exception())
+
+    candidates.sort(key=lambda candidate: candidate.rank_key(max_gap))
+    best = candidates[0] if candidates and candidates[0].error is None else None
+    return best, candidates
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Render resume variants concurrently and keep the best fit")
+    parser.add_argument("yaml", nargs="+", help="Candidate resume YAML files")
+    parser.add_argument("--jd", help="Job description (markdown or text) for keyword coverage")
+    parser.add_argument("--template", default="default", help="Resume layout (default: default)")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent compiles (default: CPU count)")
+    parser.add_argument("--max-gap", type=float, default=MAX_BOTTOM_GAP,
+                        help=f"Largest bottom gap in points that fits (default: {MAX_BOTTOM_GAP})")
+    parser.add_argument("--min-coverage", type=float, default=MIN_COVERAGE,
+                        help=f"Share of attainable JD keywords required (default: {MIN_COVERAGE})")
+    parser.add_argument("--all", action="store_true", help="Render every candidate; do not stop at the first fit")
+    parser.add_argument("-o", "--output", help="Copy the best candidate's PDF here")
+    parser.add_argument("--copy", action="store_true", help="Copy the best candidate's YAML to resume/resume.yml")
+    args = parser.parse_args()
+
+    job_description = ""
+    if args.jd:
+        with open(args.jd, "r", encoding="utf-8") as f:
+            job_description = f.read()
+    work_dir = tempfile.mkdtemp(prefix="speculate-")
+    try:
+        start = time.perf_counter()
+        best, candidates = render_candidates(
+            args.yaml, job_description, args.template, args.workers,
+            args.max_gap, args.min_coverage, stop_early=not args.all, work_dir=work_dir)
+        elapsed = time.perf_counter() - start
+        for candidate in candidates:
+            marker = "*" if candidate is best else " "
+            print(f"{marker} {candidate.describe()}")
+        print(f"{len(candidates)} candidate(s) in {elapsed:.1f}s")
+        if best is None:
+            raise SystemExit("No candidate rendered")
+        if not best.meets(args.max_gap, args.min_coverage):
+            print(f"Warning: no candidate met every target; best is {best.path}")
+            if best.missing:
+                print(f"  Missing keywords: {', '.join(best.missing[:12])}")
+        if args.output:
+            shutil.copyfile(best.pdf, args.output)
+            print(f"Best PDF: {args.output}")
+        if args.copy:
+            target = os.path.join("resume", "resume.yml")
+            if os.path.abspath(best.path) != os.path.abspath(target):
+                shutil.copyfile(best.path, target)
+            print(f"Copied {best.path} -> {target}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
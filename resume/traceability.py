@@ -0,0 +1,220 @@
+"""Check a tailored resume against the profile: "never fabricate", mechanically.
+
+WORKFLOW.md requires every technology and metric on the resume to trace
+back to ``profile/about_candidate.yml``. ``ProfileIndex`` flattens the
+profile once into normalized text (for term and phrase lookups) and a set
+of metric values, and caches both in ``.cache/profile-index.json`` keyed by
+the profile's mtime and size. ``untraceable()`` then walks a resume's YAML
+in one pass and returns every claim it cannot find, with its YAML path.
+
+What counts as a claim:
+
+- each ``\\textbf{...}`` span: a term, or a metric when it starts with a digit
+- each skills entry (``AWS (Lambda, S3)`` is checked as AWS, Lambda and S3)
+- company, institution and organization names
+- every other number in prose (13 percent, 2M, 0.91); years are ignored
+
+    python -m resume.traceability resume/resume.yml
+"""
+import json
+import os
+import re
+
+import yaml
+
+from resume.overlay import load_resume
+
+DEFAULT_PROFILE = os.path.join("profile", "about_candidate.yml")
+DEFAULT_CACHE = os.path.join(".cache", "profile-index.json")
+
+# Subtrees and fields that hold contact details, dates or links, not claims
+SKIP_KEYS = {"personal", "personal_information", "date", "dates", "start", "end", "link",
+             "url", "year", "location", "work_authorization", "layout"}
+NAME_KEYS = {"company", "institution", "organization"}
+SKILL_KEYS = {"items", "technologies"}
+
+BOLD_RE = re.compile(r"\\textbf\{((?:[^{}]|\{[^{}]*\})*)\}")
+ESCAPE_RE = re.compile(r"\\([&%$#_])")
+TERM_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*[+#]*")
+METRIC_RE = re.compile(
+    r"(?<![\w.])(\d+(?:,\d{3})*(?:\.\d+)?)\s*(%|percent\b|k\b|thousand\b|m\b|million\b|b\b|billion\b)?",
+    re.IGNORECASE,
+)
+SCALES = {"k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6, "b": 1e9, "billion": 1e9}
+SKILL_SPLIT_RE = re.compile(r"[,;()/]")
+
+
+def _plain(text):
+    return ESCAPE_RE.sub(r"\1", str(text))
+
+
+def _stem(word):
+    """Light plural folding so "APIs" matches "API" and "models" matches "model"."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalize(text):
+    """Lowercased, stemmed tokens joined by single spaces."""
+    return " ".join(_stem(word) for word in TERM_RE.findall(_plain(text).lower()))
+
+
+def metrics(text):
+    """Normalized metric values in ``text``: ("%", 35.0), ("", 2000000.0)..."""
+    found = set()
+    for number, unit in METRIC_RE.findall(_plain(text)):
+        value = float(number.replace(",", ""))
+        unit = (unit or "").lower()
+        if not unit and value.is_integer() and 1900 <= value <= 2099 and "," not in number:
+            continue  # a year
+        if unit in ("%", "percent"):
+            found.add(("%", value))
+        else:
+            found.add(("", value * SCALES.get(unit, 1)))
+    return found
+
+
+def _strings(node):
+    """Every string under a YAML node."""
+    if isinstance(node, dict):
+        for value in node.values():
+            yield from _strings(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _strings(value)
+    elif node is not None:
+        yield str(node)
+
+
+class ProfileIndex:
+    """Normalized profile text and metric set, cached by profile mtime."""
+
+    _memo = {}
+
+    def __init__(self, text, metric_values):
+        self.text = f" {text} "
+        self.metrics = metric_values
+
+    @classmethod
+    def build(cls, profile):
+        """Index a parsed profile dict."""
+        parts = []
+        metric_values = set()
+        for value in _strings(profile):
+            parts.append(normalize(value))
+            metric_values |= metrics(value)
+        return cls(" ".join(part for part in parts if part), metric_values)
+
+    @classmethod
+    def load(cls, profile_path=DEFAULT_PROFILE, cache_path=DEFAULT_CACHE):
+        """The index for ``profile_path``, rebuilt only when the file changed."""
+        stat = os.stat(profile_path)
+        key = (os.path.abspath(profile_path), stat.st_mtime_ns, stat.st_size)
+        if key in cls._memo:
+            return cls._memo[key]
+        index = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached["key"] == list(key):
+                    index = cls(cached["text"], {tuple(m) for m in cached["metrics"]})
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None:
+            with open(profile_path, "r", encoding="utf-8") as f:
+                index = cls.build(yaml.safe_load(f) or {})
+            if cache_path:
+                os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+                with open(cache_path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump({"key": list(key), "text": index.text.strip(),
+                               "metrics": sorted(index.metrics)}, f)
+                os.replace(cache_path + ".tmp", cache_path)
+        cls._memo = {key: index}
+        return index
+
+    def has_term(self, term):
+        normalized = normalize(term)
+        return not normalized or f" {normalized} " in self.text
+
+    def has_metric(self, metric):
+        return metric in self.metrics
+
+
+def _claims(key, value):
+    """(kind, claim text, normalized metric or None) found in one YAML string."""
+    if key in NAME_KEYS:
+        yield "name", value.strip(), None
+        return
+    if key in SKILL_KEYS:
+        for item in SKILL_SPLIT_RE.split(_plain(value)):
+            if item.strip():
+                yield "skill", item.strip(), None
+        return
+    for span in BOLD_RE.findall(value):
+        if span[:1].isdigit():
+            for metric in metrics(span):
+                yield "metric", _plain(span), metric
+        else:
+            yield "term", span, None
+    rest = BOLD_RE.sub(" ", value)
+    for number, unit in METRIC_RE.findall(_plain(rest)):
+        for metric in metrics(number + (unit or "")):
+            yield "metric", f"{number}{' ' if unit and unit[0].isalpha() else ''}{unit or ''}", metric
+
+
+def untraceable(resume, index):
+    """[(yaml_path, kind, claim)] for claims the profile index cannot back."""
+    missing = []
+    stack = [("", None, resume)]
+    while stack:
+        path, key, node = stack.pop()
+        if isinstance(node, dict):
+            for child_key, value in reversed(list(node.items())):
+                if child_key in SKIP_KEYS:
+                    continue
+                stack.append((f"{path}.{child_key}" if path else child_key, child_key, value))
+        elif isinstance(node, list):
+            for i in range(len(node) - 1, -1, -1):
+                stack.append((f"{path}[{i}]", key, node[i]))
+        elif isinstance(node, str):
+            for kind, claim, metric in _claims(key, node):
+                ok = index.has_metric(metric) if kind == "metric" else index.has_term(claim)
+                if not ok:
+                    missing.append((path, kind, claim))
+    return missing
+
+
+def check_resume(resume, profile_path=DEFAULT_PROFILE, cache_path=DEFAULT_CACHE):
+    """untraceable() for a resume dict or YAML path against the profile."""
+    if isinstance(resume, str):
+        resume = load_resume(resume)
+    return untraceable(resume, ProfileIndex.load(profile_path, cache_path))
+
+
+def format_missing(missing, profile_path=DEFAULT_PROFILE):
+    lines = [f"{len(missing)} claim(s) not found in {profile_path}:"]
+    for path, kind, claim in missing:
+        lines.append(f"  {path}: {kind} '{claim}'")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="List resume claims that do not trace back to the profile")
+    parser.add_argument("resume", nargs="?", default=os.path.join("resume", "resume.yml"),
+                        help="Tailored resume YAML (default: resume/resume.yml)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help=f"Profile YAML (default: {DEFAULT_PROFILE})")
+    args = parser.parse_args()
+
+    missing = check_resume(args.resume, args.profile)
+    if not missing:
+        print(f"Every claim traces back to {args.profile}")
+        return
+    print(format_missing(missing, args.profile))
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
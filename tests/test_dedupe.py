@@ -0,0 +1,65 @@
+"""DedupeIndex against a scratch log and applications/ folder.
+
+    python -m pytest tests/test_dedupe.py
+"""
+import pytest
+
+from tracker.dedupe import DedupeIndex, compact_req_id
+from tracker.log import ApplicationsLog
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = ApplicationsLog(str(tmp_path / "applications-log.db"))
+    log.add("Globex", "Data Engineer", "GBX-0571", "Ashby", status="rejected", date="2024-06-04")
+    log.add("Initech", "Platform Engineer", "INI-314", "Greenhouse", status="closed", date="2024-06-05")
+    yield log
+    log.close()
+
+
+@pytest.fixture
+def applications(tmp_path):
+    root = tmp_path / "applications"
+    (root / "globex_corporation" / "data_engineer").mkdir(parents=True)
+    (root / "Initech_LLC").mkdir()
+    return root
+
+
+@pytest.mark.parametrize("name", ["Globex", "Globex Inc.", "globex_corporation", "GLOBEX, Inc"])
+def test_spellings_of_one_company_match_exactly(log, applications, name):
+    index = DedupeIndex(log, str(applications))
+    matches = index.similar_companies(name)
+    assert matches[0] == ("globex", 1.0, "globex_corporation")
+    assert [key for key, _, _ in matches] == ["globex"]
+
+
+def test_lookup_returns_the_logged_rows(log, applications):
+    result = DedupeIndex(log, str(applications)).lookup("Globex Inc.")
+    [(key, score, folder, rows)] = result["companies"]
+    assert (key, score, folder) == ("globex", 1.0, "globex_corporation")
+    assert [(row["company"], row["req_id"]) for row in rows] == [("Globex", "GBX-0571")]
+
+
+def test_typos_and_longer_forms_are_near_matches(log):
+    index = DedupeIndex(log)
+    for name in ("Globx", "Globex Systems"):
+        [(key, score, folder)] = index.similar_companies(name)
+        assert key == "globex"
+        assert 0.6 <= score < 1.0
+        assert folder is None
+    assert index.similar_companies("Umbrella") == []
+
+
+def test_req_ids_match_without_separators(log):
+    index = DedupeIndex(log)
+    assert compact_req_id("gbx 0571") == "GBX0571"
+    assert index.matching_req_ids("gbx0571") == ["GBX-0571"]
+    assert [row["company"] for row in index.lookup(req_id="GBX 0571")["req_ids"]] == ["Globex"]
+
+
+def test_rows_added_after_open_are_indexed_on_sync(log):
+    index = DedupeIndex(log)
+    assert index.similar_companies("Hooli") == []
+    log.add("Hooli Inc", "ML Engineer", "HL-9")
+    index.sync()
+    assert index.similar_companies("hooli") == [("hooli", 1.0, None)]
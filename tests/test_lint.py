@@ -0,0 +1,69 @@
+"""LaTeX preflight: problems reported at the YAML path they come from.
+
+    python -m pytest tests/test_lint.py
+"""
+import os
+
+import pytest
+
+from generators.lint import LintError, lint, lint_document
+from resume.generator import ResumeGenerator
+
+RESUME = os.path.join("resume", "resume.yml")
+
+
+@pytest.fixture
+def resume():
+    return ResumeGenerator(RESUME)
+
+
+def problems(generator):
+    return lint(generator.generate_resume(generator.yaml_file), generator.lint_fields())
+
+
+def test_example_resume_is_clean(resume):
+    assert problems(resume) == []
+    assert problems(resume) == []  # again, with its preamble remembered
+
+
+def test_field_problems_carry_the_yaml_path(resume):
+    resume.data["experience"][0]["achievements"][2] += " at 10^6 req/s for $5"
+    resume.data["projects"][1]["description"] += r" with \foo"
+    resume.data["summary"] += r" Cut latency \times 4."
+    assert problems(resume) == [
+        ("summary", r"\times is only valid in math mode (wrap it in $...$)"),
+        ("experience[0].achievements[2]", r"unescaped '^'; write \textasciicircum{} or $^{...}$"),
+        ("experience[0].achievements[2]", r"unbalanced '$' (write \$ for a dollar sign)"),
+        ("projects[1].description", r"unknown command \foo"),
+    ]
+
+
+def test_document_problems_are_traced_to_the_field_on_that_line(resume):
+    resume.data["experience"][1]["achievements"][0] = r"Derived \[ O(n) with no closing bracket"
+    [(where, message)] = problems(resume)
+    assert where == "experience[1].achievements[0]"
+    assert message.startswith("math mode runs into a paragraph break")
+
+
+def test_problems_outside_any_field_are_given_a_line():
+    source = "\\documentclass{article}\n\\begin{document}\n\\begin{itemize}\nText\n\\end{document}\n"
+    [(where, message)] = lint(source)
+    assert where == "line 3"
+    assert "itemize" in message
+
+
+def test_remembered_preamble_does_not_hide_body_problems():
+    preamble = "\\documentclass{article}\n\\newcommand{\\x}{y}\n"
+    assert lint_document(preamble + "\\begin{document}\nok\n\\end{document}\n") == []
+    assert lint_document(preamble + "\\begin{document}\n{ok\n\\end{document}\n") != []
+    broken = "\\documentclass{article}\n\\newcommand{\\x}{y\n"
+    for _ in range(2):
+        assert lint_document(broken + "\\begin{document}\nok\n\\end{document}\n") != []
+
+
+def test_generate_pdf_stops_before_writing_tex(resume, tmp_path):
+    resume.data["experience"][0]["achievements"][0] += " (p^2)"
+    with pytest.raises(LintError) as error:
+        resume.generate_pdf(str(tmp_path / "resume.pdf"), str(tmp_path))
+    assert [where for where, _ in error.value.problems] == ["experience[0].achievements[0]"]
+    assert not os.path.exists(tmp_path / "resume.tex")
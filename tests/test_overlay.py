@@ -0,0 +1,117 @@
+"""Resume overlays: extends: lookup, list directives and memoized merging.
+
+tests/data/resume_ml_full.yml is resume/resume_ml.yml as it was written
+out in full, before it became an overlay on resume_sw.yml.
+
+    python -m pytest tests/test_overlay.py
+"""
+import os
+import re
+import shutil
+
+import pytest
+import yaml
+
+from resume.overlay import OverlayError, diff, load_resume, merge
+
+ML_FULL = os.path.join(os.path.dirname(__file__), "data", "resume_ml_full.yml")
+
+BASE = {
+    "personal": {"name": "Jane Doe", "phone": "+1-555-0100"},
+    "experience": [
+        {"company": "Example Corp", "title": "Engineer", "achievements": ["one", "two", "three"]},
+        {"company": "Sample Labs", "title": "Intern", "achievements": ["four"]},
+    ],
+    "skills": ["Python", "SQL", "Go"],
+    "leadership": [{"name": "Team Lead"}],
+}
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    return path
+
+
+def test_resume_ml_merges_to_the_full_resume():
+    assert load_resume(os.path.join("resume", "resume_ml.yml")) == load(ML_FULL)
+
+
+def test_resume_sw_has_no_base_and_loads_as_parsed():
+    path = os.path.join("resume", "resume_sw.yml")
+    assert load_resume(path) == load(path)
+
+
+def test_list_directives():
+    overlay = {
+        "experience": {
+            "patch": {"Example Corp": {"title": "Senior Engineer",
+                                       "achievements": {"drop": [1], "add": ["five"]}}},
+            "keep": ["Example Corp"],
+        },
+        "skills": {"drop": ["SQL"], "add": ["Rust"], "keep": ["Rust", "Python"]},
+        "leadership": None,
+    }
+    assert merge(BASE, overlay) == {
+        "personal": {"name": "Jane Doe", "phone": "+1-555-0100"},
+        "experience": [{"company": "Example Corp", "title": "Senior Engineer",
+                        "achievements": ["one", "three", "five"]}],
+        "skills": ["Rust", "Python"],
+    }
+    assert BASE["experience"][0]["title"] == "Engineer"  # base left as it was
+
+
+@pytest.mark.parametrize("overlay, message", [
+    ({"experience": {"patch": {"Globex": {"title": "x"}}}}, "no item 'Globex'"),
+    ({"skills": {"remove": ["SQL"]}}, "unknown list directive(s) remove"),
+    ({"skills": {"drop": ["Python"], "keep": ["Python"]}}, "no item 'Python'"),
+])
+def test_bad_directives_name_the_list(overlay, message):
+    with pytest.raises(OverlayError, match=re.escape(message)):
+        merge(BASE, overlay)
+
+
+def test_diff_merges_back_to_the_full_resume():
+    base = load_resume(os.path.join("resume", "resume_sw.yml"))
+    full = load(ML_FULL)
+    overlay = diff(base, full)
+    assert merge(base, overlay) == full
+    assert "personal" not in overlay
+
+
+def test_extends_is_found_in_a_folder_above(tmp_path):
+    write(tmp_path / "resume" / "resume.yml", BASE)
+    tailored = write(tmp_path / "applications" / "Globex" / "resume.yml",
+                     {"extends": "resume/resume.yml", "skills": {"add": ["Kafka"]}})
+    merged = load_resume(str(tailored))
+    assert merged["skills"] == ["Python", "SQL", "Go", "Kafka"]
+    assert "extends" not in merged
+
+
+def test_edits_to_a_base_reach_its_overlays(tmp_path):
+    base = write(tmp_path / "base.yml", BASE)
+    variant = write(tmp_path / "variant.yml", {"extends": "base.yml", "skills": {"keep": ["Go"]}})
+    assert load_resume(str(variant))["personal"]["phone"] == "+1-555-0100"
+    write(base, {**BASE, "personal": {"name": "Jane Doe", "phone": "+1-555-0199 x2"}})
+    assert load_resume(str(variant))["personal"]["phone"] == "+1-555-0199 x2"
+
+
+def test_loaded_resumes_are_private_copies(tmp_path):
+    path = tmp_path / "resume_ml.yml"
+    shutil.copy(os.path.join("resume", "resume_ml.yml"), path)
+    (tmp_path / "resume").mkdir()
+    shutil.copy(os.path.join("resume", "resume_sw.yml"), tmp_path / "resume" / "resume_sw.yml")
+    load_resume(str(path))["experience"][0]["achievements"].clear()
+    assert load_resume(str(path)) == load(ML_FULL)
+
+
+def test_extends_cycle_is_reported(tmp_path):
+    write(tmp_path / "a.yml", {"extends": "b.yml"})
+    write(tmp_path / "b.yml", {"extends": "a.yml"})
+    with pytest.raises(OverlayError, match="extends cycle"):
+        load_resume(str(tmp_path / "a.yml"))
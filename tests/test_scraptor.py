@@ -0,0 +1,129 @@
+"""JobDescriptionScraptor against a local stand-in server (no network needed).
+
+    python -m pytest tests/test_scraptor.py
+"""
+import http.server
+import threading
+import time
+
+import pytest
+
+from jobdescription.scraptor import JobDescriptionScraptor, ScrapeError
+
+POSTING = b"<html><body><h1>Data Engineer</h1><p>Build pipelines in Python.</p></body></html>"
+ETAG = '"posting-v1"'
+LAST_MODIFIED = "Mon, 05 Oct 2026 10:00:00 GMT"
+
+
+class PostingHandler(http.server.BaseHTTPRequestHandler):
+    """Serves fixture pages and records every request it answers."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append({
+                "path": self.path,
+                "peer": self.client_address,
+                "at": time.monotonic(),
+                "headers": dict(self.headers),
+            })
+            count = sum(hit["path"] == self.path for hit in server.hits)
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                return self._send(304, b"", {"ETag": ETAG})
+            return self._send(200, POSTING, {"ETag": ETAG})
+        if self.path == "/modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self._send(304, b"", {"Last-Modified": LAST_MODIFIED})
+            return self._send(200, POSTING, {"Last-Modified": LAST_MODIFIED})
+        if self.path == "/flaky" and count == 1:
+            return self._send(503, b"busy")
+        if self.path == "/drop" and count == 1:
+            self.close_connection = True  # hang up without an answer
+            return None
+        if self.path in ("/posting", "/flaky", "/drop"):
+            return self._send(200, POSTING)
+        return self._send(404, b"not found")
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PostingHandler)
+    httpd.hits = []
+    httpd.lock = threading.Lock()
+    httpd.base = f"http://127.0.0.1:{httpd.server_port}"
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def scraptor(**options):
+    options = {"cache_dir": None, "min_interval": 0, "retry_backoff": 0, **options}
+    return JobDescriptionScraptor(**options)
+
+
+def test_pooled_connection_is_reused(server):
+    with scraptor() as fetcher:
+        for _ in range(3):
+            assert fetcher.fetch(server.base + "/posting").body == POSTING
+    # Every request arrived over the same client socket
+    assert len(server.hits) == 3
+    assert len({hit["peer"] for hit in server.hits}) == 1
+
+
+def test_requests_to_one_host_are_spaced(server):
+    interval = 0.2
+    with scraptor(min_interval=interval) as fetcher:
+        fetcher.fetch_many([server.base + "/posting"] * 3, concurrency=3)
+    times = sorted(hit["at"] for hit in server.hits)
+    assert len(times) == 3
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert min(gaps) >= interval * 0.9
+
+
+@pytest.mark.parametrize("path, header", [("/etag", "If-None-Match"), ("/modified", "If-Modified-Since")])
+def test_revalidation_serves_cached_body(server, tmp_path, path, header):
+    with scraptor(cache_dir=str(tmp_path)) as fetcher:
+        first = fetcher.fetch(server.base + path)
+        second = fetcher.fetch(server.base + path)
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.body == POSTING
+    assert header not in server.hits[0]["headers"]
+    assert header in server.hits[1]["headers"]
+
+
+def test_client_errors_are_not_retried(server):
+    with scraptor(retries=2) as fetcher:
+        with pytest.raises(ScrapeError, match="HTTP 404"):
+            fetcher.fetch(server.base + "/missing")
+    assert [hit["path"] for hit in server.hits] == ["/missing"]
+
+
+def test_server_errors_are_retried(server):
+    with scraptor(retries=2) as fetcher:
+        assert fetcher.fetch(server.base + "/flaky").body == POSTING
+    assert [hit["path"] for hit in server.hits] == ["/flaky", "/flaky"]
+
+
+def test_dropped_connections_are_retried(server):
+    with scraptor(retries=1) as fetcher:
+        assert fetcher.fetch(server.base + "/drop").body == POSTING
+    assert [hit["path"] for hit in server.hits] == ["/drop", "/drop"]
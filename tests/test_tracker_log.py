@@ -0,0 +1,68 @@
+"""ApplicationsLog import and export against applications-log.example.md.
+
+    python -m pytest tests/test_tracker_log.py
+"""
+import io
+
+import pytest
+
+from tracker.log import FIELDS, ApplicationsLog, parse_markdown
+
+EXAMPLE = "applications-log.example.md"
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = ApplicationsLog(str(tmp_path / "applications-log.db"))
+    yield log
+    log.close()
+
+
+def example_rows():
+    with open(EXAMPLE, encoding="utf-8") as f:
+        return list(parse_markdown(f.read()))
+
+
+def table(rows):
+    """Rows as comparable tuples, without ids or bookkeeping columns."""
+    return [tuple(row[column] or "" for column in FIELDS) for row in rows]
+
+
+def test_import_reads_every_example_row(log):
+    assert log.import_markdown(EXAMPLE) == (5, 5)
+    rows = log.rows()
+    assert [row["company"] for row in rows] == [
+        "Example Corp", "Sample Labs", "Acme Technologies", "Globex", "Initech"]
+    globex = rows[3]
+    assert (globex["date"], globex["req_id"], globex["ats"], globex["status"]) == (
+        "2024-06-04", "GBX-0571", "Ashby", "rejected")
+    assert globex["company_key"] == "globex"
+    assert globex["notes"] == "Role required 5+ years; out of range."
+
+
+def test_import_twice_adds_nothing(log):
+    log.import_markdown(EXAMPLE)
+    assert log.import_markdown(EXAMPLE) == (0, 5)
+    assert len(log.rows()) == 5
+
+
+def test_export_then_import_round_trips(log, tmp_path):
+    log.import_markdown(EXAMPLE)
+    out = io.StringIO()
+    log.export_markdown(out)
+    exported = tmp_path / "applications-log.md"
+    exported.write_text("# Applications Log\n\n" + out.getvalue(), encoding="utf-8")
+
+    with ApplicationsLog(str(tmp_path / "reimported.db")) as reimported:
+        assert reimported.import_markdown(str(exported)) == (5, 5)
+        assert table(reimported.rows()) == table(log.rows())
+    assert table(log.rows()) == [
+        tuple(row.get(column, "") for column in FIELDS) for row in example_rows()]
+
+
+def test_check_finds_the_logged_req_id_under_another_company_spelling(log):
+    log.import_markdown(EXAMPLE)
+    duplicate, by_company, by_req = log.check("Globex, Inc.", "gbx-0571 ", cooldown_days=100000)
+    assert duplicate
+    assert [row["company"] for row in by_company] == ["Globex"]
+    assert [row["req_id"] for row in by_req] == ["GBX-0571"]
@@ -0,0 +1,107 @@
+"""WarmPool and the cold fallback, against a stand-in pdflatex (no TeX needed).
+
+The stand-in reads its inputs the way LaTeX does: ``\\input{file}`` first
+opens and closes the file to test that it exists (``\\IfFileExists``) and
+then reads it, while the ``\\@@input`` primitive opens it once. On the
+warm engine's named pipe only the second works.
+
+    python -m pytest tests/test_warm.py
+"""
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+from coverletter.generator import CoverLetterGenerator
+from generators.warm import WarmPool
+
+FAKE_PDFLATEX = textwrap.dedent("""\
+    #!{python}
+    import os, re, signal, sys
+
+    if sys.argv[1:] == ["--version"]:
+        print("pdfTeX stand-in")
+        sys.exit(0)
+    options = dict(arg[1:].split("=", 1) for arg in sys.argv[1:-1] if "=" in arg)
+    command = sys.argv[-1]
+    with open(os.environ["FAKE_PDFLATEX_CALLS"], "a") as calls:
+        calls.write(("warm" if "jobname" in options else "cold") + "\\n")
+    if "\\\\" not in command:
+        command = '\\\\csname @@input\\\\endcsname "' + command + '"'
+    source = ""
+    for latex_input, primitive_input in re.findall(
+            r'\\\\input\\{{([^}}]*)\\}}|\\\\csname @@input\\\\endcsname "([^"]*)"', command):
+        if latex_input:
+            open(latex_input).close()  # \\IfFileExists
+        with open(latex_input or primitive_input) as f:
+            source += f.read()
+    if "jobname" in options and os.environ.get("FAKE_PDFLATEX_CRASH_WARM"):
+        os.kill(os.getpid(), signal.SIGKILL)
+    job = os.path.join(options["output-directory"],
+                       options.get("jobname") or os.path.splitext(os.path.basename(sys.argv[-1]))[0])
+    if "\\\\end{{document}}" not in source:
+        open(job + ".log", "w").write("! Emergency stop.\\n")
+        sys.exit(1)
+    open(job + ".log", "w").write("Output written\\n")
+    open(job + ".aux", "w").write("\\\\relax\\n")
+    with open(job + ".pdf", "w") as pdf:
+        pdf.write("%PDF-1.5\\n" + source.split("\\\\begin{{document}}", 1)[1] + "\\n%%EOF\\n")
+""").format(python=sys.executable)
+
+DOCUMENT = "\\documentclass{article}\n\\begin{document}\nWarm body text\n\\end{document}\n"
+
+
+@pytest.fixture
+def pdflatex(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    command = bin_dir / "pdflatex"
+    command.write_text(FAKE_PDFLATEX)
+    command.chmod(command.stat().st_mode | stat.S_IXUSR)
+    calls = tmp_path / "calls"
+    calls.write_text("")
+    monkeypatch.setenv("FAKE_PDFLATEX_CALLS", str(calls))
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return command
+
+
+def engine_calls(tmp_path):
+    """"warm" or "cold" per engine started, in start order."""
+    return (tmp_path / "calls").read_text().split()
+
+
+@pytest.fixture
+def pool(pdflatex):
+    pool = WarmPool(size=1, pdflatex_cmd=str(pdflatex))
+    yield pool
+    pool.close()
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="the warm pool needs named pipes")
+
+
+def test_body_is_read_through_the_pipe(pool, tmp_path):
+    pdf = pool.render(DOCUMENT, str(tmp_path / "out.pdf"), timeout=10)
+    with open(pdf) as f:
+        assert "Warm body text" in f.read()
+    assert set(engine_calls(tmp_path)) == {"warm"}
+
+
+def test_prewarmed_engines_serve_successive_renders(pool, tmp_path):
+    pool.prewarm(DOCUMENT)
+    for index in range(3):
+        body = DOCUMENT.replace("Warm body text", f"Render {index}")
+        with open(pool.render(body, str(tmp_path / f"out{index}.pdf"), timeout=10)) as f:
+            assert f"Render {index}" in f.read()
+
+
+def test_dead_warm_engine_falls_back_to_a_cold_compile(pool, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_PDFLATEX_CRASH_WARM", "1")
+    generator = CoverLetterGenerator(os.path.join("coverletter", "coverletter.yml"))
+    generator.warm_pool = pool
+    pdf = generator.generate_pdf(str(tmp_path / "letter.pdf"), str(tmp_path), "Example Corp")
+    assert os.path.exists(pdf)
+    assert engine_calls(tmp_path)[0] == "warm"
+    assert engine_calls(tmp_path).count("cold") == 2
@@ -0,0 +1,270 @@
+"""Weekly review numbers from the applications log.
+
+Computes the funnel WORKFLOW.md's weekly review asks for, without anyone
+reading the log by eye:
+
+- response and interview rate per resume variant, ATS and role family
+- days from submit to each later status, per ATS
+- applications per ISO week
+
+SQLite does the heavy lifting: one grouped query folds the status history
+into per-application columns and another computes the status delays.
+A single pass over those columns then fills every table.
+
+    python -m tracker.analytics
+    python -m tracker.analytics --since 2025-01-01 --csv reports/ --json reports/review.json
+"""
+import csv
+from datetime import date
+import json
+import os
+import re
+from statistics import median
+
+from tracker.log import DEFAULT_DB, ApplicationsLog
+
+# Statuses that mean the application actually went out
+APPLIED = {"submitted", "pending", "interview", "rejected"}
+# Statuses that count as hearing back from the company
+RESPONSES = {"interview", "rejected"}
+
+# First match wins; checked against the lowercased role title
+ROLE_FAMILIES = [
+    ("ml", r"machine learning|\bml\b|\bai\b|data scien|deep learning"),
+    ("data", r"\bdata\b|analytics"),
+    ("full-stack", r"full[ -]?stack"),
+    ("frontend", r"front[ -]?end|\bui\b|web"),
+    ("platform", r"platform|infra|devops|\bsre\b|reliability|cloud"),
+    ("backend", r"back[ -]?end"),
+]
+VARIANT_RE = re.compile(r"resume_(\w+)\.ya?ml")
+
+
+def role_family(role):
+    """Bucket a role title into a family: "Machine Learning Engineer" -> "ml"."""
+    title = (role or "").lower()
+    for family, pattern in ROLE_FAMILIES:
+        if re.search(pattern, title):
+            return family
+    return "software"
+
+
+def variant_of(variant, notes):
+    """The resume variant, falling back to "Tailored from resume_sw.yml" notes."""
+    if variant:
+        return variant
+    match = VARIANT_RE.search(notes or "")
+    return match.group(1) if match else "unknown"
+
+
+def iso_week(day):
+    """"2025-03-04" -> "2025-W10"; None for a date that is not YYYY-MM-DD."""
+    try:
+        year, week, _ = date.fromisoformat((day or "").strip()).isocalendar()
+    except ValueError:
+        return None
+    return f"{year}-W{week:02d}"
+
+
+def _in(statuses):
+    return "(" + ", ".join(f"'{status}'" for status in sorted(statuses)) + ")"
+
+
+def _plain_cursor(log):
+    """Cursor returning tuples; sqlite3.Row objects cost more than the query."""
+    cursor = log.db.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def load_columns(log, since=None):
+    """The log as column lists, one entry per application.
+
+    SQLite folds the status history into per-application flags (applied,
+    replied, interviewed, rendered) in the same query, so Python only sees
+    one row per application.
+    """
+    where, params = "", ()
+    if since:
+        where, params = "WHERE a.date >= ?", (since,)
+    names = ("date", "ats", "role", "variant", "notes", "applied", "replied", "interviewed", "rendered")
+    rows = _plain_cursor(log).execute(
+        "SELECT a.date, a.ats, a.role, a.variant, a.notes,"
+        f" MAX(a.status IN {_in(APPLIED)} OR COALESCE(h.status IN {_in(APPLIED)}, 0)),"
+        f" MAX(a.status IN {_in(RESPONSES)} OR COALESCE(h.status IN {_in(RESPONSES)}, 0)),"
+        " MAX(a.status = 'interview' OR COALESCE(h.status = 'interview', 0)),"
+        " MAX(a.status = 'rendered' OR COALESCE(h.status = 'rendered', 0))"
+        " FROM applications a LEFT JOIN status_history h ON h.application_id = a.id"
+        f" {where} GROUP BY a.id",
+        params,
+    ).fetchall()
+    if not rows:
+        return {name: [] for name in names}
+    return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+
+def load_waits(log, since=None):
+    """(ats, status, days) for every status change after an application went out.
+
+    The first history entry is the status the row was logged with, not a
+    change. Days count from the 'submitted' step when there is one, else
+    from the row date.
+    """
+    where, params = "", ()
+    if since:
+        where, params = "AND a.date >= ?", (since,)
+    return _plain_cursor(log).execute(
+        "SELECT a.ats, h.status,"
+        " CAST(julianday(h.date) - julianday(COALESCE(s.sent, a.date)) AS INTEGER) AS days"
+        " FROM status_history h JOIN applications a ON a.id = h.application_id"
+        " LEFT JOIN (SELECT application_id, MIN(date) AS sent FROM status_history"
+        "            WHERE status = 'submitted' GROUP BY application_id) s"
+        "   ON s.application_id = h.application_id"
+        f" WHERE h.status IN {_in(RESPONSES | {'closed'})}"
+        "   AND h.rowid > (SELECT MIN(rowid) FROM status_history f WHERE f.application_id = h.application_id)"
+        f"   {where} AND days >= 0",
+        params,
+    ).fetchall()
+
+
+def _funnel_row():
+    return {"applied": 0, "responses": 0, "interviews": 0}
+
+
+def analyze(columns, waits=()):
+    """Every weekly-review table from one pass over the columns."""
+    funnels = {"variant": {}, "ats": {}, "role_family": {}}
+    weekly = {}
+    undated = set()  # dates no week can be computed for
+    # Memo tables: dates, role titles and variants repeat across rows
+    weeks = {}
+    families = {}
+    variants = {}
+
+    for day, ats, role, variant, notes, applied, replied, interviewed, rendered in zip(
+        columns["date"], columns["ats"], columns["role"], columns["variant"], columns["notes"],
+        columns["applied"], columns["replied"], columns["interviewed"], columns["rendered"],
+    ):
+        if day not in weeks:
+            weeks[day] = iso_week(day)
+        if weeks[day] is None:
+            undated.add(day or "")
+            week = {"rendered": 0, "applied": 0, "responses": 0}  # counted in no week
+        else:
+            week = weekly.get(weeks[day])
+            if week is None:
+                week = weekly[weeks[day]] = {"rendered": 0, "applied": 0, "responses": 0}
+        week["rendered"] += rendered
+        if not applied:
+            continue
+        week["applied"] += 1
+        week["responses"] += replied
+
+        if role not in families:
+            families[role] = role_family(role)
+        if (variant, notes) not in variants:
+            variants[variant, notes] = variant_of(variant, notes)
+        for dimension, key in (("variant", variants[variant, notes]), ("ats", ats or "unknown"),
+                               ("role_family", families[role])):
+            row = funnels[dimension].get(key)
+            if row is None:
+                row = funnels[dimension][key] = _funnel_row()
+            row["applied"] += 1
+            row["responses"] += replied
+            row["interviews"] += interviewed
+
+    for table in funnels.values():
+        for row in table.values():
+            row["response_rate"] = round(row["responses"] / row["applied"], 3)
+            row["interview_rate"] = round(row["interviews"] / row["applied"], 3)
+
+    grouped = {}
+    for ats, step, days in waits:
+        grouped.setdefault((ats or "unknown", step), []).append(days)
+    time_to_status = {}
+    for (ats, step), days in sorted(grouped.items()):
+        time_to_status.setdefault(ats, {})[step] = {
+            "count": len(days),
+            "mean_days": round(sum(days) / len(days), 1),
+            "median_days": median(days),
+        }
+    return {
+        "funnel": {dimension: dict(sorted(table.items())) for dimension, table in funnels.items()},
+        "time_to_status": time_to_status,
+        "weekly": dict(sorted(weekly.items())),
+        "undated": sorted(undated),
+    }
+
+
+def write_csv(report, directory):
+    """One CSV per table in ``directory``; returns the written paths."""
+    os.makedirs(directory, exist_ok=True)
+    written = []
+
+    def dump(name, header, rows):
+        path = os.path.join(directory, name)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        written.append(path)
+
+    funnel_fields = ["applied", "responses", "interviews", "response_rate", "interview_rate"]
+    for dimension, table in report["funnel"].items():
+        dump(f"funnel_by_{dimension}.csv", [dimension] + funnel_fields,
+             [[key] + [row[field] for field in funnel_fields] for key, row in table.items()])
+    dump("time_to_status.csv", ["ats", "status", "count", "mean_days", "median_days"],
+         [[ats, step, stats["count"], stats["mean_days"], stats["median_days"]]
+          for ats, steps in report["time_to_status"].items() for step, stats in steps.items()])
+    dump("weekly_volume.csv", ["week", "rendered", "applied", "responses"],
+         [[week, row["rendered"], row["applied"], row["responses"]]
+          for week, row in report["weekly"].items()])
+    return written
+
+
+def format_report(report):
+    """Plain-text tables for the terminal."""
+    lines = []
+    for dimension, table in report["funnel"].items():
+        lines.append(f"\nBy {dimension.replace('_', ' ')}:")
+        lines.append(f"  {'':<16}{'applied':>8}{'replies':>9}{'interviews':>12}{'reply %':>9}")
+        for key, row in table.items():
+            lines.append(f"  {key:<16}{row['applied']:>8}{row['responses']:>9}"
+                         f"{row['interviews']:>12}{row['response_rate'] * 100:>8.0f}%")
+    lines.append("\nDays from submit to status, by ATS:")
+    for ats, steps in report["time_to_status"].items():
+        for step, stats in steps.items():
+            lines.append(f"  {ats:<16}{step:<11}median {stats['median_days']:>5} "
+                         f"mean {stats['mean_days']:>5}  (n={stats['count']})")
+    lines.append("\nWeekly volume:")
+    for week, row in report["weekly"].items():
+        lines.append(f"  {week}  applied {row['applied']:>3}  replies {row['responses']:>3}")
+    if report.get("undated"):
+        shown = ", ".join(repr(day) for day in report["undated"][:5])
+        lines.append(f"  Warning: rows dated {shown} are in no week (dates must be YYYY-MM-DD)")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Weekly review metrics from the applications log")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    parser.add_argument("--since", help="Only applications dated on or after YYYY-MM-DD")
+    parser.add_argument("--csv", metavar="DIR", help="Write one CSV per table into DIR")
+    parser.add_argument("--json", metavar="FILE", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    with ApplicationsLog(args.db) as log:
+        report = analyze(load_columns(log, args.since), load_waits(log, args.since))
+    print(format_report(report))
+    if args.csv:
+        for path in write_csv(report, args.csv):
+            print(f"Wrote {path}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
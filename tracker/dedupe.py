@@ -0,0 +1,222 @@
+"""Fuzzy "have we applied here already?" lookups.
+
+Exact matching on the normalized company misses typos and longer forms
+("Globx", "Globex Systems"), and the applications/ folders disagree on
+naming: ``main.py`` writes ``Globex_Inc`` while the desktop UI writes
+``globex_inc/<role>/<date>/<timestamp>``. This module indexes every
+company key from the log and from the folder names by character
+trigrams, inside the same SQLite file, and ranks candidates by the Dice
+coefficient of their trigram sets. Req-ids are indexed with separators
+removed so "GBX-0571" and "gbx 0571" meet.
+
+The trigram tables are synced incrementally on open: only log rows added
+since the last sync get indexed, so a lookup against tens of thousands of
+rows stays at a few index seeks.
+
+    python -m tracker.dedupe "Globex Corporation" --req-id GBX0571
+"""
+import os
+import re
+
+from tracker.log import DEFAULT_DB, ApplicationsLog, normalize_company
+
+# Dice similarity at or above this counts as a near-duplicate
+DEFAULT_THRESHOLD = 0.6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS company_keys (
+    company_key TEXT PRIMARY KEY,
+    trigram_count INTEGER NOT NULL,
+    in_log INTEGER NOT NULL DEFAULT 0,
+    folder TEXT
+);
+CREATE TABLE IF NOT EXISTS company_trigrams (
+    trigram TEXT NOT NULL,
+    company_key TEXT NOT NULL,
+    PRIMARY KEY (trigram, company_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dedupe_state (last_id INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS req_keys (
+    req_key TEXT NOT NULL,
+    req_id TEXT NOT NULL,
+    PRIMARY KEY (req_key, req_id)
+) WITHOUT ROWID;
+"""
+
+
+def trigrams(key):
+    """Character trigrams of a normalized key, padded at both ends."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def compact_req_id(req_id):
+    """Req-id with case, spaces and separators removed: "gbx-0571" -> "GBX0571"."""
+    return re.sub(r"[^0-9A-Z]", "", (req_id or "").upper())
+
+
+def folder_companies(applications_dir):
+    """{company_key: folder} for the top-level folders under applications/."""
+    if not os.path.isdir(applications_dir):
+        return {}
+    found = {}
+    for name in os.listdir(applications_dir):
+        if name.startswith(".") or not os.path.isdir(os.path.join(applications_dir, name)):
+            continue
+        key = normalize_company(name)
+        if key:
+            found.setdefault(key, name)
+    return found
+
+
+class DedupeIndex:
+    """Trigram index over the applications log and the applications/ folders."""
+
+    def __init__(self, log, applications_dir=None):
+        self.log = log
+        self.db = log.db
+        self.db.executescript(SCHEMA)
+        self.sync(applications_dir)
+
+    def _index_key(self, key):
+        grams = trigrams(key)
+        self.db.execute(
+            "INSERT OR IGNORE INTO company_keys (company_key, trigram_count) VALUES (?, ?)",
+            (key, len(grams)),
+        )
+        self.db.executemany(
+            "INSERT OR IGNORE INTO company_trigrams (trigram, company_key) VALUES (?, ?)",
+            [(gram, key) for gram in grams],
+        )
+
+    def sync(self, applications_dir=None):
+        """Index company keys and req-ids added since the last sync."""
+        with self.db:
+            last_id = self.db.execute("SELECT last_id FROM dedupe_state").fetchone()
+            last_id = last_id[0] if last_id else 0
+            new_rows = self.db.execute(
+                "SELECT id, company_key, req_id FROM applications WHERE id > ?", (last_id,)
+            ).fetchall()
+            for key in {row[1] for row in new_rows}:
+                self._index_key(key)
+                self.db.execute("UPDATE company_keys SET in_log = 1 WHERE company_key = ?", (key,))
+            self.db.executemany(
+                "INSERT OR IGNORE INTO req_keys (req_key, req_id) VALUES (?, ?)",
+                {(compact_req_id(row[2]), row[2]) for row in new_rows if row[2]},
+            )
+            if new_rows:
+                self.db.execute("DELETE FROM dedupe_state")
+                self.db.execute("INSERT INTO dedupe_state (last_id) VALUES (?)",
+                                (max(row[0] for row in new_rows),))
+            if applications_dir:
+                known = dict(self.db.execute(
+                    "SELECT company_key, folder FROM company_keys WHERE folder IS NOT NULL"))
+                for key, folder in folder_companies(applications_dir).items():
+                    if known.get(key) == folder:
+                        continue
+                    self._index_key(key)
+                    self.db.execute(
+                        "UPDATE company_keys SET folder = ? WHERE company_key = ?", (folder, key)
+                    )
+
+    def similar_companies(self, name, threshold=DEFAULT_THRESHOLD, limit=10):
+        """[(company_key, score, folder)] for keys similar to ``name``, best first."""
+        key = normalize_company(name)
+        grams = trigrams(key)
+        if not key:
+            return []
+        # Dice >= t needs at least t * (|a| + |b|) / 2 shared trigrams, and
+        # |b| >= 1, so anything sharing fewer than this can be skipped early
+        min_shared = max(1, int(threshold * (len(grams) + 1) / 2))
+        placeholders = ",".join("?" * len(grams))
+        rows = self.db.execute(
+            "SELECT t.company_key, COUNT(*) AS shared, k.trigram_count, k.folder"
+            " FROM company_trigrams t JOIN company_keys k ON k.company_key = t.company_key"
+            f" WHERE t.trigram IN ({placeholders})"
+            " GROUP BY t.company_key HAVING shared >= ?",
+            [*grams, min_shared],
+        ).fetchall()
+        matches = []
+        for candidate, shared, count, folder in rows:
+            score = 1.0 if candidate == key else 2.0 * shared / (len(grams) + count)
+            if score >= threshold:
+                matches.append((candidate, round(score, 3), folder))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
+
+    def matching_req_ids(self, req_id):
+        """Logged req-ids equal to ``req_id`` once separators are ignored."""
+        return [row[0] for row in self.db.execute(
+            "SELECT req_id FROM req_keys WHERE req_key = ?", (compact_req_id(req_id),)
+        )]
+
+    def lookup(self, company=None, req_id=None, threshold=DEFAULT_THRESHOLD):
+        """Everything that looks like an earlier application.
+
+        Returns {"companies": [(key, score, folder, rows)], "req_ids": rows}.
+        """
+        companies = []
+        if company:
+            for key, score, folder in self.similar_companies(company, threshold):
+                rows = self.db.execute(
+                    "SELECT * FROM applications WHERE company_key = ? ORDER BY date DESC, id DESC",
+                    (key,),
+                ).fetchall()
+                companies.append((key, score, folder, rows))
+        req_rows = []
+        if req_id:
+            matches = self.matching_req_ids(req_id)
+            if matches:
+                placeholders = ",".join("?" * len(matches))
+                req_rows = self.db.execute(
+                    f"SELECT * FROM applications WHERE req_id IN ({placeholders})"
+                    " ORDER BY date DESC, id DESC",
+                    matches,
+                ).fetchall()
+        return {"companies": companies, "req_ids": req_rows}
+
+
+def format_lookup(result, company=None, req_id=None):
+    """Human-readable lines for a lookup() result."""
+    lines = []
+    for row in result["req_ids"]:
+        lines.append(f"req-id {row['req_id']}: #{row['id']} {row['date']} {row['company']} | "
+                     f"{row['role']} | {row['status']}")
+    for key, score, folder, rows in result["companies"]:
+        where = f" (applications/{folder})" if folder else ""
+        label = "same company" if key == normalize_company(company) else f"similar ({score:.2f})"
+        lines.append(f"{label}: '{key}'{where}, {len(rows)} logged application(s)")
+        for row in rows[:5]:
+            lines.append(f"    #{row['id']} {row['date']} {row['role']} | "
+                         f"{row['req_id'] or '-'} | {row['status']}")
+    return lines
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Fuzzy check for earlier applications to a company or req-id")
+    parser.add_argument("company", nargs="?", help="Company name as written in the posting")
+    parser.add_argument("--req-id", help="Requisition ID from the posting")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum trigram similarity, 0 to 1 (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    parser.add_argument("--applications", default="applications",
+                        help="Output folder to scan for company names (default: applications)")
+    args = parser.parse_args()
+    if not args.company and not args.req_id:
+        parser.error("give a company name and/or --req-id")
+
+    with ApplicationsLog(args.db) as log:
+        index = DedupeIndex(log, args.applications)
+        result = index.lookup(args.company, args.req_id, args.threshold)
+    lines = format_lookup(result, args.company, args.req_id)
+    if not lines:
+        print("No earlier or similar applications")
+        return
+    print("\n".join(lines))
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
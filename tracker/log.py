@@ -0,0 +1,381 @@
+"""SQLite-backed applications log.
+
+``applications-log.md`` stays the human-readable view, but dedupe checks
+read from ``applications-log.db``, where company, normalized company,
+req-id, ATS and status are indexed. A lookup is an index seek instead of
+a scan of the whole markdown table.
+
+    python -m tracker.log import applications-log.md
+    python -m tracker.log check --company "Globex Inc." --req-id GBX-0571
+    python -m tracker.log add --company Globex --role "Data Engineer" --status submitted
+    python -m tracker.log status 42 interview
+    python -m tracker.log export -o applications-log.md
+"""
+from datetime import datetime, timedelta
+import re
+import sqlite3
+import sys
+
+DEFAULT_DB = "applications-log.db"
+# Same req-id inside this window is a duplicate (WORKFLOW.md, Phase 1)
+COOLDOWN_DAYS = 90
+
+# Date formats seen in hand-kept markdown logs, tried in order after ISO
+DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%b %d, %Y", "%B %d, %Y",
+                "%b %d %Y", "%B %d %Y", "%d %b %Y", "%d %B %Y")
+
+STATUSES = ("rendered", "submitted", "pending", "blocked", "interview",
+            "rejected", "closed", "skipped")
+
+# Markdown column header -> table column
+COLUMNS = [
+    ("Date", "date"),
+    ("Company", "company"),
+    ("Role", "role"),
+    ("Req ID", "req_id"),
+    ("ATS", "ats"),
+    ("Location", "location"),
+    ("Status", "status"),
+    ("Variant", "variant"),
+    ("Notes", "notes"),
+]
+FIELDS = [column for _, column in COLUMNS]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    company TEXT NOT NULL,
+    company_key TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT '',
+    req_id TEXT NOT NULL DEFAULT '',
+    ats TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'submitted',
+    variant TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company);
+CREATE INDEX IF NOT EXISTS idx_applications_company_key ON applications (company_key, date);
+CREATE INDEX IF NOT EXISTS idx_applications_req_id ON applications (req_id, date);
+CREATE INDEX IF NOT EXISTS idx_applications_ats ON applications (ats);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status);
+CREATE TABLE IF NOT EXISTS status_history (
+    application_id INTEGER NOT NULL REFERENCES applications (id),
+    status TEXT NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_status_history_application ON status_history (application_id, date);
+"""
+
+# Legal-form suffixes that do not distinguish one employer from another
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "bv", "pty",
+}
+
+
+def normalize_company(name):
+    """Key for matching company names: "Globex, Inc." -> "globex".
+
+    Lowercases, treats underscores and punctuation as spaces (folder names
+    use underscores) and drops trailing legal-form suffixes.
+    """
+    words = re.sub(r"[^0-9a-z]+", " ", (name or "").lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_req_id(req_id):
+    """Req-ids compare case-insensitively and ignore surrounding space."""
+    return (req_id or "").strip().upper()
+
+
+def normalize_date(value):
+    """``value`` as YYYY-MM-DD when it is a recognizable date, else unchanged."""
+    text = (value or "").strip()
+    for fmt in ("%Y-%m-%d",) + DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return text
+
+
+def _split_row(line):
+    """Cells of one markdown table row, honouring escaped pipes."""
+    cells = re.split(r"(?<!\\)\|", line.strip().strip("|"))
+    return [cell.strip().replace("\\|", "|") for cell in cells]
+
+
+def _header_key(header):
+    return re.sub(r"[^a-z]", "", header.lower())
+
+
+def parse_markdown(text):
+    """Yield a dict per row of the first markdown table in ``text``."""
+    header_map = {_header_key(header): column for header, column in COLUMNS}
+    columns = None
+    for line in text.splitlines():
+        if not line.lstrip().startswith("|"):
+            if columns is not None:
+                break
+            continue
+        cells = _split_row(line)
+        if columns is None:
+            columns = [header_map.get(_header_key(cell)) for cell in cells]
+            continue
+        if all(re.fullmatch(r":?-+:?", cell) for cell in cells if cell):
+            continue
+        row = {column: cell for column, cell in zip(columns, cells) if column}
+        if row.get("company"):
+            yield row
+
+
+def format_markdown(rows):
+    """Render rows as the markdown table used by applications-log.md."""
+    def cell(value):
+        return str(value or "").replace("|", "\\|").replace("\n", " ")
+
+    lines = [
+        "| " + " | ".join(header for header, _ in COLUMNS) + " |",
+        "| " + " | ".join("---" for _ in COLUMNS) + " |",
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(cell(row[column]) for column in FIELDS) + " |")
+    return "\n".join(lines) + "\n"
+
+
+class ApplicationsLog:
+    """The applications table in a SQLite file."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, company, role="", req_id="", ats="", location="", status="submitted",
+            variant="", notes="", date=None):
+        """Insert one application and return its id."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}' (expected one of: {', '.join(STATUSES)})")
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO applications (date, company, company_key, role, req_id, ats,"
+                " location, status, variant, notes, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (date or today, company, normalize_company(company), role,
+                 normalize_req_id(req_id), ats, location, status, variant, notes, today),
+            )
+            self.db.execute(
+                "INSERT INTO status_history (application_id, status, date) VALUES (?, ?, ?)",
+                (cursor.lastrowid, status, date or today),
+            )
+        return cursor.lastrowid
+
+    def record_render(self, company, role, req_id="", ats="", location="", variant="", notes=""):
+        """Log a generated application, reusing an open 'rendered' row.
+
+        Re-rendering the same company, role and req-id refreshes the row
+        instead of adding another.
+        """
+        existing = self.db.execute(
+            "SELECT id FROM applications WHERE company_key = ? AND role = ? AND req_id = ?"
+            " AND status = 'rendered' ORDER BY date DESC LIMIT 1",
+            (normalize_company(company), role, normalize_req_id(req_id)),
+        ).fetchone()
+        if existing is None:
+            return self.add(company, role, req_id, ats, location, "rendered", variant, notes)
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self.db:
+            self.db.execute(
+                "UPDATE applications SET date = ?, updated = ?,"
+                " ats = COALESCE(NULLIF(?, ''), ats), location = COALESCE(NULLIF(?, ''), location),"
+                " variant = COALESCE(NULLIF(?, ''), variant) WHERE id = ?",
+                (today, today, ats, location, variant, existing["id"]),
+            )
+        return existing["id"]
+
+    def set_status(self, row_id, status, notes=None, date=None):
+        """Move an application to a new status, recording when it happened."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}' (expected one of: {', '.join(STATUSES)})")
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        with self.db:
+            cursor = self.db.execute(
+                "UPDATE applications SET status = ?, updated = ?,"
+                " notes = COALESCE(?, notes) WHERE id = ?",
+                (status, date, notes, row_id),
+            )
+            if cursor.rowcount == 0:
+                raise KeyError(f"No application with id {row_id}")
+            self.db.execute(
+                "INSERT INTO status_history (application_id, status, date) VALUES (?, ?, ?)",
+                (row_id, status, date),
+            )
+
+    def find(self, company=None, req_id=None, since=None):
+        """Rows matching the normalized company or the req-id, newest first."""
+        clauses, params = [], []
+        if company:
+            clauses.append("company_key = ?")
+            params.append(normalize_company(company))
+        if req_id:
+            clauses.append("req_id = ?")
+            params.append(normalize_req_id(req_id))
+        if not clauses:
+            return []
+        query = "SELECT * FROM applications WHERE (" + " OR ".join(clauses) + ")"
+        if since:
+            query += " AND date >= ?"
+            params.append(since)
+        return self.db.execute(query + " ORDER BY date DESC, id DESC", params).fetchall()
+
+    def check(self, company=None, req_id=None, cooldown_days=COOLDOWN_DAYS):
+        """Dedupe verdict: (is_duplicate, company_rows, req_id_rows).
+
+        A duplicate is the same req-id inside the cooldown window. Other
+        rows at the same company are returned for context only: a different
+        req-id there is a fresh apply.
+        """
+        rows = self.find(company, req_id)
+        company_key = normalize_company(company) if company else None
+        req_key = normalize_req_id(req_id) if req_id else None
+        by_company = [row for row in rows if company_key and row["company_key"] == company_key]
+        by_req = [row for row in rows if req_key and row["req_id"] == req_key]
+        since = (datetime.now() - timedelta(days=cooldown_days)).strftime("%Y-%m-%d")
+        duplicate = any(row["date"] >= since and row["status"] != "skipped" for row in by_req)
+        return duplicate, by_company, by_req
+
+    def rows(self, where="", params=()):
+        query = "SELECT * FROM applications"
+        if where:
+            query += " WHERE " + where
+        return self.db.execute(query + " ORDER BY date, id", params).fetchall()
+
+    def import_markdown(self, path):
+        """Load the rows of a markdown log; rows already present are skipped."""
+        with open(path, "r", encoding="utf-8") as f:
+            rows = list(parse_markdown(f.read()))
+        added = 0
+        for row in rows:
+            status = row.get("status", "").strip().lower() or "submitted"
+            raw_date, row["date"] = row.get("date", ""), normalize_date(row.get("date"))
+            # Earlier imports stored dates as written; match those rows too
+            exists = self.db.execute(
+                "SELECT 1 FROM applications WHERE date IN (?, ?) AND company = ? AND role = ? AND req_id = ?",
+                (row["date"], raw_date, row["company"], row.get("role", ""),
+                 normalize_req_id(row.get("req_id"))),
+            ).fetchone()
+            if exists:
+                continue
+            self.add(
+                row["company"], row.get("role", ""), row.get("req_id", ""), row.get("ats", ""),
+                row.get("location", ""), status if status in STATUSES else "submitted",
+                row.get("variant", ""), row.get("notes", ""), row.get("date") or None,
+            )
+            added += 1
+        return added, len(rows)
+
+    def export_markdown(self, out):
+        """Write every row as a markdown table to ``out``."""
+        out.write(format_markdown(self.rows()))
+
+
+def _print_rows(rows):
+    for row in rows:
+        print(f"  #{row['id']} {row['date']}  {row['company']} | {row['role']} | "
+              f"{row['req_id'] or '-'} | {row['ats'] or '-'} | {row['status']}")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Query and maintain the applications log")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", help="Have we applied here already? Exit status 1 on a duplicate")
+    check.add_argument("--company")
+    check.add_argument("--req-id")
+    check.add_argument("--days", type=int, default=COOLDOWN_DAYS, help="Cooldown window in days")
+
+    add = commands.add_parser("add", help="Append an application")
+    add.add_argument("--company", required=True)
+    add.add_argument("--role", default="")
+    add.add_argument("--req-id", default="")
+    add.add_argument("--ats", default="")
+    add.add_argument("--location", default="")
+    add.add_argument("--status", default="submitted", choices=STATUSES)
+    add.add_argument("--variant", default="")
+    add.add_argument("--notes", default="")
+    add.add_argument("--date", default=None, help="YYYY-MM-DD (default: today)")
+
+    status = commands.add_parser("status", help="Change the status of an application")
+    status.add_argument("id", type=int)
+    status.add_argument("status", choices=STATUSES)
+    status.add_argument("--notes", default=None)
+    status.add_argument("--date", default=None, help="YYYY-MM-DD the status changed (default: today)")
+
+    listing = commands.add_parser("list", help="Show rows, optionally filtered by status")
+    listing.add_argument("--status", choices=STATUSES)
+
+    importer = commands.add_parser("import", help="Load rows from a markdown log")
+    importer.add_argument("markdown", help="e.g. applications-log.md")
+
+    exporter = commands.add_parser("export", help="Write the log as a markdown table")
+    exporter.add_argument("-o", "--output", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    with ApplicationsLog(args.db) as log:
+        if args.command == "check":
+            if not args.company and not args.req_id:
+                parser.error("check needs --company and/or --req-id")
+            duplicate, by_company, by_req = log.check(args.company, args.req_id, args.days)
+            if by_req:
+                print(f"Req-id {normalize_req_id(args.req_id)}: {len(by_req)} earlier application(s)")
+                _print_rows(by_req)
+            if by_company:
+                print(f"Company '{normalize_company(args.company)}': {len(by_company)} earlier application(s)")
+                _print_rows(by_company)
+            if duplicate:
+                print(f"DUPLICATE: same req-id within {args.days} days")
+                sys.exit(1)
+            if not by_req and not by_company:
+                print("No earlier applications")
+        elif args.command == "add":
+            row_id = log.add(args.company, args.role, args.req_id, args.ats, args.location,
+                             args.status, args.variant, args.notes, args.date)
+            print(f"Logged #{row_id}")
+        elif args.command == "status":
+            log.set_status(args.id, args.status, args.notes, args.date)
+            print(f"#{args.id} -> {args.status}")
+        elif args.command == "list":
+            _print_rows(log.rows("status = ?", (args.status,)) if args.status else log.rows())
+        elif args.command == "import":
+            added, total = log.import_markdown(args.markdown)
+            print(f"Imported {added} of {total} rows from {args.markdown}")
+        elif args.command == "export":
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write("# Applications Log\n\n")
+                    log.export_markdown(f)
+                print(f"Wrote {args.output}")
+            else:
+                log.export_markdown(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import os
 from datetime import datetime
 from resume.generator import ResumeGenerator
 from coverletter.generator import CoverLetterGenerator
+from generators.warm import WarmPool
 from .editors.yaml_editor import YamlEditor
 from .widgets.loading_indicator import LoadingIndicator
 from .widgets.logo import LogoWidget
@@ -15,6 +16,8 @@ import subprocess
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        # Re-renders while editing skip the TeX start-up
+        self.warm_pool = WarmPool()
         self.init_ui()
         self.apply_styles()
         self.loading = LoadingIndicator(self)
@@ -195,6 +198,7 @@ class MainWindow(QMainWindow):
                 resume_file = os.path.join(output_dir, 'resume.pdf')
                 resume_generator = ResumeGenerator(
                     os.path.join(base_dir, "resume", "resume.yml"))
+                resume_generator.warm_pool = self.warm_pool
                 output_file = resume_generator.generate_pdf(resume_file, output_dir)
                 generated_files.append(output_file)
 
@@ -202,6 +206,7 @@ class MainWindow(QMainWindow):
                 cover_letter_file = os.path.join(output_dir, 'cover_letter.pdf')
                 coverletter_generator = CoverLetterGenerator(
                     os.path.join(base_dir, "coverletter", "coverletter.yml"))
+                coverletter_generator.warm_pool = self.warm_pool
                 output_file = coverletter_generator.generate_pdf(
                     cover_letter_file, output_dir, company_name)
                 generated_files.append(output_file)